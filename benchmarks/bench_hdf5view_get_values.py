@@ -0,0 +1,106 @@
+import tempfile
+import time
+
+import h5py
+import numpy as np
+from qcfractal.interface.collections.dataset_view import HDF5View
+
+n_entries = 100000
+n_atoms = 10
+subset_trials = [100, 1000, 10000, None]
+
+vlen_double_t = h5py.vlen_dtype(np.dtype("float64"))
+utf8_t = h5py.string_dtype(encoding="utf-8")
+queries = [
+    {"name": "energy", "driver": "energy", "native": True},
+    {"name": "gradient", "driver": "gradient", "native": True},
+    {"name": "hessian", "driver": "hessian", "native": True},
+]
+
+
+def build_view(path, n_entries, layout):
+    """Writes the entries and value columns of a synthetic view, gradients and hessians as vlen or dense rows"""
+
+    rng = np.random.default_rng(0)
+    dataset_kwargs = {"chunks": True}
+    with h5py.File(path, "w") as f:
+        entry_group = f.create_group("entry")
+        entry_group.create_dataset(
+            "entry", data=[f"entry_{i}" for i in range(n_entries)], dtype=utf8_t, **dataset_kwargs
+        )
+
+        value_group = f.create_group("value")
+        f.create_group("contributed_value")
+
+        energy = value_group.create_dataset("energy", data=rng.random(n_entries), **dataset_kwargs)
+        gradients = rng.random((n_entries, n_atoms, 3))
+        hessians = rng.random((n_entries, n_atoms * 3, n_atoms * 3))
+
+        if layout == "vlen":
+            gradient = value_group.create_dataset("gradient", shape=(n_entries,), dtype=vlen_double_t, **dataset_kwargs)
+            hessian = value_group.create_dataset("hessian", shape=(n_entries,), dtype=vlen_double_t, **dataset_kwargs)
+            gradient[:] = list(gradients.reshape(n_entries, -1))
+            hessian[:] = list(hessians.reshape(n_entries, -1))
+        else:
+            array_kwargs = {"compression": "gzip", "shuffle": True}
+            gradient = value_group.create_dataset("gradient", data=gradients, chunks=(1000, n_atoms, 3), **array_kwargs)
+            hessian = value_group.create_dataset("hessian", data=hessians, chunks=(30, 30, 30), **array_kwargs)
+            gradient.attrs["layout"] = hessian.attrs["layout"] = HDF5View._serialize_field("dense")
+
+        for dataset in [energy, gradient, hessian]:
+            dataset.attrs["units"] = HDF5View._serialize_field("hartree")
+
+
+def get_values_elementwise(view, queries, subset):
+    """HDF5View.get_values as it was, reading one element per h5py call"""
+
+    entries = view.get_index(subset)
+    indexes = entries._h5idx
+    ret = {}
+    with h5py.File(view._path, "r") as f:
+        for query in queries:
+            dataset = f["value/" + query["name"]]
+            if not h5py.check_dtype(vlen=dataset.dtype):
+                data = [dataset[i] for i in indexes]
+            elif query["driver"] == "gradient":
+                data = [np.reshape(dataset[i], (-1, 3)) for i in indexes]
+            else:
+                data = []
+                for i in indexes:
+                    n = int(round(np.sqrt(len(dataset[i]))))
+                    data.append(np.reshape(dataset[i], (n, n)))
+            ret[query["name"]] = data
+    return ret
+
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    print(f"Building synthetic views with {n_entries} entries of {n_atoms} atoms...\n")
+    views = {}
+    for layout in ["vlen", "dense"]:
+        build_view(f"{tmpdir}/{layout}.h5", n_entries, layout)
+        views[layout] = HDF5View(f"{tmpdir}/{layout}.h5")
+
+    names = views["vlen"].get_index()["index"]
+    rng = np.random.default_rng(1)
+
+    print(f"{'query':>9s} {'rows':>7s} {'old (s)':>9s} {'vlen (s)':>9s} {'dense (s)':>10s} {'speedup':>8s}")
+    for n_subset in subset_trials:
+        subset = None if n_subset is None else list(rng.choice(names, n_subset, replace=False))
+        for query in queries:
+            t = time.time()
+            old = get_values_elementwise(views["vlen"], [query], subset)[query["name"]]
+            old_time = time.time() - t
+
+            times = {}
+            for layout, view in views.items():
+                t = time.time()
+                new, _ = view.get_values([query], subset)
+                times[layout] = time.time() - t
+
+                if layout == "vlen":
+                    assert all(np.array_equal(a, b) for a, b in zip(old, new[query["name"]]))
+
+            print(
+                f"{query['name']:>9s} {len(old):7d} {old_time:9.3f} {times['vlen']:9.3f} {times['dense']:10.3f} "
+                f"{old_time / times['dense']:8.1f}"
+            )
@@ -0,0 +1,61 @@
+import tempfile
+import time
+
+import h5py
+import numpy as np
+import qcelemental as qcel
+from qcfractal.interface.collections.dataset_view import HDF5View
+
+n_molecules = 20000
+n_atoms = 12
+subset_trials = [100, 1000, 10000, n_molecules]
+
+bytes_t = h5py.vlen_dtype(np.dtype("uint8"))
+utf8_t = h5py.string_dtype(encoding="utf-8")
+
+
+def build_view(path, n_molecules):
+    """Writes the columnar molecule section of a synthetic view"""
+
+    rng = np.random.default_rng(0)
+    elements = np.array(["H", "C", "N", "O"])
+    geometries = rng.random((n_molecules, n_atoms, 3)) * 10
+    symbols = elements[rng.integers(0, len(elements), (n_molecules, n_atoms))]
+
+    dataset_kwargs = {"chunks": True}
+    with h5py.File(path, "w") as f:
+        molecule_group = f.create_group("molecule")
+        molecule_group.attrs["layout"] = HDF5View._serialize_field("columnar")
+        molecule_group.create_dataset("geometry", data=geometries.reshape(-1, 3), **dataset_kwargs)
+        molecule_group.create_dataset("atom_offsets", data=np.arange(n_molecules + 1) * n_atoms, **dataset_kwargs)
+
+        symbol_table, symbol_index = np.unique(symbols.ravel(), return_inverse=True)
+        molecule_group.create_dataset("symbol_table", data=symbol_table.astype(object), dtype=utf8_t)
+        molecule_group.create_dataset("symbol_index", data=symbol_index, dtype=np.dtype("uint16"), **dataset_kwargs)
+
+        schema = molecule_group.create_dataset("schema", shape=(n_molecules,), dtype=bytes_t, **dataset_kwargs)
+        for i in range(n_molecules):
+            molecule = qcel.models.Molecule(symbols=symbols[i], geometry=geometries[i], validated=True)
+            schema[i] = HDF5View._serialize_data(molecule)
+
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    print(f"Building a synthetic view with {n_molecules} molecules of {n_atoms} atoms...\n")
+    build_view(f"{tmpdir}/view.h5", n_molecules)
+    view = HDF5View(f"{tmpdir}/view.h5")
+
+    rng = np.random.default_rng(1)
+    print(f"{'subset':>8s} {'molecules (mol/s)':>18s} {'arrays (mol/s)':>15s} {'speedup':>8s}")
+    for n in subset_trials:
+        indexes = sorted(rng.choice(n_molecules, n, replace=False))
+
+        t = time.time()
+        molecules = view.get_molecules(indexes)
+        molecule_time = time.time() - t
+
+        t = time.time()
+        geometries, symbols = view.get_molecule_arrays(indexes)
+        array_time = time.time() - t
+
+        assert np.allclose(molecules.iloc[-1].geometry, geometries[-1])
+        print(f"{n:8d} {n / molecule_time:18.1f} {n / array_time:15.1f} {molecule_time / array_time:8.2f}")
@@ -0,0 +1,61 @@
+import time
+import qcfractal
+import qcfractal.interface as ptl
+import numpy as np
+import qcelemental as qcel
+
+print("Building and clearing the database...\n")
+db_name = "molecule_tests"
+storage = qcfractal.storage_socket_factory(f"postgresql://localhost:5432/{db_name}")
+storage._delete_DB_data(db_name)
+
+max_limit = storage.get_limit(None)
+page_trials = [10, 50, 100, 250, 500, max_limit]
+history_per_torsion = 24
+
+mol = qcel.models.Molecule(symbols=["He", "He"], geometry=np.random.rand(2, 3), validated=True)
+mol_id = storage.add_molecules([mol])["data"][0]
+
+qc_spec = {"driver": "gradient", "method": "HF", "basis": "sto-3g", "keywords": None, "program": "psi4"}
+
+print(f"Adding {history_per_torsion} optimizations and {max_limit} torsiondrives...\n")
+opts = [
+    ptl.models.OptimizationRecord(initial_molecule=mol_id, program="geometric", qc_spec=qc_spec, hash_index=str(i))
+    for i in range(history_per_torsion)
+]
+opt_ids = storage.add_procedures(opts)["data"]
+
+torsions = []
+for i in range(max_limit):
+    torsions.append(
+        ptl.models.TorsionDriveRecord(
+            **{
+                "keywords": {"dihedrals": [[0, 1, 2, 3]], "grid_spacing": [15]},
+                "hash_index": f"td_{i}",
+                "optimization_spec": {"program": "geometric", "keywords": {"coordsys": "tric"}},
+                "qc_spec": qc_spec,
+                "initial_molecule": [mol_id],
+                "final_energy_dict": {},
+                "optimization_history": {f"[{15 * x}]": [oid] for x, oid in enumerate(opt_ids)},
+                "minimum_positions": {},
+                "provenance": {"creator": ""},
+            }
+        )
+    )
+storage.add_procedures(torsions)
+
+# Each page joins page_size * history_per_torsion history rows, time per row should stay flat
+print("Running timings for projected relationship joins (optimization_history)...\n")
+print(f"{'page':>6s} {'rows':>8s} {'time (ms)':>10s} {'us/row':>8s}")
+for page in page_trials:
+    t = time.time()
+    ret = storage.get_procedures(
+        procedure="torsiondrive", status=None, include=["id", "optimization_history"], limit=page
+    )
+    ttime = time.time() - t
+
+    assert len(ret["data"]) == page
+    assert len(ret["data"][0]["optimization_history"]) == history_per_torsion
+
+    rows = page * history_per_torsion
+    print(f"{page:6d} {rows:8d} {ttime * 1000:10.3f} {ttime * 1e6 / rows:8.3f}")
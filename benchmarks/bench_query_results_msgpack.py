@@ -0,0 +1,100 @@
+import time
+from qcfractal.interface.models.records import ResultRecord
+from qcfractal.interface.models.rest_models import rest_model
+from qcfractal.web_handlers import APIHandler
+import qcfractal
+import numpy as np
+import qcelemental as qcel
+from qcelemental.util import serialize
+
+db_name = "molecule_tests"
+uri = "postgresql://localhost:5432"
+
+natoms = 50
+num_results = 500
+page_trials = [10, 50, 100, 500]
+
+print("Building and clearing the database...\n")
+storage = qcfractal.storage_socket_factory(f"{uri}/{db_name}", record_cache_size=0)
+storage._delete_DB_data(db_name)
+
+mols = [
+    qcel.models.Molecule(symbols=["He"] * natoms, geometry=np.random.rand(natoms, 3) + 10 * i, validated=True)
+    for i in range(num_results)
+]
+mol_ids = storage.add_molecules(mols)["data"]
+
+print(f"Adding {num_results} gradients and {num_results} Hessians of {natoms} atoms...\n")
+results = []
+for driver, shape in [("gradient", (natoms, 3)), ("hessian", (3 * natoms, 3 * natoms))]:
+    for mid in mol_ids:
+        results.append(
+            ResultRecord(
+                version="1",
+                driver=driver,
+                program="bench",
+                molecule=mid,
+                method="test",
+                basis="6-31g",
+                return_result=np.random.rand(*shape),
+                status="COMPLETE",
+            )
+        )
+storage.add_results(results)
+
+
+class _Writer:
+    """Collects the output of APIHandler.write_raw_msgpack"""
+
+    def write(self, data):
+        self.data = data
+
+
+_, response_model = rest_model("result", "get")
+
+
+def decoded_response(driver, limit):
+    ret = storage.get_results(program="bench", driver=driver, limit=limit)
+    return serialize(response_model(**ret), "msgpack-ext")
+
+
+def raw_response(driver, limit):
+    ret = storage.get_results(program="bench", driver=driver, limit=limit, raw_msgpack=True)
+    writer = _Writer()
+    APIHandler.write_raw_msgpack(writer, ret, response_model)
+    return writer.data
+
+
+# Read and build a msgpack-ext response as the ResultHandler does, with and without decoding the columns
+print("Running timings for building msgpack-ext result responses...\n")
+print(f"{'driver':>8s} {'page':>6s} {'decoded (rec/s)':>16s} {'raw (rec/s)':>12s} {'speedup':>8s}")
+for driver in ["gradient", "hessian"]:
+    for page in page_trials:
+        t = time.time()
+        decoded = decoded_response(driver, page)
+        decoded_time = time.time() - t
+
+        t = time.time()
+        raw = raw_response(driver, page)
+        raw_time = time.time() - t
+
+        assert len(raw) > 0 and len(decoded) > 0
+        print(
+            f"{driver:>8s} {page:6d} {page / decoded_time:16.1f} {page / raw_time:12.1f} {decoded_time / raw_time:8.2f}"
+        )
+
+# Full client round trip, the client decodes the passed through columns itself
+print("\nRunning timings for FractalClient.query_results (msgpack-ext)...\n")
+with qcfractal.FractalSnowflake(max_workers=0, storage_uri=uri, storage_project_name=db_name) as server:
+    client = server.client()
+
+    print(f"{'driver':>8s} {'page':>6s} {'rec/s':>9s}")
+    for driver in ["gradient", "hessian"]:
+        for page in page_trials:
+            t = time.time()
+            ret = client.query_results(program="bench", driver=driver, limit=page)
+            ttime = time.time() - t
+
+            assert len(ret) == page
+            assert ret[0].return_result.shape[0] in (natoms, 3 * natoms)
+            print(f"{driver:>8s} {page:6d} {page / ttime:9.1f}")
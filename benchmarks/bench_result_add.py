@@ -95,3 +95,31 @@ for trial in mol_trials:
     print(f"update: {trial:6d} {ttime:9.3f} {time_per_mol:6.3f}")
     print()
 
+
+print("Running timings for ingestion of completed results (SingleResultTasks.parse_output)...\n")
+from qcfractal.procedures.procedures import SingleResultTasks
+
+parser = SingleResultTasks(storage, storage.logger)
+for trial in mol_trials:
+    results = [create_unique_result() for x in range(trial)]
+    ret = storage.add_results(results)["data"]
+
+    outputs = []
+    for num, rid in enumerate(ret):
+        rdata = {
+            "model": {"method": "test", "basis": "6-31g"},
+            "extras": {},
+            "return_result": np.random.rand(2, 3),
+            "properties": {"return_energy": -1.0},
+            "provenance": {"creator": "bench"},
+            "stdout": "stdout " * 100,
+            "stderr": None,
+            "error": None,
+        }
+        outputs.append({"result": rdata, "task_id": num, "base_result": rid})
+
+    t = time.time()
+    parser.parse_output(outputs)
+    ttime = time.time() - t
+
+    print(f"ingest: {trial:6d} {ttime * 1000:9.3f} {trial / ttime:9.1f} results/sec")
@@ -12,6 +12,7 @@ db_name = "molecule_tests"
 storage = qcfractal.storage_socket_factory(f"postgresql://localhost:5432/{db_name}")
 # storage._delete_DB_data(db_name)
 
+# 0: time a single claim, 1: populate the queue, 2: claim latency as the queue grows
 INSERTION_QUERY_FLAG = 0
 
 COUNTER_MOL = 0
@@ -66,6 +67,39 @@ if (INSERTION_QUERY_FLAG == 1):
         tasks = create_unique_task(status='ERROR', number=num_tasks, num_tags=3, num_programs=3)
         ret = storage.queue_submit(tasks)
         print (f"Inserted #{i}  {len(ret['data'])} tasks.")
+elif (INSERTION_QUERY_FLAG == 2):
+
+    print ("Claim latency as the queue grows")
+    queue_sizes = [1000, 5000, 10000, 50000, 100000]
+    claim_limit = 100
+    tags = ["tag1", "tag2"]
+    storage._delete_DB_data(db_name)
+    storage.manager_update("bench_manager")
+
+    queue_size = 0
+    for target in queue_sizes:
+        while queue_size < target:
+            number = min(2000, target - queue_size)
+            storage.queue_submit(create_unique_task(status='WAITING', number=number, num_tags=3, num_programs=2))
+            queue_size += number
+
+        with storage.engine.connect() as conn:
+            conn.execute("ANALYZE task_queue")
+
+            # Check that every tag branch is served by the partial WAITING index
+            claim_query = storage._queue_next_query(["p1"], [], limit=claim_limit, tag=tags)
+            compiled = claim_query.compile(dialect=storage.engine.dialect, compile_kwargs={"literal_binds": True})
+            plan = "\n".join(row[0] for row in conn.execute(f"EXPLAIN {compiled}"))
+        assert plan.count("ix_task_queue_waiting_tag") == len(tags), plan
+
+        then = time.time()
+        found = storage.queue_get_next("bench_manager", ["p1"], [], tag=tags, limit=claim_limit)
+        now = time.time()
+        print (f"queue size {queue_size:8d}: claimed {len(found):4d} tasks in {(now - then) * 1000:9.3f} ms")
+
+        # Put the claimed tasks back so every measurement sees the same waiting slice
+        storage.queue_reset_status(manager="bench_manager", reset_running=True)
+
 else :
     print ("Running the query!")
     then = time.time()
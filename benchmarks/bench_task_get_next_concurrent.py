@@ -0,0 +1,97 @@
+import time
+import random
+import multiprocessing
+from qcfractal.interface.models.records import ResultRecord
+import qcfractal
+import qcfractal.interface as ptl
+import numpy as np
+import qcelemental as qcel
+
+db_name = "molecule_tests"
+uri = f"postgresql://localhost:5432/{db_name}"
+
+num_tasks = 5000
+claimer_trials = [1, 2, 4, 8, 16, 32]
+claim_limit = 50
+
+COUNTER_MOL = 0
+
+
+def create_unique_tasks(storage, number=1, num_tags=1):
+    global COUNTER_MOL
+
+    mols = []
+    for i in range(number):
+        mol = qcel.models.Molecule(symbols=["He", "He"], geometry=np.random.rand(2, 3) + COUNTER_MOL, validated=True)
+        COUNTER_MOL += 1
+        mols.append(mol)
+    mol_ids = storage.add_molecules(mols)["data"]
+
+    results = [
+        ResultRecord(version="1", driver="energy", program="games", molecule=mid, method="test", basis="6-31g")
+        for mid in mol_ids
+    ]
+    res_ids = storage.add_results(results)["data"]
+
+    tags = ["tag" + str(i + 1) for i in range(num_tags)]
+    tasks = []
+    for rid in res_ids:
+        task = ptl.models.TaskRecord(
+            **{
+                "spec": {"function": "qcengine.compute_procedure", "args": [{"json_blob": "data"}], "kwargs": {}},
+                "tag": random.choice(tags),
+                "program": "p1",
+                "parser": "",
+                "base_result": rid,
+            }
+        )
+        tasks.append(task)
+    return tasks
+
+
+def claim_worker(manager, barrier, queue):
+    """Claims tasks until the queue is empty, reports the claimed ids"""
+
+    storage = qcfractal.storage_socket_factory(uri, skip_version_check=True)
+    storage.manager_update(manager)
+
+    claimed = []
+    barrier.wait()
+    while True:
+        found = storage.queue_get_next(manager, ["p1"], [], tag=["tag1", "tag2"], limit=claim_limit)
+        if len(found) == 0:
+            break
+        claimed.extend(task.id for task in found)
+
+    queue.put(claimed)
+
+
+print("Building and clearing the database...\n")
+storage = qcfractal.storage_socket_factory(uri)
+
+print("Running concurrent claim timings...\n")
+print(f"{'claimers':>8s} {'tasks':>8s} {'time (s)':>9s} {'tasks/s':>9s} {'duplicates':>10s}")
+for n_claimers in claimer_trials:
+    storage._delete_DB_data(db_name)
+    storage.queue_submit(create_unique_tasks(storage, number=num_tasks, num_tags=2))
+
+    barrier = multiprocessing.Barrier(n_claimers + 1)
+    queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=claim_worker, args=(f"manager_{i}", barrier, queue)) for i in range(n_claimers)
+    ]
+    for w in workers:
+        w.start()
+
+    barrier.wait()
+    t = time.time()
+    claimed = [queue.get() for _ in workers]
+    ttime = time.time() - t
+
+    for w in workers:
+        w.join()
+
+    all_ids = [tid for ids in claimed for tid in ids]
+    n_duplicates = len(all_ids) - len(set(all_ids))
+
+    print(f"{n_claimers:8d} {len(all_ids):8d} {ttime:9.3f} {len(all_ids) / ttime:9.1f} {n_duplicates:10d}")
@@ -32,7 +32,7 @@ dependencies:
   - alembic
   - psycopg2 >=2.7
   - postgresql
-  - sqlalchemy >=1.3
+  - sqlalchemy >=1.3.7
 
   # QCPortal dependencies
   - double-conversion >=3.0.0
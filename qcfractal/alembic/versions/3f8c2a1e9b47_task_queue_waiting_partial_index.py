@@ -0,0 +1,29 @@
+"""Partial indices over waiting tasks in the task queue
+
+Revision ID: 3f8c2a1e9b47
+Revises: fb5bd88ae2f3
+Create Date: 2026-10-18 10:12:31.482113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3f8c2a1e9b47"
+down_revision = "fb5bd88ae2f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "Create Index ix_task_queue_waiting_tag on task_queue (tag, priority desc, created_on) "
+        "where status = 'waiting'"
+    )
+    op.execute("Create Index ix_task_queue_waiting on task_queue (priority desc, created_on) where status = 'waiting'")
+
+
+def downgrade():
+    op.execute("Drop Index ix_task_queue_waiting")
+    op.execute("Drop Index ix_task_queue_waiting_tag")
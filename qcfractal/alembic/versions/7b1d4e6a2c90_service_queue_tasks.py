@@ -0,0 +1,33 @@
+"""Index of the procedures each service is waiting on
+
+Revision ID: 7b1d4e6a2c90
+Revises: 3f8c2a1e9b47
+Create Date: 2026-10-18 14:37:05.219341
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7b1d4e6a2c90"
+down_revision = "3f8c2a1e9b47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "service_queue_tasks",
+        sa.Column("service_id", sa.Integer(), nullable=False),
+        sa.Column("procedure_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["procedure_id"], ["base_result.id"], ondelete="cascade"),
+        sa.ForeignKeyConstraint(["service_id"], ["service_queue.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("service_id", "procedure_id"),
+    )
+    op.create_index("ix_service_queue_tasks_procedure_id", "service_queue_tasks", ["procedure_id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_service_queue_tasks_procedure_id", table_name="service_queue_tasks")
+    op.drop_table("service_queue_tasks")
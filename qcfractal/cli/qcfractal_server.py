@@ -4,16 +4,21 @@ A command line interface to the qcfractal server.
 
 import os
 import argparse
+import concurrent.futures
+import functools
+import json
 import shutil
 import sys
+import time
 
 import yaml
 
 import qcfractal
 
 from ..config import DatabaseSettings, FractalConfig, FractalServerSettings, _str2bool
+from ..interface.models import Molecule
 from ..postgres_harness import PostgresHarness
-from ..storage_sockets import storage_socket_factory
+from ..storage_sockets import ViewHandler, storage_socket_factory
 from .cli_utils import install_signal_handlers
 
 
@@ -78,7 +83,7 @@ def parse_args():
 
     # Allow port and logfile to be altered on the fly
     fractal_args = start.add_argument_group("Server Settings")
-    for field in ["port", "logfile"]:
+    for field in ["port", "logfile", "num_workers"]:
         cli_name = "--" + field.replace("_", "-")
         fractal_args.add_argument(cli_name, **FractalServerSettings.help_info(field))
 
@@ -193,6 +198,52 @@ def parse_args():
     #     "--force", action="store_true", help="If True, do not ask if the user wishes to delete the current database."
     # )
 
+    # Bulk imports
+    import_molecules = subparsers.add_parser(
+        "import-molecules", help="Bulk loads molecules from a file directly into the database."
+    )
+    import_molecules.add_argument(
+        "filename",
+        type=str,
+        help="A JSON file holding a list of molecules, or a JSON lines file (.jsonl) with one molecule per line.",
+    )
+    import_molecules.add_argument(
+        "--chunk-size", default=50000, type=int, help="The number of molecules loaded in each transaction."
+    )
+    import_molecules.add_argument(
+        "--hash-processes", default=None, type=int, help="The number of processes used to compute molecule hashes."
+    )
+    import_molecules.add_argument(
+        "--ids-file", default=None, type=str, help="Writes the molecule ids to this file, one per line in input order."
+    )
+    import_molecules.add_argument("--base-folder", **FractalConfig.help_info("base_folder"))
+
+    # Collection views
+    update_views = subparsers.add_parser(
+        "update-views", help="Writes the views of all datasets and reaction datasets to the server view directory."
+    )
+    update_views.add_argument(
+        "--fractal-uri",
+        default=None,
+        type=str,
+        help="The address of the running server to read collections from, defaults to localhost and the server port.",
+    )
+    update_views.add_argument("--username", default=None, type=str, help="The username to connect to the server.")
+    update_views.add_argument("--password", default=None, type=str, help="The password to connect to the server.")
+    update_views.add_argument(
+        "--verify", default=False, type=_str2bool, help="Verify the SSL certificate of the server."
+    )
+    update_views.add_argument(
+        "--processes", default=2, type=int, help="The number of views written at the same time, in separate processes."
+    )
+    update_views.add_argument(
+        "--column-workers", default=4, type=int, help="The number of value columns fetched concurrently for each view."
+    )
+    update_views.add_argument(
+        "--full", action="store_true", help="Rewrite views from scratch rather than only fetching missing data."
+    )
+    update_views.add_argument("--base-folder", **FractalConfig.help_info("base_folder"))
+
     ### Move args around
     args = vars(parser.parse_args())
 
@@ -328,7 +379,7 @@ def server_start(args, config):
     print("Starting a QCFractal server.\n")
 
     print(f"QCFractal server base folder: {config.base_folder}")
-    # Build an optional adapter
+    # Build an optional adapter, only in the worker hosting the manager
     if args["local_manager"]:
         ncores = args["local_manager"]
         if ncores == -1:
@@ -336,10 +387,10 @@ def server_start(args, config):
 
         from concurrent.futures import ProcessPoolExecutor
 
-        adapter = ProcessPoolExecutor(max_workers=ncores)
+        adapter_factory = functools.partial(ProcessPoolExecutor, max_workers=ncores)
 
     else:
-        adapter = None
+        adapter_factory = None
 
     print("\n>>> Examining SSL Certificates...")
     # Handle SSL
@@ -377,6 +428,7 @@ def server_start(args, config):
             name=args.get("server_name", None) or config.fractal.name,
             port=config.fractal.port,
             compress_response=config.fractal.compress_response,
+            num_workers=config.fractal.num_workers,
             # Security
             security=config.fractal.security,
             allow_read=config.fractal.allow_read,
@@ -385,6 +437,9 @@ def server_start(args, config):
             storage_uri=config.database_uri(safe=False, database=""),
             storage_project_name=config.database.database_name,
             query_limit=config.fractal.query_limit,
+            storage_threads=config.fractal.storage_threads,
+            auth_cache_ttl=config.fractal.auth_cache_ttl,
+            record_cache_size=config.fractal.record_cache_size * 1024 ** 2,
             # Collection views
             view_enabled=config.view.enable,
             view_path=config.view_path,
@@ -396,7 +451,8 @@ def server_start(args, config):
             service_frequency=config.fractal.service_frequency,
             heartbeat_frequency=config.fractal.heartbeat_frequency,
             max_active_services=config.fractal.max_active_services,
-            queue_socket=adapter,
+            service_processes=config.fractal.service_processes,
+            queue_socket_factory=adapter_factory,
         )
 
     except Exception as e:
@@ -412,10 +468,13 @@ def server_start(args, config):
 
     # Blocks until keyboard interupt
     print("\n>>> Starting the QCFractal server...")
-    if args["start_periodics"]:
-        print("Periodics are enabled.")
-    else:
-        print("Periodics are disabled.")
+    if server.worker_id == 0:
+        if args["start_periodics"] and (server.num_workers > 1):
+            print(f"Periodics are enabled, handled by worker 1 of {server.num_workers}.")
+        elif args["start_periodics"]:
+            print("Periodics are enabled.")
+        else:
+            print("Periodics are disabled.")
 
     server.start(start_periodics=args["start_periodics"])
 
@@ -566,6 +625,143 @@ def server_restore(args, config):
     print("Restore complete!")
 
 
+def _read_molecule_chunks(filename, chunk_size):
+    """Yields lists of molecules from a JSON or JSON lines file, JSON lines files are streamed"""
+
+    if filename.endswith(".jsonl"):
+        chunk = []
+        with open(filename, "r") as handle:
+            for line in handle:
+                if line.strip():
+                    chunk.append(Molecule(**json.loads(line)))
+
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+
+        if chunk:
+            yield chunk
+
+    else:
+        with open(filename, "r") as handle:
+            data = json.load(handle)
+
+        for start in range(0, len(data), chunk_size):
+            yield [Molecule(**mol) for mol in data[start : start + chunk_size]]
+
+
+def server_import_molecules(args, config):
+    standard_command_startup("molecule import", config)
+
+    filename = args["filename"]
+    if not os.path.isfile(filename):
+        print(f"Provided filename {filename} does not exist.")
+        sys.exit(1)
+
+    storage = storage_socket_factory(config.database_uri(safe=False))
+
+    print(f"\n>>> Importing molecules from {filename}...")
+
+    ids = []
+    n_inserted = 0
+    start = time.time()
+    for chunk in _read_molecule_chunks(filename, args["chunk_size"]):
+        ret = storage.bulk_add_molecules(chunk, chunk_size=args["chunk_size"], hash_processes=args["hash_processes"])
+        ids.extend(ret["data"])
+        n_inserted += ret["meta"]["n_inserted"]
+
+        elapsed = time.time() - start
+        print(f"Loaded {len(ids)} molecules ({n_inserted} new) in {elapsed:.1f}s, {len(ids) / elapsed:.1f} molecules/s")
+
+    if args["ids_file"] is not None:
+        with open(args["ids_file"], "w") as handle:
+            handle.writelines(f"{mol_id}\n" for mol_id in ids)
+        print(f"Wrote molecule ids to {args['ids_file']}")
+
+    print(f"Import complete! {n_inserted} molecules added, {len(ids) - n_inserted} duplicates.")
+
+
+def _list_view_collections(storage):
+    """The id, type and name of all collections which have views"""
+
+    collections = []
+    for collection in ["dataset", "reactiondataset"]:
+        found = []
+        while True:
+            ret = storage.get_collections(collection=collection, include=["id", "collection", "name"], skip=len(found))
+            found.extend(ret["data"])
+            if (len(ret["data"]) == 0) or (len(found) >= ret["meta"]["n_found"]):
+                break
+        collections.extend(found)
+
+    return collections
+
+
+def _update_view(address, username, password, verify, collection, name, path, incremental, column_workers):
+    """Writes the view of a single collection, returns the time taken and any error"""
+
+    from ..interface import FractalClient
+    from ..interface.collections import HDF5View
+
+    start = time.time()
+    try:
+        client = FractalClient(address, username=username, password=password, verify=verify)
+        ds = client.get_collection(collection, name)
+        HDF5View(path).write(ds, incremental=incremental, max_workers=column_workers)
+    except Exception as e:
+        return time.time() - start, f"{type(e).__name__}: {e}"
+
+    return time.time() - start, None
+
+
+def server_update_views(args, config):
+    standard_command_startup("view update", config)
+
+    if not config.view.enable:
+        print("Views are disabled in the server configuration.")
+        sys.exit(1)
+
+    storage = storage_socket_factory(config.database_uri(safe=False))
+    view_handler = ViewHandler(config.view_path)
+    collections = _list_view_collections(storage)
+
+    address = args["fractal_uri"] or f"localhost:{config.fractal.port}"
+    incremental = not args["full"]
+    print(f"\n>>> Writing {len(collections)} views to {config.view_path} from {address}...")
+
+    n_failed = 0
+    start = time.time()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args["processes"]) as executor:
+        futures = {}
+        for col in collections:
+            future = executor.submit(
+                _update_view,
+                address,
+                args["username"],
+                args["password"],
+                args["verify"],
+                col["collection"],
+                col["name"],
+                view_handler.view_path(col["id"]),
+                incremental,
+                args["column_workers"],
+            )
+            futures[future] = col
+
+        for future in concurrent.futures.as_completed(futures):
+            col = futures[future]
+            elapsed, error = future.result()
+            if error is None:
+                print(f"Wrote view of {col['collection']} {col['name']} (id {col['id']}) in {elapsed:.1f}s")
+            else:
+                n_failed += 1
+                print(f"Failed to write view of {col['collection']} {col['name']} (id {col['id']}): {error}")
+
+    print(f"Views updated in {time.time() - start:.1f}s, {len(collections) - n_failed} written, {n_failed} failed.")
+    if n_failed:
+        sys.exit(1)
+
+
 def main(args=None):
 
     # Grab CLI args if not present
@@ -616,6 +812,10 @@ def main(args=None):
         server_backup(args, config)
     elif command == "restore":
         server_restore(args, config)
+    elif command == "import-molecules":
+        server_import_molecules(args, config)
+    elif command == "update-views":
+        server_update_views(args, config)
 
 
 if __name__ == "__main__":
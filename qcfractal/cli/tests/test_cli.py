@@ -127,6 +127,34 @@ def test_cli_user_remove(qcfractal_base_init):
     assert testing.run_process(args, **_options) is False
 
 
+@pytest.mark.slow
+def test_cli_import_molecules(qcfractal_base_init, tmp_path):
+    mols = [
+        qcfractal.interface.Molecule(symbols=["He", "He"], geometry=[0, 0, 0, 0, 0, 2 + x]).json() for x in range(5)
+    ]
+    filename = tmp_path / "molecules.jsonl"
+    filename.write_text("\n".join(mols + mols[:2]))
+
+    ids_file = tmp_path / "ids.txt"
+    args = [
+        "qcfractal-server",
+        "import-molecules",
+        qcfractal_base_init,
+        str(filename),
+        "--chunk-size=3",
+        f"--ids-file={ids_file}",
+    ]
+    assert testing.run_process(args, **_options)
+
+    ids = ids_file.read_text().split()
+    assert len(ids) == 7
+    assert len(set(ids)) == 5
+    assert ids[5:] == ids[:2]
+
+    args = ["qcfractal-server", "import-molecules", qcfractal_base_init, str(tmp_path / "missing.jsonl")]
+    assert testing.run_process(args, **_options) is False
+
+
 @pytest.mark.xfail(reason="Failing on Travis for unknown reasons.")
 @pytest.mark.slow
 def test_cli_server_local_boot(qcfractal_base_init):
@@ -170,6 +198,26 @@ def test_with_api_logging(postgres_server, log_apis):
     assert testing.run_process(args, interupt_after=10, **_options)
 
 
+@pytest.mark.slow
+def test_cli_update_views(active_server, qcfractal_base_init):
+    address = active_server.test_uri_cli.split("=")[1]
+    client = qcfractal.interface.FractalClient(address, verify=False)
+
+    ds = qcfractal.interface.collections.Dataset("cli_view_ds", client)
+    ds.add_entry("He1", qcfractal.interface.Molecule(symbols=["He", "He"], geometry=[0, 0, 0, 0, 0, 2]))
+    ds.save()
+
+    args = ["qcfractal-server", "update-views", qcfractal_base_init, active_server.test_uri_cli, "--processes=1"]
+    assert testing.run_process(args, **_options)
+
+    view_path = os.path.join(qcfractal_base_init.split("=")[1], "views", f"{ds.data.id}.hdf5")
+    assert os.path.isfile(view_path)
+
+    # Views are only extended with missing data unless fully rewritten
+    assert testing.run_process(args, **_options)
+    assert testing.run_process(args + ["--full"], **_options)
+
+
 @pytest.mark.slow
 def test_manager_local_testing_process():
     assert testing.run_process(["qcfractal-manager", "--adapter=pool", "--test", "--tasks-per-worker=2"], **_options)
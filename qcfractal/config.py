@@ -108,9 +108,35 @@ class FractalServerSettings(ConfigSettings):
     )
 
     query_limit: int = Field(1000, description="The maximum number of records to return per query.")
+    storage_threads: int = Field(
+        5,
+        description="The number of threads running blocking database calls for API requests, this many requests "
+        "can access the database at the same time.",
+    )
+    auth_cache_ttl: float = Field(
+        60,
+        description="The time (in seconds) successful user verifications are cached by each server worker. Users "
+        "changed through the ``qcfractal-server user`` CLI or another worker keep their old credentials and "
+        "permissions in the other workers for up to this long. Set to 0 to disable the cache.",
+    )
+    record_cache_size: int = Field(
+        64,
+        description="The size (in MB) of the cache of complete results and procedures kept by each server worker. "
+        "Set to 0 to disable the cache.",
+    )
+    num_workers: int = Field(
+        1,
+        description="The number of HTTP worker processes to fork. Periodic updates (services, heartbeats, server "
+        "logs) run in a single worker.",
+    )
     logfile: Optional[str] = Field("qcfractal_server.log", description="The logfile to write server logs.")
     service_frequency: int = Field(60, description="The frequency to update the QCFractal services.")
     max_active_services: int = Field(20, description="The maximum number of concurrent active services.")
+    service_processes: int = Field(
+        0,
+        description="The number of worker processes iterating services concurrently. If 0, services are iterated "
+        "one after another in the server.",
+    )
     heartbeat_frequency: int = Field(1800, description="The frequency (in seconds) to check the heartbeat of workers.")
     log_apis: bool = Field(
         False,
@@ -4,14 +4,17 @@ import json
 import os
 import re
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, DefaultDict, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, DefaultDict, Dict, Iterator, List, Optional, Tuple, Union
 
+import msgpack
 import pandas as pd
 import requests
 from pydantic import ValidationError
+from qcelemental.util import deserialize
+from qcelemental.util.serialization import msgpackext_decode
 
 from .collections import collection_factory, collections_name_map
-from .models import build_procedure
+from .models import Molecule, ResultRecord, build_procedure
 from .models.rest_models import rest_model
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -21,9 +24,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from .models import (
         GridOptimizationInput,
         KeywordSet,
-        Molecule,
         ObjectId,
-        ResultRecord,
         TaskRecord,
         TorsionDriveInput,
     )
@@ -64,6 +65,22 @@ def _version_list(version):
     return [int(x) for x in version.split(".")]
 
 
+def _iter_frames(response: requests.Response, encoding: str) -> Iterator[Any]:
+    """Decodes the frames of a streamed server response as they arrive, msgpack frames
+    are concatenated objects while JSON frames are newline delimited.
+    """
+
+    if encoding == "msgpack-ext":
+        unpacker = msgpack.Unpacker(object_hook=msgpackext_decode, raw=False)
+        for chunk in response.iter_content(chunk_size=None):
+            unpacker.feed(chunk)
+            yield from unpacker
+    else:
+        for line in response.iter_lines():
+            if line:
+                yield deserialize(line.decode(), encoding)
+
+
 ### Fractal Client
 
 
@@ -207,10 +224,11 @@ class FractalClient(object):
         data: Optional[str] = None,
         noraise: bool = False,
         timeout: Optional[int] = None,
+        stream: bool = False,
     ) -> requests.Response:
 
         addr = self.address + service
-        kwargs = {"data": data, "timeout": timeout, "headers": self._headers, "verify": self._verify}
+        kwargs = {"data": data, "timeout": timeout, "headers": self._headers, "verify": self._verify, "stream": stream}
 
         if self._mock_network_error:
             raise requests.exceptions.RequestException("mock_network_error is on, failing by design!")
@@ -279,6 +297,48 @@ class FractalClient(object):
         else:
             return response.data
 
+    def _automodel_stream(
+        self, name: str, rest: str, payload: Dict[str, Any], timeout: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Streamed variant of `_automodel_request`, the server sends records one at a time
+        which are yielded as they are decoded.
+
+        Parameters
+        ----------
+        name : str
+            The name of the REST endpoint
+        rest : str
+            The type of the REST endpoint
+        payload : Dict[str, Any]
+            The input dictionary
+        timeout : int, optional
+            Timeout time
+
+        Returns
+        -------
+        Iterator[Dict[str, Any]]
+            The records of the REST response
+        """
+        sname = name.strip("/")
+        self._request_counter[(sname, rest)] += 1
+
+        body_model, response_model = rest_model(sname, rest)
+
+        # Provide a reasonable traceback
+        try:
+            payload = body_model(**{**payload, "meta": {**payload.get("meta", {}), "stream": True}})
+        except ValidationError as exc:
+            raise TypeError(str(exc))
+
+        with self._request(rest, name, data=payload.serialize(self.encoding), timeout=timeout, stream=True) as r:
+            encoding = r.headers["Content-Type"].split("/")[1]
+            frames = _iter_frames(r, encoding)
+
+            # The first frame carries the response metadata
+            response_model(meta=next(frames)["meta"], data=[])
+            for frame in frames:
+                yield frame["data"]
+
     @classmethod
     def from_file(cls, load_path: Optional[str] = None) -> "FractalClient":
         """Creates a new FractalClient from file. If no path is passed in, the
@@ -408,6 +468,30 @@ class FractalClient(object):
         response = self._automodel_request("molecule", "get", payload, full_return=full_return)
         return response
 
+    def iter_molecules(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        molecule_hash: Optional["QueryStr"] = None,
+        molecular_formula: Optional["QueryStr"] = None,
+        limit: Optional[int] = None,
+        skip: int = 0,
+    ) -> Iterator["Molecule"]:
+        """Queries molecules from the database, streaming them one at a time rather than
+        materializing the full list. See `query_molecules` for the parameters.
+
+        Returns
+        -------
+        Iterator[Molecule]
+            An iterator over the found molecules.
+        """
+
+        payload = {
+            "meta": {"limit": limit, "skip": skip},
+            "data": {"id": id, "molecule_hash": molecule_hash, "molecular_formula": molecular_formula},
+        }
+        for molecule in self._automodel_stream("molecule", "get", payload):
+            yield Molecule(**molecule)
+
     def add_molecules(self, mol_list: List["Molecule"], full_return: bool = False) -> List[str]:
         """Adds molecules to the Server.
 
@@ -660,6 +744,8 @@ class FractalClient(object):
         status: "QueryStr" = "COMPLETE",
         limit: Optional[int] = None,
         skip: int = 0,
+        after_id: Optional["ObjectId"] = None,
+        count: bool = True,
         include: Optional["QueryListStr"] = None,
         full_return: bool = False,
     ) -> Union["ResultGETResponse", List["ResultRecord"], Dict[str, Any]]:
@@ -689,6 +775,11 @@ class FractalClient(object):
             The maximum number of Results to query
         skip : int, optional
             The number of Results to skip in the query, used during pagination
+        after_id : ObjectId, optional
+            Only returns Results with an ``id`` greater than this one, ordered by ``id``. Pass the last ``id``
+            of the previous page (or 0 to start) to paginate without the cost of a deep ``skip``.
+        count : bool, optional
+            Counts the total number of matching Results, skipping the count speeds up pagination.
         include : QueryListStr, optional
             Filters the returned fields, will return a dictionary rather than an object.
         full_return : bool, optional
@@ -701,7 +792,7 @@ class FractalClient(object):
             dictionary of results with include.
         """
         payload = {
-            "meta": {"limit": limit, "skip": skip, "include": include},
+            "meta": {"limit": limit, "skip": skip, "after_id": after_id, "count": count, "include": include},
             "data": {
                 "id": id,
                 "task_id": task_id,
@@ -726,6 +817,49 @@ class FractalClient(object):
         else:
             return response.data
 
+    def iter_results(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        task_id: Optional["QueryObjectId"] = None,
+        program: Optional["QueryStr"] = None,
+        molecule: Optional["QueryObjectId"] = None,
+        driver: Optional["QueryStr"] = None,
+        method: Optional["QueryStr"] = None,
+        basis: Optional["QueryStr"] = None,
+        keywords: Optional["QueryObjectId"] = None,
+        status: "QueryStr" = "COMPLETE",
+        limit: Optional[int] = None,
+        skip: int = 0,
+        include: Optional["QueryListStr"] = None,
+    ) -> Iterator[Union["ResultRecord", Dict[str, Any]]]:
+        """Queries ResultRecords from the server, streaming them one at a time rather than
+        materializing the full list. See `query_results` for the parameters.
+
+        Returns
+        -------
+        Iterator[Union[ResultRecord, Dict[str, Any]]]
+            An iterator over the found ResultRecords without include, or over
+            dictionaries of results with include.
+        """
+        payload = {
+            "meta": {"limit": limit, "skip": skip, "include": include},
+            "data": {
+                "id": id,
+                "task_id": task_id,
+                "program": program,
+                "molecule": molecule,
+                "driver": driver,
+                "method": method,
+                "basis": basis,
+                "keywords": keywords,
+                "status": status,
+            },
+        }
+        for result in self._automodel_stream("result", "get", payload):
+            if not include:
+                result = ResultRecord(**result, client=self)
+            yield result
+
     def query_procedures(
         self,
         id: Optional["QueryObjectId"] = None,
@@ -736,6 +870,8 @@ class FractalClient(object):
         status: "QueryStr" = "COMPLETE",
         limit: Optional[int] = None,
         skip: int = 0,
+        after_id: Optional["ObjectId"] = None,
+        count: bool = True,
         include: Optional["QueryListStr"] = None,
         full_return: bool = False,
     ) -> Union["ProcedureGETResponse", List[Dict[str, Any]]]:
@@ -759,6 +895,11 @@ class FractalClient(object):
             The maximum number of Procedures to query
         skip : int, optional
             The number of Procedures to skip in the query, used during pagination
+        after_id : ObjectId, optional
+            Only returns Procedures with an ``id`` greater than this one, ordered by ``id``. Pass the last ``id``
+            of the previous page (or 0 to start) to paginate without the cost of a deep ``skip``.
+        count : bool, optional
+            Counts the total number of matching Procedures, skipping the count speeds up pagination.
         include : QueryListStr, optional
             Filters the returned fields, will return a dictionary rather than an object.
         full_return : bool, optional
@@ -772,7 +913,7 @@ class FractalClient(object):
         """
 
         payload = {
-            "meta": {"limit": limit, "skip": skip, "include": include},
+            "meta": {"limit": limit, "skip": skip, "after_id": after_id, "count": count, "include": include},
             "data": {
                 "id": id,
                 "task_id": task_id,
@@ -793,6 +934,44 @@ class FractalClient(object):
         else:
             return response.data
 
+    def iter_procedures(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        task_id: Optional["QueryObjectId"] = None,
+        procedure: Optional["QueryStr"] = None,
+        program: Optional["QueryStr"] = None,
+        hash_index: Optional["QueryStr"] = None,
+        status: "QueryStr" = "COMPLETE",
+        limit: Optional[int] = None,
+        skip: int = 0,
+        include: Optional["QueryListStr"] = None,
+    ) -> Iterator[Union["RecordBase", Dict[str, Any]]]:
+        """Queries Procedures from the server, streaming them one at a time rather than
+        materializing the full list. See `query_procedures` for the parameters.
+
+        Returns
+        -------
+        Iterator[Union['RecordBase', Dict[str, Any]]]
+            An iterator over the found Procedures without include, or over
+            dictionaries of procedures with include.
+        """
+
+        payload = {
+            "meta": {"limit": limit, "skip": skip, "include": include},
+            "data": {
+                "id": id,
+                "task_id": task_id,
+                "program": program,
+                "procedure": procedure,
+                "hash_index": hash_index,
+                "status": status,
+            },
+        }
+        for procedure in self._automodel_stream("procedure", "get", payload):
+            if not include:
+                procedure = build_procedure(procedure, client=self)
+            yield procedure
+
     ### Compute section
 
     def add_compute(
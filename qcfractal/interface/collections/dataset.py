@@ -219,7 +219,7 @@ class Dataset(Collection):
 
         self.set_view(local_path)
 
-    def to_file(self, path: Union[str, Path], encoding: str) -> None:
+    def to_file(self, path: Union[str, Path], encoding: str, incremental: bool = False) -> None:
         """
         Writes a view of the dataset to a file
 
@@ -229,6 +229,8 @@ class Dataset(Collection):
             Where to write the file
         encoding: str
             Options: plaintext, hdf5
+        incremental: bool, optional
+            Only fetch the data missing from an existing HDF5 view of the dataset at path
         """
         if encoding.lower() == "plaintext":
             from . import PlainTextView
@@ -237,7 +239,7 @@ class Dataset(Collection):
         elif encoding.lower() in ["hdf5", "h5"]:
             from . import HDF5View
 
-            HDF5View(path).write(self)
+            HDF5View(path).write(self, incremental=incremental)
         else:
             raise NotImplementedError(f"Unsupported encoding: {encoding}")
 
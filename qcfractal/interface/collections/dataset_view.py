@@ -1,10 +1,16 @@
 import abc
+import collections
+import concurrent.futures
+import copy
 import distutils
 import hashlib
+import os
 import pathlib
 import shutil
 import tarfile
 import tempfile
+import threading
+import uuid
 import warnings
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NoReturn, Optional, Tuple, Union
@@ -106,16 +112,108 @@ class DatasetView(abc.ABC):
         """
 
 
+class HDF5FilePool:
+    """
+    A bounded, thread-safe pool of open read-only HDF5 files. The least recently used file is closed
+    once more than maxsize files are open.
+
+    Files are keyed by path, inode and modification time, a file which has been rewritten since it was opened is
+    opened again and its stale handle closed. Handles still in use are only closed once they are released.
+    """
+
+    class _Handle:
+        __slots__ = ("stat", "file", "refs", "closing")
+
+        def __init__(self, stat, file):
+            self.stat = stat
+            self.file = file
+            self.refs = 0
+            self.closing = False
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._handles = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    @staticmethod
+    def file_stat(path: Union[str, pathlib.Path]) -> Tuple[int, int, int]:
+        """The inode, modification time and size of a file, which identify a version of it"""
+        stat = os.stat(path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @contextmanager
+    def open(self, path: Union[str, pathlib.Path]) -> Iterator["h5py.File"]:
+        import h5py
+
+        path = str(pathlib.Path(path).resolve())
+        stat = self.file_stat(path)
+
+        with self._lock:
+            handle = self._handles.get(path)
+            if (handle is not None) and (handle.stat != stat):
+                self._discard(path)
+                handle = None
+
+            if handle is None:
+                handle = self._Handle(stat, h5py.File(path, "r"))
+                self._handles[path] = handle
+                while len(self._handles) > self.maxsize:
+                    self._discard(next(iter(self._handles)))
+
+            self._handles.move_to_end(path)
+            handle.refs += 1
+
+        try:
+            yield handle.file
+        finally:
+            with self._lock:
+                handle.refs -= 1
+                if handle.closing and (handle.refs == 0):
+                    handle.file.close()
+
+    def invalidate(self, path: Union[str, pathlib.Path]) -> None:
+        """Closes the handle of a file, if it is open"""
+
+        path = str(pathlib.Path(path).resolve())
+        with self._lock:
+            if path in self._handles:
+                self._discard(path)
+
+    def close(self) -> None:
+        """Closes all handles"""
+
+        with self._lock:
+            for path in list(self._handles):
+                self._discard(path)
+
+    def _discard(self, path: str) -> None:
+        """Removes a handle from the pool and closes it once released, the lock must be held"""
+
+        handle = self._handles.pop(path)
+        handle.closing = True
+        if handle.refs == 0:
+            handle.file.close()
+
+
 class HDF5View(DatasetView):
-    def __init__(self, path: Union[str, pathlib.Path]) -> None:
+    # Columns of these drivers are written as dense or ragged float arrays rather than variable length rows
+    _array_drivers = {"gradient", "hessian"}
+
+    def __init__(self, path: Union[str, pathlib.Path], file_pool: Optional[HDF5FilePool] = None) -> None:
         """
         Parameters
         ----------
         path: Union[str, pathlib.Path]
             File path of view
+        file_pool: Optional[HDF5FilePool]
+            A pool of open files to read the view through, otherwise the file is opened for every read
         """
         path = pathlib.Path(path)
         self._path = path
+        self._file_pool = file_pool
         self._entries: pd.DataFrame = None
         self._index: pd.DataFrame = None
 
@@ -166,50 +264,193 @@ class HDF5View(DatasetView):
             for query in queries:
                 dataset_name = "value/" if query["native"] else "contributed_value/"
                 dataset_name += self._normalize_hdf5_name(query["name"])
-                driver = query["driver"]
 
-                dataset = f[dataset_name]
-                if not h5py.check_dtype(vlen=dataset.dtype):
-                    data = [dataset[i] for i in indexes]
-                else:
-                    if driver.lower() == "gradient":
-                        data = [np.reshape(dataset[i], (-1, 3)) for i in indexes]
-                    elif driver.lower() == "hessian":
-                        data = []
-                        for i in indexes:
-                            n2 = len(dataset[i])
-                            n = int(round(np.sqrt(n2)))
-                            data.append(np.reshape(dataset[i], (n, n)))
-                    else:
-                        warnings.warn(
-                            f"Variable length data type not understood, returning flat array " f"(driver = {driver}).",
-                            RuntimeWarning,
-                        )
-                        try:
-                            data = [np.array(dataset[i]) for i in indexes]
-                        except ValueError:
-                            data = [dataset[i] for i in indexes]
                 column_name = query["name"]
-                column_units = self._deserialize_field(dataset.attrs["units"])
-                ret[column_name] = data
-                units[column_name] = column_units
+                ret[column_name] = self._read_column(f, dataset_name, indexes, query["driver"])
+                units[column_name] = self._deserialize_field(f[dataset_name].attrs["units"])
 
         return ret, units
 
+    def _read_column(
+        self, f: "h5py.File", dataset_name: str, indexes: List[int], driver: str
+    ) -> Union[np.ndarray, List[Any]]:
+        """Reads the rows of a value column at indexes"""
+        import h5py
+
+        dataset = f[dataset_name]
+        if "layout" in dataset.attrs:
+            # Dense or ragged gradient and hessian columns
+            return self._read_array_rows(f, dataset_name, indexes, driver.lower())
+        elif not h5py.check_dtype(vlen=dataset.dtype):
+            # Fixed width rows (dipoles) are stored as one array per entry
+            rows = self._read_rows(dataset, indexes)
+            return list(rows) if rows.ndim > 1 else rows
+        else:
+            # Variable length columns written by older versions
+            rows = self._read_rows(dataset, indexes)
+            if driver.lower() in self._array_drivers:
+                return self._reshape_rows(rows, driver.lower())
+            else:
+                warnings.warn(
+                    f"Variable length data type not understood, returning flat array " f"(driver = {driver}).",
+                    RuntimeWarning,
+                )
+                try:
+                    return [np.array(row) for row in rows]
+                except ValueError:
+                    return list(rows)
+
+    @staticmethod
+    def _read_rows(dataset: "h5py.Dataset", indexes: List[int]) -> np.ndarray:
+        """
+        Reads the rows of a dataset at indexes, in order and with repeats, through a single selection.
+
+        The sorted unique rows are read as one hyperslab covering them if they are dense enough,
+        otherwise as one point selection, and then put back in the requested order.
+        """
+
+        indexes = np.asarray(indexes, dtype=np.int64)
+        if len(indexes) == 0:
+            return dataset[0:0]
+
+        unique, inverse = np.unique(indexes, return_inverse=True)
+        start, stop = unique[0], unique[-1] + 1
+        if (stop - start) <= 4 * len(unique):
+            rows = dataset[start:stop]
+            if (stop - start) != len(unique):
+                rows = rows[unique - start]
+        else:
+            rows = dataset[unique]
+
+        return rows[inverse]
+
+    def _read_array_rows(self, f: "h5py.File", dataset_name: str, indexes: List[int], driver: str) -> List[np.ndarray]:
+        """
+        Reads the rows of a dense or ragged gradient or hessian column as views of the arrays read.
+        Missing rows give empty arrays, as for variable length columns.
+        """
+
+        dataset = f[dataset_name]
+        layout = self._deserialize_field(dataset.attrs["layout"])
+        empty = np.empty((0, 3)) if driver == "gradient" else np.empty((0, 0))
+
+        if layout == "dense":
+            block = self._read_rows(dataset, indexes)
+            if len(block) == 0:
+                return []
+            missing = np.isnan(block.reshape(len(block), -1)).all(axis=1)
+            return [empty if m else row for row, m in zip(block, missing)]
+
+        elif layout == "ragged":
+            indexes = np.asarray(indexes, dtype=np.int64)
+            offsets = f["offsets/" + dataset_name]
+            starts = self._read_rows(offsets, indexes)
+            stops = self._read_rows(offsets, indexes + 1)
+            rows = self._read_ragged_rows(dataset, starts, stops)
+
+            return [row.reshape(self._array_row_shape(driver, row.size)) if row.size else empty for row in rows]
+
+        else:
+            raise ValueError(f"Unknown layout ({layout}) of column {dataset_name}.")
+
+    @staticmethod
+    def _read_ragged_rows(dataset: "h5py.Dataset", starts: np.ndarray, stops: np.ndarray) -> List[np.ndarray]:
+        """
+        Reads the rows [start, stop) of a concatenated dataset, as views of one hyperslab over the requested
+        rows if they are dense enough, otherwise one read per row.
+        """
+
+        if len(starts) == 0:
+            return []
+
+        lo, hi = starts.min(), stops.max()
+        if (hi - lo) <= 4 * (stops - starts).sum():
+            flat = dataset[lo:hi]
+            return [flat[start - lo : stop - lo] for start, stop in zip(starts, stops)]
+        else:
+            return [dataset[start:stop] for start, stop in zip(starts, stops)]
+
+    @staticmethod
+    def _array_row_shape(driver: str, size: int) -> Tuple[int, int]:
+        """The shape of a flattened gradient or hessian row of size elements"""
+
+        if driver == "gradient":
+            return (size // 3, 3)
+        else:
+            n = int(round(np.sqrt(size)))
+            return (n, n)
+
+    @staticmethod
+    def _reshape_rows(rows: np.ndarray, driver: str) -> List[np.ndarray]:
+        """
+        Reshapes the flattened rows of a gradient or hessian column, rows of the same length are
+        stacked and reshaped together. Missing rows (length 0) give empty arrays.
+        """
+
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+
+        data = [None] * len(rows)
+        for length in np.unique(lengths):
+            idx = np.flatnonzero(lengths == length)
+            shape = HDF5View._array_row_shape(driver, length)
+            block = np.stack(rows[idx]).reshape(len(idx), *shape)
+            for i, row in zip(idx, block):
+                data[i] = row
+
+        return data
+
     def get_molecules(self, indexes: List[Union[ObjectId, int]], keep_serialized: bool = False) -> pd.Series:
         with self._read_file() as f:
-            mol_schema = f["molecule/schema"]
-            if not keep_serialized:
-                mols = [
-                    Molecule(
-                        **self._deserialize_data(mol_schema[int(i) if isinstance(i, ObjectId) else i]), validate=False
-                    )
-                    for i in indexes
-                ]
-            else:
-                mols = [mol_schema[int(i) if isinstance(i, ObjectId) else i].tobytes() for i in indexes]
+            rows = self._read_rows(f["molecule/schema"], [int(i) for i in indexes])
+
+        if not keep_serialized:
+            mols = [Molecule(**self._deserialize_data(row), validate=False) for row in rows]
+        else:
+            mols = [row.tobytes() for row in rows]
         return pd.Series(mols, index=indexes)
 
+    def get_molecule_arrays(self, indexes: List[Union[ObjectId, int]]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        Reads the geometries and symbols of molecules without building Molecule models.
+
+        Parameters
+        ----------
+        indexes: List[Union[ObjectId, int]]
+            Indexes of the molecules in the view
+
+        Returns
+        -------
+        Tuple[List[np.ndarray], List[np.ndarray]]
+            The (n_atoms, 3) geometries (in bohr) and the (n_atoms,) symbols of the molecules
+        """
+        with self._read_file() as f:
+            return self._read_molecule_arrays(f, [int(i) for i in indexes])
+
+    def _read_molecule_arrays(self, f: "h5py.File", indexes: List[int]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Reads the geometries and symbols of molecules from a columnar or a per molecule molecule section"""
+
+        molecule_group = f["molecule"]
+        if "layout" in molecule_group.attrs:
+            indexes = np.asarray(indexes, dtype=np.int64)
+            offsets = molecule_group["atom_offsets"]
+            starts = self._read_rows(offsets, indexes)
+            stops = self._read_rows(offsets, indexes + 1)
+
+            symbol_table = np.array(self._decode_strings(molecule_group["symbol_table"][()]), dtype=str)
+            geometries = self._read_ragged_rows(molecule_group["geometry"], starts, stops)
+            symbols = [
+                symbol_table[row] for row in self._read_ragged_rows(molecule_group["symbol_index"], starts, stops)
+            ]
+        else:
+            # Views written by older versions store a variable length row per molecule
+            geometries = [row.reshape(-1, 3) for row in self._read_rows(molecule_group["geometry"], indexes)]
+            symbols = [
+                np.array(self._decode_strings(row), dtype=str)
+                for row in self._read_rows(molecule_group["symbols"], indexes)
+            ]
+
+        return geometries, symbols
+
     def get_index(self, subset: Optional[List[str]] = None) -> pd.DataFrame:
         if self._index is None:
             with self._read_file() as f:
@@ -241,13 +482,27 @@ class HDF5View(DatasetView):
         else:
             return self._entries.loc[subset].reset_index()
 
-    def write(self, ds: Dataset):
+    def write(self, ds: Dataset, incremental: bool = False, max_workers: int = 4) -> None:
+        """
+        Writes a view of a dataset, replacing the view at this path.
+
+        Parameters
+        ----------
+        ds: Dataset
+            The dataset to write
+        incremental: bool, optional
+            Reuse the molecules and native values of the existing view of this dataset, only the molecules, entries
+            and values missing from it are fetched. Writes the whole view if there is no view of this dataset.
+        max_workers: int, optional
+            The number of value columns fetched concurrently
+        """
         import h5py
 
         # For data checksums
         dataset_kwargs = {"chunks": True, "fletcher32": True}
-        ds.get_entries(force=True)
-        n_records = len(ds.data.records)
+        entries = ds.get_entries(force=True)
+        index = list(entries["name"].unique())
+        n_records = len(index)
         default_shape = (n_records,)
 
         if h5py.__version__ >= distutils.version.StrictVersion("2.10.0"):
@@ -261,28 +516,83 @@ class HDF5View(DatasetView):
             bytes_t = h5py.special_dtype(vlen=np.dtype("uint8"))
             vlen_utf8_t = h5py.special_dtype(vlen=utf8_t)
 
+        # Gradients and hessians are written by _write_array_column
         driver_dataspec = {
             "energy": {"dtype": np.dtype("float64"), "shape": default_shape},
-            "gradient": {"dtype": vlen_double_t, "shape": default_shape},
-            "hessian": {"dtype": vlen_double_t, "shape": default_shape},
             "dipole": {"dtype": np.dtype("float64"), "shape": (n_records, 3)},
         }
 
-        def _write_dataset(dataset, column, entry_dset):
-            assert column.shape[1] == 1
-            for i, name in enumerate(entry_dset):
-                element = column.loc[name][0]
-                if not h5py.check_dtype(vlen=dataset.dtype):
-                    dataset[i] = element
-                # Variable length datatypes require flattening of the array and special handling of missing values
+        def _write_dataset(group, name, dataspec, elements):
+            """Writes a column in one assignment, missing values are NaN (fixed width) or empty (variable length)"""
+            if not h5py.check_dtype(vlen=dataspec["dtype"]):
+                data = np.full(dataspec["shape"], np.nan, dtype=dataspec["dtype"])
+                for i, element in enumerate(elements):
+                    if not self._is_missing(element):
+                        data[i] = element
+            else:
+                data = self._object_array(
+                    np.empty(0) if self._is_missing(element) else element.ravel() for element in elements
+                )
+
+            dataset = group.create_dataset(name, **dataspec, **dataset_kwargs)
+            dataset[...] = data
+            return dataset
+
+        # What can be reused from the existing view
+        previous = self._previous_view(ds) if incremental else None
+        old_index, old_mol_ids, old_columns = {}, [], {}
+        if previous is not None:
+            with previous._read_file() as old:
+                old_index = {name: i for i, name in enumerate(self._decode_strings(old["entry/entry"][()]))}
+                if "id" in old["molecule"]:
+                    old_mol_ids = self._decode_strings(old["molecule/id"][()])
                 else:
-                    try:
-                        dataset[i] = element.ravel()
-                    except AttributeError:
-                        if np.isnan(element):
-                            pass
-                        else:
-                            raise
+                    # Views written by older versions only have the full molecules
+                    old_mol_ids = [self._deserialize_data(row)["id"] for row in old["molecule/schema"][()]]
+                for name, dataset in old["value"].items():
+                    if self._deserialize_field(dataset.attrs["units"]) == ds.units:
+                        old_columns[name] = self._deserialize_field(dataset.attrs["driver"])
+
+        if isinstance(ds.data.records[0], MoleculeEntry):
+            entry_mol_ids = entries["molecule_id"]
+        elif isinstance(ds.data.records[0], ReactionEntry):
+            entry_mol_ids = entries["molecule"]
+        else:
+            raise ValueError(f"Unknown entry class ({type(ds.data.records[0])}) while writing HDF5 entries.")
+
+        # Only molecules which are not in the existing view are fetched
+        referenced = set(entry_mol_ids)
+        kept_mols = [i for i, mol_id in enumerate(old_mol_ids) if mol_id in referenced]
+        missing_mols = ~entry_mol_ids.isin(set(old_mol_ids))
+        new_molecules = {}
+        if missing_mols.any():
+            mol_kwargs = {}
+            if "stoichiometry" in ds.data.history_keys:
+                mol_kwargs["stoich"] = list(ds.valid_stoich(force=True))
+            subset = None if previous is None else list(entries["name"][missing_mols].unique())
+            for molecule in ds.get_molecules(subset=subset, force=True, **mol_kwargs)["molecule"]:
+                new_molecules.setdefault(molecule.id, molecule)
+        new_molecules = list(new_molecules.values())
+
+        # Plan the value columns, native values of existing entries are reused if they were complete
+        columns = []
+        history = ds.list_values(native=True, force=True).reset_index().to_dict("records")
+        for specification in history:
+            dataset_name = self._normalize_hdf5_name(specification["name"])
+            values = {}
+            if old_columns.get(dataset_name) == specification["driver"]:
+                reused = [name for name in index if name in old_index]
+                if reused:
+                    with previous._read_file() as old:
+                        data = self._read_column(
+                            old, "value/" + dataset_name, [old_index[name] for name in reused], specification["driver"]
+                        )
+                    values = {name: value for name, value in zip(reused, data) if not self._is_missing(value)}
+            fetch = [name for name in index if name not in values]
+            columns.append((True, specification["name"], specification, values, fetch))
+
+        for cv_name in ds.list_values(force=True, native=False)["name"]:
+            columns.append((False, cv_name, None, {}, index))
 
         with self._write_file() as f:
             # Collection attributes
@@ -302,51 +612,79 @@ class HDF5View(DatasetView):
                 f.attrs["server_information"] = self._serialize_field(ds.client.server_information())
                 f.attrs["server_address"] = self._serialize_field(ds.client.address)
 
-            # Export molecules
+            # Export molecules as columns, geometries are concatenated with per molecule atom offsets and symbols
+            # are interned. Full molecules are kept serialized for get_molecules. Kept molecules are copied from
+            # the existing view.
+            kept_geometries, kept_symbols, kept_columns = [], [], {}
+            if kept_mols:
+                with previous._read_file() as old:
+                    kept_geometries, kept_symbols = previous._read_molecule_arrays(old, kept_mols)
+                    for field in ["schema", "charge", "multiplicity"]:
+                        kept_columns[field] = list(self._read_rows(old["molecule/" + field], kept_mols))
+
+            geometries = kept_geometries + [m.geometry for m in new_molecules]
+            symbols = kept_symbols + [np.asarray(m.symbols, dtype=str) for m in new_molecules]
+            n_atoms = np.array([len(row) for row in symbols], dtype=np.int64)
+            symbol_table, symbol_index = np.unique(
+                np.concatenate(symbols) if symbols else np.empty(0, dtype=str), return_inverse=True
+            )
+
             molecule_group = f.create_group("molecule")
+            molecule_group.attrs["layout"] = self._serialize_field("columnar")
+            molecule_group.create_dataset(
+                "geometry",
+                data=np.concatenate(geometries).reshape(-1, 3) if geometries else np.empty((0, 3)),
+                **dataset_kwargs,
+            )
+            molecule_group.create_dataset(
+                "atom_offsets",
+                data=np.concatenate([[0], np.cumsum(n_atoms)]),
+                dtype=np.dtype("int64"),
+                **dataset_kwargs,
+            )
+            molecule_group.create_dataset("symbol_table", data=symbol_table.astype(object), dtype=utf8_t)
+            molecule_group.create_dataset(
+                "symbol_index", data=symbol_index.ravel(), dtype=np.dtype("uint16"), **dataset_kwargs
+            )
 
-            if "stoichiometry" in ds.data.history_keys:
-                molecules = ds.get_molecules(stoich=list(ds.valid_stoich(force=True)), force=True)
-            else:
-                molecules = ds.get_molecules(force=True)
-            mol_shape = (len(molecules),)
-            mol_geometry = molecule_group.create_dataset(
-                "geometry", shape=mol_shape, dtype=vlen_double_t, **dataset_kwargs
+            mol_schema = molecule_group.create_dataset("schema", shape=(len(symbols),), dtype=bytes_t, **dataset_kwargs)
+            mol_schema[...] = self._object_array(
+                kept_columns.get("schema", []) + [self._serialize_data(m) for m in new_molecules]
             )
-            mol_symbols = molecule_group.create_dataset("symbols", shape=mol_shape, dtype=vlen_utf8_t, **dataset_kwargs)
-            mol_schema = molecule_group.create_dataset("schema", shape=mol_shape, dtype=bytes_t, **dataset_kwargs)
-            mol_charge = molecule_group.create_dataset(
-                "charge", shape=mol_shape, dtype=np.dtype("float64"), **dataset_kwargs
+            molecule_group.create_dataset(
+                "charge",
+                data=kept_columns.get("charge", []) + [m.molecular_charge for m in new_molecules],
+                dtype=np.dtype("float64"),
+                **dataset_kwargs,
             )
-            mol_spin = molecule_group.create_dataset(
-                "multiplicity", shape=mol_shape, dtype=np.dtype("int32"), **dataset_kwargs
+            molecule_group.create_dataset(
+                "multiplicity",
+                data=kept_columns.get("multiplicity", []) + [m.molecular_multiplicity for m in new_molecules],
+                dtype=np.dtype("int32"),
+                **dataset_kwargs,
             )
-            mol_id_server_view = {}
-            for i, mol_row in enumerate(molecules.to_dict("records")):
-                molecule = mol_row["molecule"]
-                mol_geometry[i] = molecule.geometry.ravel()
-                mol_schema[i] = self._serialize_data(molecule)
-                mol_symbols[i] = molecule.symbols
-                mol_charge[i] = molecule.molecular_charge
-                mol_spin[i] = molecule.molecular_multiplicity
-                mol_id_server_view[molecule.id] = i
+
+            mol_ids = [old_mol_ids[i] for i in kept_mols] + [m.id for m in new_molecules]
+            mol_id_server_view = {mol_id: i for i, mol_id in enumerate(mol_ids)}
+
+            # Server ids of the molecules, so that incremental writes do not need to decode the full molecules
+            mol_id_dset = molecule_group.create_dataset("id", shape=(len(mol_ids),), dtype=utf8_t, **dataset_kwargs)
+            mol_id_dset[...] = self._object_array(str(mol_id) for mol_id in mol_ids)
 
             # Export entries
             entry_group = f.create_group("entry")
             entry_dset = entry_group.create_dataset("entry", shape=default_shape, dtype=utf8_t, **dataset_kwargs)
-            entry_dset[:] = ds.get_index(force=True)
+            entry_dset[:] = index
 
-            entries = ds.get_entries(force=True)
+            entries["hdf5_molecule_id"] = entry_mol_ids.map(mol_id_server_view)
             if isinstance(ds.data.records[0], MoleculeEntry):
                 entry_group.attrs["model"] = "MoleculeEntry"
-                entries["hdf5_molecule_id"] = entries["molecule_id"].map(mol_id_server_view)
                 entry_group.create_dataset("name", data=entries["name"], dtype=utf8_t, **dataset_kwargs)
                 entry_group.create_dataset(
                     "molecule_id", data=entries["hdf5_molecule_id"], dtype=np.dtype("int64"), **dataset_kwargs
                 )
-            elif isinstance(ds.data.records[0], ReactionEntry):
+            else:
                 entry_group.attrs["model"] = "ReactionEntry"
-                entries["hdf5_molecule_id"] = entries["molecule"].map(mol_id_server_view)
                 entry_group.create_dataset("name", data=entries["name"], dtype=utf8_t, **dataset_kwargs)
                 entry_group.create_dataset(
                     "stoichiometry", data=entries["stoichiometry"], dtype=utf8_t, **dataset_kwargs
@@ -357,56 +695,50 @@ class HDF5View(DatasetView):
                 entry_group.create_dataset(
                     "coefficient", data=entries["coefficient"], dtype=np.dtype("float64"), **dataset_kwargs
                 )
-            else:
-                raise ValueError(f"Unknown entry class ({type(ds.data.records[0])}) while writing HDF5 entries.")
 
-            # Export native data columns
+            # Export data columns, columns are fetched concurrently and written as they arrive
             value_group = f.create_group("value")
-            history = ds.list_values(native=True, force=True).reset_index().to_dict("records")
-            for specification in history:
-                gv_spec = specification.copy()
-                name = gv_spec.pop("name")
-                if "stoichiometry" in gv_spec:
-                    gv_spec["stoich"] = gv_spec.pop("stoichiometry")
-                dataset_name = self._normalize_hdf5_name(name)
-                df = ds.get_values(name=name, force=True, native=True)
-                assert df.shape[1] == 1
-
-                driver = specification["driver"]
-                dataspec = driver_dataspec[driver]
-                dataset = value_group.create_dataset(dataset_name, **dataspec, **dataset_kwargs)
+            contributed_group = f.create_group("contributed_value")
 
-                for key in specification:
-                    dataset.attrs[key] = self._serialize_field(specification[key])
-                dataset.attrs["units"] = self._serialize_field(ds.units)
+            def _write_column(native, name, specification, values):
+                elements = [values.get(entry, np.nan) for entry in index]
+                dataset_name = self._normalize_hdf5_name(name)
 
-                _write_dataset(dataset, df, entry_dset)
+                if native:
+                    driver = specification["driver"]
+                    if driver in self._array_drivers:
+                        dataset = self._write_array_column(value_group, dataset_name, driver, elements)
+                    else:
+                        dataset = _write_dataset(value_group, dataset_name, driver_dataspec[driver], elements)
 
-            # Export contributed data columns
-            contributed_group = f.create_group("contributed_value")
-            for cv_name in ds.list_values(force=True, native=False)["name"]:
-                cv_df = ds.get_values(name=cv_name, force=True, native=False)
-                cv_model = ds.data.contributed_values[cv_name.lower()]
+                    for key in specification:
+                        dataset.attrs[key] = self._serialize_field(specification[key])
+                    dataset.attrs["units"] = self._serialize_field(ds.units)
+                    return
 
+                cv_model = ds.data.contributed_values[name.lower()]
                 try:
-                    dataspec = driver_dataspec[cv_model.theory_level_details["driver"]]
+                    driver = cv_model.theory_level_details["driver"]
+                    dataspec = None if driver in self._array_drivers else driver_dataspec[driver]
                 except (KeyError, TypeError):
-                    if isinstance(cv_df[cv_name][0], float):
+                    if isinstance(elements[0], float):
                         dataspec = {"dtype": np.dtype("float64"), "shape": default_shape}
-                    elif isinstance(cv_df[cv_name][0], np.ndarray):
+                    elif isinstance(elements[0], np.ndarray):
                         dataspec = {"dtype": vlen_double_t, "shape": default_shape}
                     else:
                         raise ValueError(
-                            f"Unable to guess data specification for contributed value column named {cv_name}."
+                            f"Unable to guess data specification for contributed value column named {name}."
                         )
                     warnings.warn(
-                        f"Contributed values column {cv_name} does not provide driver in theory_level_details. "
+                        f"Contributed values column {name} does not provide driver in theory_level_details. "
                         f"Inferred {dataspec}."
                     )
 
-                dataset = contributed_group.create_dataset(
-                    self._normalize_hdf5_name(cv_name), **dataspec, **dataset_kwargs
-                )
+                if dataspec is None:
+                    dataset = self._write_array_column(contributed_group, dataset_name, driver, elements)
+                else:
+                    dataset = _write_dataset(contributed_group, dataset_name, dataspec, elements)
+
                 for field in [
                     "name",
                     "values_structure",
@@ -421,11 +753,114 @@ class HDF5View(DatasetView):
                 ]:
                     dataset.attrs[field] = self._serialize_field(getattr(cv_model, field))
 
-                _write_dataset(dataset, cv_df, entry_dset)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                for native, name, specification, values, fetch in columns:
+                    if fetch:
+                        future = executor.submit(self._fetch_column, ds, name, native, fetch)
+                        futures[future] = (native, name, specification, values)
+                    else:
+                        _write_column(native, name, specification, values)
+
+                for future in concurrent.futures.as_completed(futures):
+                    native, name, specification, values = futures.pop(future)
+                    _write_column(native, name, specification, {**values, **future.result()})
 
         # Clean up any caches
         self._entries = None
 
+    def _write_array_column(
+        self, group: "h5py.Group", name: str, driver: str, elements: List[Any]
+    ) -> "h5py.Dataset":
+        """
+        Writes a gradient or hessian column as one dense (n_records, *row_shape) array if all rows have the
+        same shape, missing rows are NaN. Otherwise the rows are concatenated into a flat array and their
+        boundaries written to offsets/<group>/<name>, missing rows are empty.
+        """
+        present = [isinstance(element, np.ndarray) for element in elements]
+        sizes = np.array([element.size if p else 0 for element, p in zip(elements, present)], dtype=np.int64)
+
+        array_kwargs = {"compression": "gzip", "shuffle": True, "fletcher32": True}
+        row_sizes = set(sizes[present])
+        if len(row_sizes) == 1 and 0 not in row_sizes:
+            row_shape = self._array_row_shape(driver, row_sizes.pop())
+            data = np.full((len(elements),) + row_shape, np.nan)
+            for i, element in enumerate(elements):
+                if present[i]:
+                    data[i] = element.reshape(row_shape)
+
+            # Roughly 1 MB chunks of whole rows
+            chunk_rows = max(1, min(len(elements), (1 << 20) // (8 * data[0].size)))
+            dataset = group.create_dataset(name, data=data, chunks=(chunk_rows,) + row_shape, **array_kwargs)
+            dataset.attrs["layout"] = self._serialize_field("dense")
+        else:
+            flat = [element.ravel() for element, p in zip(elements, present) if p]
+            flat = np.concatenate(flat) if flat else np.empty(0)
+            offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+            dataset = group.create_dataset(name, data=flat, **(array_kwargs if flat.size else {}))
+            dataset.attrs["layout"] = self._serialize_field("ragged")
+            group.file.create_dataset(f"offsets{group.name}/{name}", data=offsets, **array_kwargs)
+
+        return dataset
+
+    def _previous_view(self, ds: Dataset) -> Optional["HDF5View"]:
+        """The existing view at this path if it is a view of the same dataset, otherwise None"""
+
+        if not self._path.is_file():
+            return None
+
+        previous = HDF5View(self._path)
+        try:
+            with previous._read_file() as f:
+                for field in ["id", "collection", "history_keys"]:
+                    value = self._deserialize_field(self._serialize_field(getattr(ds.data, field)))
+                    if self._deserialize_field(f.attrs[field]) != value:
+                        return None
+                model = f["entry"].attrs["model"]
+        except (OSError, KeyError):
+            return None
+
+        if model != type(ds.data.records[0]).__name__:
+            return None
+        return previous
+
+    @staticmethod
+    def _fetch_column(ds: Dataset, name: str, native: bool, subset: List[str]) -> Dict[str, Any]:
+        """
+        Fetches the values of a column for a subset of entries. A shallow copy of the dataset is used, as
+        get_values replaces the dataset cache and columns are fetched concurrently.
+        """
+
+        df = copy.copy(ds).get_values(name=name, force=True, native=native, subset=subset)
+        assert df.shape[1] == 1
+        return dict(zip(df.index, df.iloc[:, 0]))
+
+    @staticmethod
+    def _is_missing(value: Any) -> bool:
+        """Whether a value read from a view or a dataset is missing (NaN, None or an empty array)"""
+
+        try:
+            if isinstance(value, np.ndarray):
+                return (value.size == 0) or bool(np.isnan(value).all())
+            return bool(np.isnan(value))
+        except TypeError:
+            return value is None
+
+    @staticmethod
+    def _object_array(items: Iterator[Any]) -> np.ndarray:
+        """Builds a 1D object array, for assigning whole variable length columns"""
+
+        items = list(items)
+        ret = np.empty(len(items), dtype=object)
+        for i, item in enumerate(items):
+            ret[i] = item
+        return ret
+
+    @staticmethod
+    def _decode_strings(values: np.ndarray) -> List[str]:
+        return [value.decode() if isinstance(value, bytes) else value for value in values]
+
     def hash(self) -> str:
         """ Returns the Blake2b hash of the view """
         b2b = hashlib.blake2b()
@@ -445,13 +880,51 @@ class HDF5View(DatasetView):
     def _read_file(self) -> Iterator["h5py.File"]:
         import h5py
 
-        yield h5py.File(self._path, "r")
+        if self._file_pool is not None:
+            with self._file_pool.open(self._path) as f:
+                yield f
+        else:
+            with h5py.File(self._path, "r") as f:
+                yield f
 
     @contextmanager
     def _write_file(self) -> Iterator["h5py.File"]:
         import h5py
 
-        yield h5py.File(self._path, "w")
+        # Written next to the view and moved into place once complete, so that readers holding the
+        # old file open are not disturbed and never see a partial view
+        tmp_path = self._create_temp_file()
+        try:
+            with h5py.File(tmp_path, "w") as f:
+                yield f
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        self._index = None
+        if self._file_pool is not None:
+            self._file_pool.invalidate(self._path)
+
+    def _create_temp_file(self) -> str:
+        """Creates an empty file next to the view, with the permissions of the view it replaces if there is one,
+        otherwise those of any new file (0666 less the umask). mkstemp would make it readable by the owner only."""
+
+        while True:
+            tmp_path = str(self._path.parent / f".{self._path.name}.{uuid.uuid4().hex}.tmp")
+            try:
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            break
+
+        try:
+            os.chmod(tmp_path, self._path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+
+        return tmp_path
 
     # Methods for serializing to strings for storage in HDF5 metadata fields ("attrs")
     @staticmethod
@@ -2,8 +2,21 @@
 Helpers to hash complex objects
 """
 
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
+
 import numpy as np
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import Molecule
+
+# Rounding of the hashed Molecule fields, these must match Molecule.get_hash
+GEOMETRY_NOISE = 8
+MASS_NOISE = 6
+CHARGE_NOISE = 4
+
 
 def float_prep(array, around):
     """
@@ -24,3 +37,90 @@ def float_prep(array, around):
         raise TypeError("Type '{}' not recognized".format(type(array).__name__))
 
     return array
+
+
+def _stacked_float_prep(arrays: List[np.ndarray], around: int) -> List[np.ndarray]:
+    """
+    Applies float_prep to a list of arrays as one stacked array, returns the flattened rounded arrays.
+    """
+
+    sizes = np.cumsum([arr.size for arr in arrays])[:-1]
+    stacked = float_prep(np.concatenate([np.asarray(arr, dtype=float).ravel() for arr in arrays]), around)
+
+    return np.split(stacked, sizes)
+
+
+def _json_array(arr):
+    return arr.ravel().tolist()
+
+
+def _molecule_hashes(molecules: List["Molecule"]) -> List[str]:
+
+    if len(molecules) == 0:
+        return []
+
+    geometries = _stacked_float_prep([mol.geometry for mol in molecules], GEOMETRY_NOISE)
+    masses = _stacked_float_prep([mol.masses for mol in molecules], MASS_NOISE)
+
+    ret = []
+    for mol, geometry, mass in zip(molecules, geometries, masses):
+        concat = ""
+        for field in mol.hash_fields:
+            if field == "geometry":
+                data = geometry
+            elif field == "masses":
+                data = mass
+            elif field in ("fragment_charges", "molecular_charge"):
+                data = float_prep(getattr(mol, field), CHARGE_NOISE)
+            else:
+                data = getattr(mol, field)
+
+            concat += json.dumps(data, default=_json_array)
+
+        ret.append(hashlib.sha1(concat.encode("utf-8")).hexdigest())
+
+    return ret
+
+
+def molecule_hashes(molecules: List["Molecule"], processes: Optional[int] = None) -> List[str]:
+    """
+    Computes the hashes of many molecules at once, identical to calling Molecule.get_hash on each.
+
+    The geometries and masses of all molecules are rounded as single stacked arrays.
+
+    Parameters
+    ----------
+    molecules : List[Molecule]
+        The molecules to hash.
+    processes : Optional[int], optional
+        If given, the molecules are split across this many worker processes.
+
+    Returns
+    -------
+    List[str]
+        The hash of each molecule, in input order.
+    """
+
+    if not processes or processes < 2 or len(molecules) < 2:
+        return _molecule_hashes(molecules)
+
+    chunk_size = -(-len(molecules) // processes)
+    chunks = [molecules[i : i + chunk_size] for i in range(0, len(molecules), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return [h for chunk in pool.map(_molecule_hashes, chunks) for h in chunk]
+
+
+def molecular_formulas(molecules: List["Molecule"]) -> List[str]:
+    """
+    Computes the molecular formulas of many molecules, each distinct list of symbols is only counted once.
+    """
+
+    formulas = {}
+    ret = []
+    for mol in molecules:
+        key = tuple(mol.symbols)
+        if key not in formulas:
+            formulas[key] = mol.get_molecular_formula()
+        ret.append(formulas[key])
+
+    return ret
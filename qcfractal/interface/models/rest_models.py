@@ -140,9 +140,10 @@ class ResponseGETMeta(ResponseMeta):
     """
 
     missing: List[str] = Field(..., description="The Id's of the objects which were not found in the database.")
-    n_found: int = Field(
+    n_found: Optional[int] = Field(
         ...,
-        description="The number of entries which were already found in the database from the set which was provided.",
+        description="The number of entries which were already found in the database from the set which was provided. "
+        "None if the query was asked not to count the entries.",
     )
 
 
@@ -199,12 +200,58 @@ class QueryFilter(ProtoModel):
         return values
 
 
+class QueryStream(ProtoModel):
+    """
+    Standard Fractal Server metadata for streamed responses
+    """
+
+    stream: bool = Field(
+        False,
+        description="Stream the response as a metadata frame followed by one frame per record rather than as a "
+        "single object. Frames are concatenated msgpack objects or newline delimited JSON depending on the encoding.",
+    )
+
+
+class QueryCursor(ProtoModel):
+    """
+    Standard Fractal Server metadata for keyset (cursor) pagination
+    """
+
+    after_id: Optional[ObjectId] = Field(
+        None,
+        description="Only return records with an Id greater than this one, ordered by Id. Pass the last Id of the "
+        "previous page (or 0 for the first page) to paginate in constant time per page, unlike ``skip``.",
+    )
+    count: bool = Field(
+        True, description="Count the total number of matching records. Skipping the count speeds up pagination."
+    )
+
+
 class QueryMetaFilter(QueryMeta, QueryFilter):
     """
     Fractal Server metadata for Database queries allowing for filtering and pagination
     """
 
 
+class QueryMetaStream(QueryMeta, QueryStream):
+    """
+    Fractal Server metadata for Database queries allowing for pagination and streamed responses
+    """
+
+
+class QueryMetaFilterStream(QueryMetaFilter, QueryStream):
+    """
+    Fractal Server metadata for Database queries allowing for filtering, pagination and streamed responses
+    """
+
+
+class QueryMetaRecords(QueryMetaFilterStream, QueryCursor):
+    """
+    Fractal Server metadata for record queries allowing for filtering, offset or cursor pagination and streamed
+    responses
+    """
+
+
 class ComputeResponse(ProtoModel):
     """
     The response model from the Fractal Server when new Compute or Services are added.
@@ -249,6 +296,9 @@ common_docs = {
     ResponsePOSTMeta: str(get_base_docs(ResponsePOSTMeta)),
     QueryMeta: str(get_base_docs(QueryMeta)),
     QueryMetaFilter: str(get_base_docs(QueryMetaFilter)),
+    QueryMetaStream: str(get_base_docs(QueryMetaStream)),
+    QueryMetaFilterStream: str(get_base_docs(QueryMetaFilterStream)),
+    QueryMetaRecords: str(get_base_docs(QueryMetaRecords)),
     ComputeResponse: str(get_base_docs(ComputeResponse)),
 }
 
@@ -303,7 +353,7 @@ class MoleculeGETBody(ProtoModel):
             "contains no connectivity information.",
         )
 
-    meta: QueryMeta = Field(QueryMeta(), description=common_docs[QueryMeta])
+    meta: QueryMetaStream = Field(QueryMetaStream(), description=common_docs[QueryMetaStream])
     data: Data = Field(
         ...,
         description="Data fields for a Molecule query.",  # Because Data is internal, this may not document sufficiently
@@ -640,7 +690,7 @@ class ResultGETBody(ProtoModel):
                 v = "null"
             return v
 
-    meta: QueryMetaFilter = Field(QueryMetaFilter(), description=common_docs[QueryMetaFilter])
+    meta: QueryMetaRecords = Field(QueryMetaRecords(), description=common_docs[QueryMetaRecords])
     data: Data = Field(
         ..., description="The keys with data to search the database on for individual quantum chemistry computations."
     )
@@ -721,7 +771,7 @@ class ProcedureGETBody(ProtoModel):
             ":class:`RecordStatusEnum` for valid statuses.",
         )
 
-    meta: QueryMetaFilter = Field(QueryMetaFilter(), description=common_docs[QueryMetaFilter])
+    meta: QueryMetaRecords = Field(QueryMetaRecords(), description=common_docs[QueryMetaRecords])
     data: Data = Field(..., description="The keys with data to search the database on for Procedures.")
 
 
@@ -9,6 +9,7 @@ import pytest
 import qcelemental as qcel
 
 from . import portal as ptl
+from ..hash_helpers import molecular_formulas, molecule_hashes
 
 
 def test_molecule_constructors():
@@ -173,3 +174,25 @@ def test_molecule_repeated_hashing():
 
     mol3 = ptl.Molecule(**json.loads(mol2.json()), orient=False)
     assert h1 == mol3.get_hash()
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_molecule_bulk_hashing(processes):
+
+    water = ptl.data.get_molecule("water_dimer_minima.psimol")
+    mols = [
+        water,
+        water.get_fragment(0, orient=True),
+        water.get_fragment(1, 0),
+        ptl.data.get_molecule("neon_tetramer.psimol"),
+        ptl.Molecule(symbols=["He", "He"], geometry=[0, 0, -1.0e-12, 0, 0, 2], molecular_charge=-0.0),
+    ]
+
+    hashes = molecule_hashes(mols, processes=processes)
+    assert hashes == [mol.get_hash() for mol in mols]
+    assert hashes[0] == "3c4b98f515d64d1adc1648fe1fe1d6789e978d34"
+
+    formulas = molecular_formulas(mols)
+    assert formulas == [mol.get_molecular_formula() for mol in mols]
+
+    assert molecule_hashes([]) == []
@@ -2,7 +2,8 @@
 All procedures tasks involved in on-node computation.
 """
 
-from typing import List, Union
+from collections import Counter
+from typing import Any, Dict, List, Set, Union
 
 import qcelemental as qcel
 
@@ -15,6 +16,17 @@ _wfn_return_names = set(qcel.models.results.WavefunctionProperties._return_resul
 _wfn_all_fields = set(qcel.models.results.WavefunctionProperties.__fields__.keys())
 
 
+def _inserted_ids(add_ret: Dict[str, Any]) -> Set[str]:
+    """
+    Returns the ids that were newly inserted by an add_results/add_procedures call.
+
+    An id that appears in the returned data more often than it is reported as a
+    duplicate was inserted by this call, for its first occurrence only.
+    """
+    n_duplicates = Counter(add_ret["meta"]["duplicates"])
+    return {x for x, n in Counter(add_ret["data"]).items() if n > n_duplicates[x]}
+
+
 class BaseTasks:
     def __init__(self, storage, logger):
         self.storage = storage
@@ -111,28 +123,33 @@ class SingleResultTasks(BaseTasks):
         tag = meta.pop("tag", None)
         priority = meta.pop("priority", None)
 
+        # Add all records at once, molecules that could not be found are skipped
+        valid_molecules = [mol for mol in molecule_list if mol is not None]
+        records = [ResultRecord(**meta.copy(), molecule=mol.id) for mol in valid_molecules]
+        ret = self.storage.add_results(records)
+        inserted = _inserted_ids(ret)
+
         # Construct full tasks
         new_tasks = []
         results_ids = []
         existing_ids = []
+        added = zip(records, ret["data"])
         for mol in molecule_list:
             if mol is None:
                 results_ids.append(None)
                 continue
 
-            record = ResultRecord(**meta.copy(), molecule=mol.id)
-            inp = record.build_schema_input(mol, keywords)
-            inp.extras["_qcfractal_tags"] = {"program": record.program, "keywords": record.keywords}
-
-            ret = self.storage.add_results([record])
-
-            base_id = ret["data"][0]
+            record, base_id = next(added)
             results_ids.append(base_id)
 
             # Task is complete
-            if len(ret["meta"]["duplicates"]):
+            if base_id not in inserted:
                 existing_ids.append(base_id)
                 continue
+            inserted.remove(base_id)
+
+            inp = record.build_schema_input(mol, keywords)
+            inp.extras["_qcfractal_tags"] = {"program": record.program, "keywords": record.keywords}
 
             # Build task object
             task = TaskRecord(
@@ -155,23 +172,37 @@ class SingleResultTasks(BaseTasks):
         return new_tasks, results_ids, existing_ids, []
 
     def parse_output(self, result_outputs):
+        """Save the results of completed single tasks.
 
-        # Add new runs to database
-        completed_tasks = []
-        updates = []
+        All base results are loaded in query-limit sized chunks, every stdout/stderr/error blob and
+        every wavefunction is inserted with one multi-row insert each, and the results are
+        written back in a single bulk update.
+        """
+
+        # Load all base results, in as few queries as the query limit allows
+        base_ids = [str(data["base_result"]) for data in result_outputs]
+        limit = self.storage.get_limit(None)
+        found = {}
+        for start in range(0, len(base_ids), limit):
+            for r in self.storage.get_results(id=base_ids[start : start + limit])["data"]:
+                found[r["id"]] = r
+
+        # Add all stdout/stderr/error blobs at once
+        blobs = []
         for data in result_outputs:
-            result = self.storage.get_results(id=data["base_result"])["data"][0]
-            result = ResultRecord(**result)
+            rdata = data["result"]
+            blobs.extend([rdata["stdout"], rdata["stderr"], rdata["error"]])
+        blob_ids = self.storage.add_kvstore(blobs)["data"]
 
+        wavefunctions = []
+        wavefunction_rdata = []
+        for num, data in enumerate(result_outputs):
             rdata = data["result"]
-            stdout, stderr, error = self.storage.add_kvstore([rdata["stdout"], rdata["stderr"], rdata["error"]])["data"]
-            rdata["stdout"] = stdout
-            rdata["stderr"] = stderr
-            rdata["error"] = error
-
-            # Store Wavefunction data
-            if data["result"].get("wavefunction", False):
-                wfn = data["result"].get("wavefunction", False)
+            rdata["stdout"], rdata["stderr"], rdata["error"] = blob_ids[3 * num : 3 * num + 3]
+
+            # Pull out Wavefunction data
+            if rdata.get("wavefunction", False):
+                wfn = rdata.get("wavefunction", False)
                 available = set(wfn.keys()) - {"restricted", "basis"}
                 return_map = {k: wfn[k] for k in wfn.keys() & _wfn_return_names}
 
@@ -189,11 +220,19 @@ class SingleResultTasks(BaseTasks):
                     )
                     available_keys &= _wfn_all_fields
 
-                wavefunction_save = {k: wfn[k] for k in available_keys}
-                wfn_data_id = self.storage.add_wavefunction_store([wavefunction_save])["data"][0]
-                rdata["wavefunction_data_id"] = wfn_data_id
+                wavefunctions.append({k: wfn[k] for k in available_keys})
+                wavefunction_rdata.append(rdata)
+
+        # Store all Wavefunction data at once
+        wfn_data_ids = self.storage.add_wavefunction_store(wavefunctions)["data"]
+        for rdata, wfn_data_id in zip(wavefunction_rdata, wfn_data_ids):
+            rdata["wavefunction_data_id"] = wfn_data_id
 
-            result._consume_output(rdata)
+        completed_tasks = []
+        updates = []
+        for base_id, data in zip(base_ids, result_outputs):
+            result = ResultRecord(**found[base_id])
+            result._consume_output(data["result"])
             updates.append(result)
             completed_tasks.append(data["task_id"])
 
@@ -288,14 +327,10 @@ class OptimizationTasks(BaseTasks):
         tag = data.meta.tag
         priority = data.meta.priority
 
-        new_tasks = []
-        results_ids = []
-        existing_ids = []
-        for initial_molecule in intitial_molecule_list:
-            if initial_molecule is None:
-                results_ids.append(None)
-                continue
-
+        # Add all procedures at once, molecules that could not be found are skipped
+        valid_molecules = [mol for mol in intitial_molecule_list if mol is not None]
+        docs = []
+        for initial_molecule in valid_molecules:
             doc_data = {
                 "initial_molecule": initial_molecule.id,
                 "qc_spec": qc_spec,
@@ -304,22 +339,34 @@ class OptimizationTasks(BaseTasks):
             }
             if hasattr(data.meta, "protocols"):
                 doc_data["protocols"] = data.meta.protocols
-            doc = OptimizationRecord(**doc_data)
+            docs.append(OptimizationRecord(**doc_data))
 
-            inp = doc.build_schema_input(initial_molecule=initial_molecule, qc_keywords=qc_keywords)
-            inp.input_specification.extras["_qcfractal_tags"] = {
-                "program": qc_spec.program,
-                "keywords": qc_spec.keywords,
-            }
+        ret = self.storage.add_procedures(docs)
+        inserted = _inserted_ids(ret)
 
-            ret = self.storage.add_procedures([doc])
-            base_id = ret["data"][0]
+        new_tasks = []
+        results_ids = []
+        existing_ids = []
+        added = zip(docs, ret["data"])
+        for initial_molecule in intitial_molecule_list:
+            if initial_molecule is None:
+                results_ids.append(None)
+                continue
+
+            doc, base_id = next(added)
             results_ids.append(base_id)
 
             # Task is complete
-            if len(ret["meta"]["duplicates"]):
+            if base_id not in inserted:
                 existing_ids.append(base_id)
                 continue
+            inserted.remove(base_id)
+
+            inp = doc.build_schema_input(initial_molecule=initial_molecule, qc_keywords=qc_keywords)
+            inp.input_specification.extras["_qcfractal_tags"] = {
+                "program": qc_spec.program,
+                "keywords": qc_spec.keywords,
+            }
 
             # Build task object
             task = TaskRecord(
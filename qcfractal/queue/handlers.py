@@ -20,7 +20,7 @@ class TaskQueueHandler(APIHandler):
 
     _required_auth = "compute"
 
-    def post(self):
+    async def post(self):
         """Posts new tasks to the task queue.
         """
 
@@ -38,26 +38,26 @@ class TaskQueueHandler(APIHandler):
         if verify is not True:
             raise tornado.web.HTTPError(status_code=400, reason=verify)
 
-        payload = procedure_parser.submit_tasks(body)
+        payload = await self.run_in_storage_executor(procedure_parser.submit_tasks, body)
         response = response_model(**payload)
 
         self.logger.info("POST: TaskQueue -  Added {} tasks.".format(response.meta.n_inserted))
         self.write(response)
 
-    def get(self):
+    async def get(self):
         """Gets task information from the task queue
         """
 
         body_model, response_model = rest_model("task_queue", "get")
         body = self.parse_bodymodel(body_model)
 
-        tasks = self.storage.get_queue(**{**body.data.dict(), **body.meta.dict()})
+        tasks = await self.run_in_storage_executor(self.storage.get_queue, **{**body.data.dict(), **body.meta.dict()})
         response = response_model(**tasks)
 
         self.logger.info("GET: TaskQueue - {} pulls.".format(len(response.data)))
         self.write(response)
 
-    def put(self):
+    async def put(self):
         """Modifies tasks in the task queue
         """
 
@@ -68,7 +68,9 @@ class TaskQueueHandler(APIHandler):
             raise tornado.web.HTTPError(status_code=400, reason="Id or ResultId must be specified.")
 
         if body.meta.operation == "restart":
-            tasks_updated = self.storage.queue_reset_status(**body.data.dict(), reset_error=True)
+            tasks_updated = await self.run_in_storage_executor(
+                self.storage.queue_reset_status, **body.data.dict(), reset_error=True
+            )
             data = {"n_updated": tasks_updated}
         else:
             raise tornado.web.HTTPError(status_code=400, reason=f"Operation '{operation}' is not valid.")
@@ -86,12 +88,8 @@ class ServiceQueueHandler(APIHandler):
 
     _required_auth = "compute"
 
-    def post(self):
-        """Posts new services to the service queue.
-        """
-
-        body_model, response_model = rest_model("service_queue", "post")
-        body = self.parse_bodymodel(body_model)
+    def _add_services(self, body):
+        """Builds and adds the services of a POST body, blocking on the database."""
 
         new_services = []
         for service_input in body.data:
@@ -114,25 +112,35 @@ class ServiceQueueHandler(APIHandler):
         ret = self.storage.add_services(new_services)
         ret["data"] = {"ids": ret["data"], "existing": ret["meta"]["duplicates"]}
         ret["data"]["submitted"] = list(set(ret["data"]["ids"]) - set(ret["meta"]["duplicates"]))
+        return ret
+
+    async def post(self):
+        """Posts new services to the service queue.
+        """
+
+        body_model, response_model = rest_model("service_queue", "post")
+        body = self.parse_bodymodel(body_model)
+
+        ret = await self.run_in_storage_executor(self._add_services, body)
         response = response_model(**ret)
 
         self.logger.info("POST: ServiceQueue -  Added {} services.\n".format(response.meta.n_inserted))
         self.write(response)
 
-    def get(self):
+    async def get(self):
         """Gets information about services from the service queue.
         """
 
         body_model, response_model = rest_model("service_queue", "get")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.get_services(**{**body.data.dict(), **body.meta.dict()})
+        ret = await self.run_in_storage_executor(self.storage.get_services, **{**body.data.dict(), **body.meta.dict()})
         response = response_model(**ret)
 
         self.logger.info("GET: ServiceQueue - {} pulls.\n".format(len(response.data)))
         self.write(response)
 
-    def put(self):
+    async def put(self):
         """Modifies services in the service queue
         """
 
@@ -143,7 +151,9 @@ class ServiceQueueHandler(APIHandler):
             raise tornado.web.HTTPError(status_code=400, reason="Id or ProcedureId must be specified.")
 
         if body.meta.operation == "restart":
-            updates = self.storage.update_service_status("running", **body.data.dict())
+            updates = await self.run_in_storage_executor(
+                self.storage.update_service_status, "running", **body.data.dict()
+            )
             data = {"n_updated": updates}
         else:
             raise tornado.web.HTTPError(status_code=400, reason=f"Operation '{operation}' is not valid.")
@@ -240,7 +250,7 @@ class QueueManagerHandler(APIHandler):
         storage_socket.queue_mark_error(error_data)
         return len(completed), len(error_data)
 
-    def get(self):
+    async def get(self):
         """Pulls new tasks from the task queue
         """
 
@@ -251,8 +261,13 @@ class QueueManagerHandler(APIHandler):
         name = self._get_name_from_metadata(body.meta)
 
         # Grab new tasks and write out
-        new_tasks = self.storage.queue_get_next(
-            name, body.meta.programs, body.meta.procedures, limit=body.data.limit, tag=body.meta.tag
+        new_tasks = await self.run_in_storage_executor(
+            self.storage.queue_get_next,
+            name,
+            body.meta.programs,
+            body.meta.procedures,
+            limit=body.data.limit,
+            tag=body.meta.tag,
         )
         response = response_model(
             **{
@@ -271,9 +286,11 @@ class QueueManagerHandler(APIHandler):
         self.logger.info("QueueManager: Served {} tasks.".format(response.meta.n_found))
 
         # Update manager logs
-        self.storage.manager_update(name, submitted=len(new_tasks), **body.meta.dict())
+        await self.run_in_storage_executor(
+            self.storage.manager_update, name, submitted=len(new_tasks), **body.meta.dict()
+        )
 
-    def post(self):
+    async def post(self):
         """Posts complete tasks to the task queue
         """
 
@@ -282,10 +299,17 @@ class QueueManagerHandler(APIHandler):
 
         name = self._get_name_from_metadata(body.meta)
         self.logger.info("QueueManager: Received completed task packet from {}.".format(name))
-        success, error = self.insert_complete_tasks(self.storage, body.data, self.logger)
+        success, error = await self.run_in_storage_executor(
+            self.insert_complete_tasks, self.storage, body.data, self.logger
+        )
 
         completed = success + error
 
+        # Services waiting on these tasks can move on without waiting for the next periodic update
+        service_wakeup = self.objects.get("service_wakeup", None)
+        if completed and (service_wakeup is not None):
+            service_wakeup()
+
         response = response_model(
             **{
                 "meta": {
@@ -304,9 +328,9 @@ class QueueManagerHandler(APIHandler):
 
         # Update manager logs
         name = self._get_name_from_metadata(body.meta)
-        self.storage.manager_update(name, completed=completed, failures=error)
+        await self.run_in_storage_executor(self.storage.manager_update, name, completed=completed, failures=error)
 
-    def put(self):
+    async def put(self):
         """
         Various manager manipulation operations
         """
@@ -319,14 +343,23 @@ class QueueManagerHandler(APIHandler):
         name = self._get_name_from_metadata(body.meta)
         op = body.data.operation
         if op == "startup":
-            self.storage.manager_update(
-                name, status="ACTIVE", configuration=body.data.configuration, **body.meta.dict(), log=True
+            await self.run_in_storage_executor(
+                self.storage.manager_update,
+                name,
+                status="ACTIVE",
+                configuration=body.data.configuration,
+                **body.meta.dict(),
+                log=True,
             )
             self.logger.info("QueueManager: New active manager {} detected.".format(name))
 
         elif op == "shutdown":
-            nshutdown = self.storage.queue_reset_status(manager=name, reset_running=True)
-            self.storage.manager_update(name, returned=nshutdown, status="INACTIVE", **body.meta.dict(), log=True)
+            nshutdown = await self.run_in_storage_executor(
+                self.storage.queue_reset_status, manager=name, reset_running=True
+            )
+            await self.run_in_storage_executor(
+                self.storage.manager_update, name, returned=nshutdown, status="INACTIVE", **body.meta.dict(), log=True
+            )
 
             self.logger.info(
                 "QueueManager: Shutdown of manager {} detected, recycling {} incomplete tasks.".format(name, nshutdown)
@@ -335,7 +368,9 @@ class QueueManagerHandler(APIHandler):
             ret = {"nshutdown": nshutdown}
 
         elif op == "heartbeat":
-            self.storage.manager_update(name, status="ACTIVE", **body.meta.dict(), log=True)
+            await self.run_in_storage_executor(
+                self.storage.manager_update, name, status="ACTIVE", **body.meta.dict(), log=True
+            )
             self.logger.debug("QueueManager: Heartbeat of manager {} detected.".format(name))
 
         else:
@@ -356,7 +391,7 @@ class ComputeManagerHandler(APIHandler):
 
     _required_auth = "admin"
 
-    def get(self):
+    async def get(self):
         """Gets manager information from the task queue
         """
 
@@ -364,7 +399,9 @@ class ComputeManagerHandler(APIHandler):
         body = self.parse_bodymodel(body_model)
 
         self.logger.info("GET: ComputeManagerHandler")
-        managers = self.storage.get_managers(**{**body.data.dict(), **body.meta.dict()})
+        managers = await self.run_in_storage_executor(
+            self.storage.get_managers, **{**body.data.dict(), **body.meta.dict()}
+        )
 
         # remove passwords?
         # TODO: Are passwords stored anywhere else? Other kinds of passwords?
@@ -4,22 +4,34 @@ The FractalServer class
 
 import asyncio
 import datetime
+import functools
 import logging
+import multiprocessing
+import os
 import ssl
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import tornado.ioloop
 import tornado.log
+import tornado.netutil
 import tornado.options
+import tornado.process
 import tornado.web
 
 from .extras import get_information
 from .interface import FractalClient
 from .queue import QueueManager, QueueManagerHandler, ServiceQueueHandler, TaskQueueHandler, ComputeManagerHandler
-from .services import construct_service
+from .services import (
+    construct_service,
+    initialize_service_worker,
+    iterate_service,
+    iterate_service_in_worker,
+    prefetch_service_tasks,
+)
 from .storage_sockets import ViewHandler, storage_socket_factory
 from .storage_sockets.api_logger import API_AccessLogger
 from .web_handlers import (
@@ -88,6 +100,14 @@ def _build_ssl():
     return cert_pem, key_pem
 
 
+def _remove_file(filename):
+    # Forked workers share the autogenerated SSL files, the first one out removes them
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
 class FractalServer:
     def __init__(
         self,
@@ -96,6 +116,7 @@ class FractalServer:
         port: int = 7777,
         loop: "IOLoop" = None,
         compress_response: bool = True,
+        num_workers: int = 1,
         # Security
         security: Optional[str] = None,
         allow_read: bool = False,
@@ -104,6 +125,9 @@ class FractalServer:
         storage_uri: str = "postgresql://localhost:5432",
         storage_project_name: str = "qcfractal_default",
         query_limit: int = 1000,
+        storage_threads: int = 5,
+        auth_cache_ttl: float = 60,
+        record_cache_size: int = 64 * 1024 ** 2,
         # View options
         view_enabled: bool = False,
         view_path: Optional[str] = None,
@@ -113,10 +137,12 @@ class FractalServer:
         geo_file_path: str = None,
         # Queue options
         queue_socket: "BaseAdapter" = None,
+        queue_socket_factory: Callable[[], "BaseAdapter"] = None,
         heartbeat_frequency: float = 1800,
         # Service options
         max_active_services: int = 20,
         service_frequency: float = 60,
+        service_processes: int = 0,
         # Testing functions
         skip_storage_version_check=True,
     ):
@@ -133,6 +159,9 @@ class FractalServer:
         compress_response : bool, optional
             Automatic compression of responses, turn on unless behind a proxy that
             provides this capability.
+        num_workers : int, optional
+            The number of HTTP worker processes to fork, all listening on the same port. Periodic
+            updates run in the first worker only. Requires that no IOLoop has been created yet.
         security : Optional[str], optional
             The security options for the server {None, "local"}. The local security
             option uses the database to cache users.
@@ -146,17 +175,34 @@ class FractalServer:
             The project name to use on the database.
         query_limit : int, optional
             The maximum number of entries a query will return.
+        storage_threads : int, optional
+            The number of threads running blocking database calls for request handlers, this many
+            requests can access the database at the same time. If 0, handlers call the database
+            directly on the IOLoop.
+        auth_cache_ttl : float, optional
+            The time (in seconds) successful user verifications are cached. Changes to users are only
+            seen by the worker making them, other workers and the CLI take up to this long to be seen.
+            If 0, users are verified against the database on every request.
+        record_cache_size : int, optional
+            The size (in bytes) of the in-process cache of COMPLETE results and procedures served
+            to clients. If 0, records are always pulled from the database.
         logfile_prefix : str, optional
             The logfile to use for logging.
         queue_socket : BaseAdapter, optional
             An optional Adapter to provide for server to have limited local compute.
             Should only be used for testing and interactive sessions.
+        queue_socket_factory : Callable[[], BaseAdapter], optional
+            Builds the queue_socket instead, only in the worker hosting the QueueManager so that
+            the other workers do not build an adapter they never use.
         heartbeat_frequency : float, optional
             The time (in seconds) of the heartbeat manager frequency.
         max_active_services : int, optional
             The maximum number of active Services that can be running at any given time.
         service_frequency : float, optional
             The time (in seconds) before checking and updating services.
+        service_processes : int, optional
+            The number of worker processes iterating services concurrently, each with its own
+            database connection. If 0, services are iterated one after another in the server process.
         """
 
         # Save local options
@@ -178,12 +224,6 @@ class FractalServer:
         tornado.log.enable_pretty_logging()
         self.logger = logging.getLogger("tornado.application")
 
-        # Create API Access logger class if enables
-        if log_apis:
-            self.api_logger = API_AccessLogger(geo_file_path=geo_file_path)
-        else:
-            self.api_logger = None
-
         # Build security layers
         if security is None:
             storage_bypass_security = True
@@ -219,10 +259,9 @@ class FractalServer:
 
             # Destroy keyfiles upon close
             import atexit
-            import os
 
-            atexit.register(os.remove, cert_name)
-            atexit.register(os.remove, key_name)
+            atexit.register(_remove_file, cert_name)
+            atexit.register(_remove_file, key_name)
             self.client_verify = False
 
         elif ssl_options is False:
@@ -237,6 +276,18 @@ class FractalServer:
         else:
             raise KeyError("ssl_options not understood")
 
+        # Fork workers before any database connection or IOLoop exists, neither survive a fork
+        self.num_workers = num_workers
+        if num_workers > 1:
+            if loop is not None:
+                raise ValueError("Cannot provide an IOLoop when forking multiple workers.")
+
+            sockets = tornado.netutil.bind_sockets(self.port)
+            self.worker_id = tornado.process.fork_processes(num_workers)
+        else:
+            sockets = None
+            self.worker_id = 0
+
         # Setup the database connection
         self.storage_database = storage_project_name
         self.storage_uri = storage_uri
@@ -247,8 +298,46 @@ class FractalServer:
             allow_read=allow_read,
             max_limit=query_limit,
             skip_version_check=skip_storage_version_check,
+            pool_size=max(storage_threads, 5),
+            auth_cache_ttl=auth_cache_ttl,
+            record_cache_size=record_cache_size,
         )
 
+        # Create API Access logger class if enables, logs are saved in batches by its own writer thread
+        if log_apis:
+            self.api_logger = API_AccessLogger(geo_file_path=geo_file_path, storage=self.storage)
+        else:
+            self.api_logger = None
+
+        # Handlers run their blocking database calls here so the IOLoop can overlap requests
+        if storage_threads > 0:
+            self.storage_executor = ThreadPoolExecutor(max_workers=storage_threads, thread_name_prefix="storage")
+        else:
+            self.storage_executor = None
+
+        # Services are only iterated by the periodics worker
+        if (service_processes > 0) and (self.worker_id == 0):
+            storage_kwargs = {
+                "project_name": storage_project_name,
+                "bypass_security": storage_bypass_security,
+                "allow_read": allow_read,
+                "max_limit": query_limit,
+                "skip_version_check": True,
+                "pool_size": 1,
+            }
+            # Kept so that the pool can be rebuilt if a worker process dies
+            self._service_executor_factory = functools.partial(
+                ProcessPoolExecutor,
+                max_workers=service_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initialize_service_worker,
+                initargs=(storage_uri, storage_kwargs),
+            )
+            self.service_executor = self._service_executor_factory()
+        else:
+            self._service_executor_factory = None
+            self.service_executor = None
+
         if view_enabled:
             self.view_handler = ViewHandler(view_path)
         else:
@@ -263,6 +352,8 @@ class FractalServer:
             "logger": self.logger,
             "api_logger": self.api_logger,
             "view_handler": self.view_handler,
+            "storage_executor": self.storage_executor,
+            "service_wakeup": self.wake_services,
         }
 
         # Public information
@@ -301,10 +392,15 @@ class FractalServer:
 
         self.http_server = tornado.httpserver.HTTPServer(self.app, ssl_options=ssl_ctx)
 
-        self.http_server.listen(self.port)
+        if sockets is None:
+            self.http_server.listen(self.port)
+        else:
+            self.http_server.add_sockets(sockets)
 
         # Add periodic callback holders
         self.periodic = {}
+        self._services_wakeup_pending = False
+        self._services_running = False
 
         # Exit callbacks
         self.exit_callbacks = []
@@ -313,6 +409,7 @@ class FractalServer:
         self.logger.info("    Name:          {}".format(self.name))
         self.logger.info("    Version:       {}".format(get_information("version")))
         self.logger.info("    Address:       {}".format(self._address))
+        self.logger.info("    Worker:        {} of {}".format(self.worker_id + 1, self.num_workers))
         self.logger.info("    Database URI:  {}".format(storage_uri))
         self.logger.info("    Database Name: {}".format(storage_project_name))
         self.logger.info("    Query Limit:   {}\n".format(self.storage.get_limit(1.0e9)))
@@ -322,7 +419,13 @@ class FractalServer:
         self.executor = ThreadPoolExecutor(max_workers=2)
         self.futures = {}
 
-        # Queue manager if direct build
+        # Queue manager if direct build, only the periodics worker hosts it
+        if self.worker_id != 0:
+            queue_socket = None
+        elif queue_socket_factory is not None:
+            if queue_socket is not None:
+                raise ValueError("Only one of queue_socket and queue_socket_factory can be passed.")
+            queue_socket = queue_socket_factory()
         self.queue_socket = queue_socket
         if self.queue_socket is not None:
             if security == "local":
@@ -369,7 +472,8 @@ class FractalServer:
             If False, does not start the IOLoop
         start_periodics : bool, optional
             If False, does not start the server periodic updates such as
-            Service iterations and Manager heartbeat checking.
+            Service iterations and Manager heartbeat checking. When running
+            multiple workers these are only started in the first worker.
         """
         if "queue_manager_future" in self.futures:
 
@@ -381,8 +485,10 @@ class FractalServer:
             self._run_in_thread(start_manager)
 
         # Add services callback
-        if start_periodics:
-            nanny_services = tornado.ioloop.PeriodicCallback(self.update_services, self.service_frequency * 1000)
+        if start_periodics and (self.worker_id == 0):
+            nanny_services = tornado.ioloop.PeriodicCallback(
+                self._update_services_in_thread, self.service_frequency * 1000
+            )
             nanny_services.start()
             self.periodic["update_services"] = nanny_services
 
@@ -431,6 +537,13 @@ class FractalServer:
         for cb in self.periodic.values():
             cb.stop()
 
+        # Save the buffered API access logs
+        if self.api_logger is not None:
+            self.api_logger.stop()
+
+        if self.view_handler is not None:
+            self.view_handler.close()
+
         # Call exit callbacks
         for func, args, kwargs in self.exit_callbacks:
             func(*args, **kwargs)
@@ -442,6 +555,12 @@ class FractalServer:
         if self.executor is not None:
             self.executor.shutdown()
 
+        if self.storage_executor is not None:
+            self.storage_executor.shutdown()
+
+        if self.service_executor is not None:
+            self.service_executor.shutdown()
+
         # Shutdown IOLoop if needed
         if (asyncio.get_event_loop().is_running()) and stop_loop:
             self.loop.stop()
@@ -498,11 +617,12 @@ class FractalServer:
         """Runs through all active services and examines their current status.
         """
 
-        # Grab current services
-        current_services = self.storage.get_services(status="RUNNING")["data"]
+        # Grab current services whose tasks have all finished, the rest have nothing to do
+        current_services = self.storage.get_services(status="RUNNING", ready=True)["data"]
 
         # Grab new services if we have open slots
-        open_slots = max(0, self.max_active_services - len(current_services))
+        n_running = self.storage.get_services(status="RUNNING", limit=0)["meta"]["n_found"]
+        open_slots = max(0, self.max_active_services - n_running)
         if open_slots > 0:
             new_services = self.storage.get_services(status="WAITING", limit=open_slots)["data"]
             current_services.extend(new_services)
@@ -511,34 +631,76 @@ class FractalServer:
 
         self.logger.debug(f"Updating {len(current_services)} services.")
 
-        # Loop over the services and iterate
-        running_services = 0
-        completed_services = []
+        # Build the services and pull the state of all their tasks in bulk
+        services = []
+        error_ids = []
         for data in current_services:
-
-            # Attempt to iteration and get message
             try:
-                service = construct_service(self.storage, self.logger, data)
-                finished = service.iterate()
+                services.append(construct_service(self.storage, self.logger, data))
             except Exception:
-                error_message = "FractalServer Service Build and Iterate Error:\n{}".format(traceback.format_exc())
+                error_message = "FractalServer Service Build Error:\n{}".format(traceback.format_exc())
                 self.logger.error(error_message)
-                service.status = "ERROR"
-                service.error = {"error_type": "iteration_error", "error_message": error_message}
-                finished = False
+                error_ids.append(data["id"])
+
+        prefetch_service_tasks(self.storage, services)
 
-            self.storage.update_services([service])
+        # Iterate the services, in the worker processes if available. Only the task submission of
+        # each step happens there, the services themselves are written back in bulk below
+        if self.service_executor is None:
+            iterations = [iterate_service(service) for service in services]
+        else:
+            futures = []
+            for service in services:
+                tm = service.task_manager
+                task_data = {k: tm.task_data[k] for k in tm.required_tasks.values() if k in (tm.task_data or {})}
+                args = (iterate_service_in_worker, service.dict(), task_data)
+                try:
+                    futures.append(self.service_executor.submit(*args))
+                except BrokenProcessPool:
+                    self._restart_service_executor()
+                    futures.append(self.service_executor.submit(*args))
+
+            iterations = []
+            broken_pool = False
+            for i, fut in enumerate(futures):
+                try:
+                    data, finished, error_message = fut.result()
+                    services[i] = construct_service(self.storage, self.logger, data)
+                except Exception as e:
+                    # The service is left as it was before this iteration, but marked as failed
+                    broken_pool |= isinstance(e, BrokenProcessPool)
+                    error_message = "FractalServer Service Worker Error:\n{}".format(traceback.format_exc())
+                    services[i].status = "ERROR"
+                    services[i].error = {"error_type": "iteration_error", "error_message": error_message}
+                    finished = False
+
+                iterations.append((finished, error_message))
+
+            if broken_pool:
+                self._restart_service_executor()
+
+        # Loop over the services and gather their state
+        running_services = 0
+        completed_services = []
+        for service, (finished, error_message) in zip(services, iterations):
+
+            if error_message is not None:
+                self.logger.error(error_message)
 
             # Mark procedure and service as error
             if service.status == "ERROR":
-                self.storage.update_service_status("ERROR", id=service.id)
+                error_ids.append(service.id)
 
-            if finished is not False:
+            if finished:
                 # Add results to procedures, remove complete_ids
                 completed_services.append(service)
             else:
                 running_services += 1
 
+        self.storage.update_services(services)
+        if len(error_ids):
+            self.storage.update_service_status("ERROR", id=error_ids)
+
         if len(completed_services):
             self.logger.info(f"Completed {len(completed_services)} services.")
 
@@ -547,6 +709,52 @@ class FractalServer:
 
         return running_services
 
+    def _restart_service_executor(self) -> None:
+        """
+        Replaces a service executor whose worker processes have died. Without a
+        pool to rebuild, services are iterated in-process from then on.
+        """
+
+        self.logger.warning("Service worker pool is broken, starting a new one.")
+        self.service_executor.shutdown(wait=False)
+
+        if self._service_executor_factory is None:
+            self.service_executor = None
+        else:
+            self.service_executor = self._service_executor_factory()
+
+    async def _update_services_in_thread(self) -> None:
+        """
+        Runs update_services in a background thread so that the IOLoop keeps serving requests.
+        Only one update runs at a time, wakeups arriving during an update trigger one more update.
+        """
+
+        if self._services_running:
+            return
+
+        self._services_running = True
+        try:
+            while True:
+                self._services_wakeup_pending = False
+                await self._run_in_thread(self.update_services)
+                if not self._services_wakeup_pending:
+                    break
+        finally:
+            self._services_running = False
+
+    def wake_services(self) -> None:
+        """
+        Schedules a service update after tasks have completed rather than waiting for the next
+        periodic update. Repeated wakeups before the update runs are coalesced.
+        """
+
+        if ("update_services" not in self.periodic) or self._services_wakeup_pending:
+            return
+
+        self._services_wakeup_pending = True
+        if not self._services_running:
+            self.loop.add_callback(self._update_services_in_thread)
+
     def update_server_log(self) -> Dict[str, Any]:
         """
         Updates the servers internal log
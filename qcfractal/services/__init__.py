@@ -2,4 +2,11 @@
 Base import for services
 """
 
-from .services import construct_service, initialize_service
+from .service_util import prefetch_service_tasks
+from .services import (
+    construct_service,
+    initialize_service,
+    initialize_service_worker,
+    iterate_service,
+    iterate_service_in_worker,
+)
@@ -24,9 +24,26 @@ class TaskManager(ProtoModel):
     tag: Optional[str] = None
     priority: PriorityEnum = PriorityEnum.HIGH
 
+    # Procedure records of the required tasks keyed by id, prefetched in bulk for a service tick
+    task_data: Optional[Dict[str, Dict[str, Any]]] = None
+
     class Config(ProtoModel.Config):
         allow_mutation = True
-        serialize_default_excludes = {"storage_socket", "logger"}
+        serialize_default_excludes = {"storage_socket", "logger", "task_data"}
+
+    def _prefetched(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the prefetched records of the required tasks if all of them hold ``key``.
+        """
+
+        if self.task_data is None:
+            return None
+
+        records = [self.task_data.get(x, {}) for x in self.required_tasks.values()]
+        if all(key in x for x in records):
+            return records
+
+        return None
 
     def done(self) -> bool:
         """
@@ -36,16 +53,18 @@ class TaskManager(ProtoModel):
         if len(self.required_tasks) == 0:
             return True
 
-        task_query = self.storage_socket.get_procedures(
-            id=list(self.required_tasks.values()), include=["status", "error"]
-        )
+        task_data = self._prefetched("status")
+        if task_data is None:
+            task_data = self.storage_socket.get_procedures(
+                id=list(self.required_tasks.values()), include=["status", "error"]
+            )["data"]
 
-        status_values = set(x["status"] for x in task_query["data"])
+        status_values = set(x["status"] for x in task_data)
         if status_values == {"COMPLETE"}:
             return True
 
         elif "ERROR" in status_values:
-            for x in task_query["data"]:
+            for x in task_data:
                 if x["status"] != "ERROR":
                     continue
 
@@ -66,11 +85,12 @@ class TaskManager(ProtoModel):
         Pulls currently held tasks.
         """
 
-        ret = {}
-        for k, id in self.required_tasks.items():
-            ret[k] = self.storage_socket.get_procedures(id=id)["data"][0]
+        task_data = self._prefetched("procedure")
+        if task_data is None:
+            task_data = self.storage_socket.get_procedures(id=list(self.required_tasks.values()))["data"]
 
-        return ret
+        records = {x["id"]: x for x in task_data}
+        return {k: records[id] for k, id in self.required_tasks.items()}
 
     def submit_tasks(self, procedure_type: str, tasks: Dict[str, Any]) -> bool:
         """
@@ -96,10 +116,46 @@ class TaskManager(ProtoModel):
             required_tasks[key] = r["data"]["ids"][0]
 
         self.required_tasks = required_tasks
+        self.task_data = None
 
         return True
 
 
+def prefetch_service_tasks(storage_socket, services: List["BaseService"]) -> None:
+    """
+    Fetches the required tasks of all services in bulk so that a service tick does not query
+    the database per service. Statuses of every required task are pulled first, full records
+    are then only pulled for services whose tasks are all complete.
+    """
+
+    required = {x for service in services for x in service.task_manager.required_tasks.values()}
+    if len(required) == 0:
+        return
+
+    def _fetch(ids, **kwargs):
+        ids = list(ids)
+        limit = storage_socket.get_limit(None)
+
+        ret = []
+        for start in range(0, len(ids), limit):
+            ret.extend(storage_socket.get_procedures(id=ids[start : start + limit], **kwargs)["data"])
+        return {x["id"]: x for x in ret}
+
+    task_data = _fetch(required, include=["id", "status", "error"])
+
+    complete = set()
+    for service in services:
+        ids = service.task_manager.required_tasks.values()
+        if all(task_data.get(x, {}).get("status") == "COMPLETE" for x in ids):
+            complete.update(ids)
+
+    if complete:
+        task_data.update(_fetch(complete))
+
+    for service in services:
+        service.task_manager.task_data = task_data
+
+
 class BaseService(ProtoModel, abc.ABC):
 
     # Excluded fields
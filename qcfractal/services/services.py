@@ -2,10 +2,23 @@
 Manipulates available services.
 """
 
+import logging
+import traceback
+from typing import Any, Dict, Optional, Tuple
+
 from .gridoptimization_service import GridOptimizationService
 from .torsiondrive_service import TorsionDriveService
 
-__all__ = ["initialize_service", "construct_service"]
+__all__ = [
+    "initialize_service",
+    "construct_service",
+    "iterate_service",
+    "initialize_service_worker",
+    "iterate_service_in_worker",
+]
+
+# Storage socket of a service worker process, see initialize_service_worker
+_worker_storage = None
 
 
 def _service_chooser(name):
@@ -67,3 +80,71 @@ def construct_service(storage_socket, logger, data):
     """
     name = data["service"]
     return _service_chooser(name)(**data, storage_socket=storage_socket, logger=logger)
+
+
+def iterate_service(service) -> Tuple[bool, Optional[str]]:
+    """Takes a step of a service, the service is marked as errored if the step raises.
+
+    Parameters
+    ----------
+    service : BaseService
+        The service to iterate
+
+    Returns
+    -------
+    Tuple[bool, Optional[str]]
+        If the service has finished and the error message of a failed step
+
+    """
+    try:
+        return service.iterate() is not False, None
+    except Exception:
+        error_message = "FractalServer Service Build and Iterate Error:\n{}".format(traceback.format_exc())
+        service.status = "ERROR"
+        service.error = {"error_type": "iteration_error", "error_message": error_message}
+        return False, error_message
+
+
+def initialize_service_worker(storage_uri: str, storage_kwargs: Dict[str, Any]) -> None:
+    """Connects a service worker process to the database, used as a process pool initializer.
+
+    Parameters
+    ----------
+    storage_uri : str
+        The database URI of the server
+    storage_kwargs : Dict[str, Any]
+        Additional keyword arguments for the storage socket
+
+    """
+    global _worker_storage
+    from ..storage_sockets import storage_socket_factory
+
+    _worker_storage = storage_socket_factory(storage_uri, **storage_kwargs)
+
+
+def iterate_service_in_worker(
+    data: Dict[str, Any], task_data: Optional[Dict[str, Dict[str, Any]]]
+) -> Tuple[Dict[str, Any], bool, Optional[str]]:
+    """Iterates a serialized service inside a service worker process.
+
+    Parameters
+    ----------
+    data : dict
+        The serialized service
+    task_data : Optional[dict]
+        The prefetched records of the required tasks of the service
+
+    Returns
+    -------
+    Tuple[Dict[str, Any], bool, Optional[str]]
+        The serialized service after the step, if it has finished and the error message of a failed step
+
+    """
+    if _worker_storage is None:
+        raise AttributeError("Service worker was not initialized, see initialize_service_worker.")
+
+    service = construct_service(_worker_storage, logging.getLogger("tornado.application"), data)
+    service.task_manager.task_data = task_data
+
+    finished, error_message = iterate_service(service)
+    return service.dict(), finished, error_message
@@ -125,6 +125,11 @@ class TorsionDriveService(BaseService):
 
         complete_tasks = self.task_manager.get_tasks()
 
+        # Lookup the geometries of all molecules of this round at once
+        geometries = self._get_geometries(
+            [x[k] for x in complete_tasks.values() for k in ("initial_molecule", "final_molecule")]
+        )
+
         # Populate task results
         task_results = {}
         for key, task_ids in self.task_map.items():
@@ -134,12 +139,13 @@ class TorsionDriveService(BaseService):
                 # Cycle through all tasks for this entry
                 ret = complete_tasks[task_id]
 
-                # Lookup molecules
-                mol_keys = self.storage_socket.get_molecules(id=[ret["initial_molecule"], ret["final_molecule"]])[
-                    "data"
-                ]
-
-                task_results[key].append((mol_keys[0].geometry, mol_keys[1].geometry, ret["energies"][-1]))
+                task_results[key].append(
+                    (
+                        geometries[str(ret["initial_molecule"])],
+                        geometries[str(ret["final_molecule"])],
+                        ret["energies"][-1],
+                    )
+                )
 
         td_api.update_state(self.torsiondrive_state, task_results)
 
@@ -156,6 +162,13 @@ class TorsionDriveService(BaseService):
 
         return False
 
+    def _get_geometries(self, molecule_ids: List[str]) -> Dict[str, Any]:
+        """
+        Returns the (natom, 3) geometries of the given molecules, recent ones are cached by the storage socket.
+        """
+
+        return self.storage_socket.get_molecule_geometries(molecule_ids)
+
     def submit_optimization_tasks(self, task_dict):
         _check_td()
         from torsiondrive import td_api
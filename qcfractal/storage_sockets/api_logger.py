@@ -5,7 +5,12 @@ https://www.maxmind.com
 (attribution requirement)
 """
 
+import collections
+import datetime
 import logging
+import threading
+
+from ..util import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +20,38 @@ class API_AccessLogger:
     Extract access information from HTTP requests to be saved by the database
     Calculate geo data using geoip2 if the library and its files are available
     otherwise, just extracts the basic information
-    """
 
-    def __init__(self, geo_file_path):
+    Logs passed to log_access are buffered in memory and saved in batches by a background
+    writer thread, either once batch_size logs are waiting or every flush_interval seconds.
+    Logs arriving while max_buffer logs are waiting, or after stop, are dropped and counted in n_dropped.
+    """
 
+    def __init__(
+        self,
+        geo_file_path,
+        storage=None,
+        max_buffer: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        geo_cache_size: int = 10000,
+    ):
+
+        self.storage = storage
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer = collections.deque()
+        self._cond = threading.Condition()
+        self._writer = None
+        self._stopping = False
+
+        # Logs saved, dropped because the buffer was full, and lost to database errors
+        self.n_logged = 0
+        self.n_dropped = 0
+        self.n_failed = 0
+
+        self._geoip2_cache = LRUCache(maxsize=geo_cache_size)
         self.geoip2_reader = None
         try:
             import geoip2.database
@@ -41,7 +74,18 @@ class API_AccessLogger:
 
     def get_api_access_log(self, request, access_type=None, extra_params=None):
 
-        log = {}
+        log = self._get_request_log(request, access_type=access_type, extra_params=extra_params)
+
+        # extra geo data if available
+        extra = self.get_geoip2_data(log["ip_address"])
+        log.update(extra)
+
+        return log
+
+    def _get_request_log(self, request, access_type=None, extra_params=None):
+        """Extracts the log entry of a request, without geo data"""
+
+        log = {"access_date": datetime.datetime.utcnow()}
 
         if not access_type:
             log["access_type"] = request.uri[1:]  # remove /
@@ -61,18 +105,88 @@ class API_AccessLogger:
         # Or, will saved as string anyway
         # log.extra_access_params = request.json
 
-        # extra geo data if available
-        extra = self.get_geoip2_data(log["ip_address"])
-        log.update(extra)
-
         return log
 
+    def log_access(self, request, access_type=None, extra_params=None) -> bool:
+        """
+        Queues the access log of a request to be saved by the background writer.
+
+        Returns
+        -------
+        bool
+            False if the buffer was full or the logger stopped, and the log was dropped
+        """
+
+        log = self._get_request_log(request, access_type=access_type, extra_params=extra_params)
+
+        with self._cond:
+            # The writer saves its last batch once stopping, later logs would never be saved
+            if self._stopping or len(self._buffer) >= self.max_buffer:
+                self.n_dropped += 1
+                return False
+
+            self._buffer.append(log)
+
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="api_access_logger", daemon=True)
+                self._writer.start()
+
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+        return True
+
+    def stop(self, timeout: float = 10) -> None:
+        """Saves all buffered logs and stops the background writer"""
+
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            writer = self._writer
+
+        if writer is not None:
+            writer.join(timeout)
+
+    def _run_writer(self):
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or len(self._buffer) >= self.batch_size, timeout=self.flush_interval
+                )
+                batch = list(self._buffer)
+                self._buffer.clear()
+                stopping = self._stopping
+
+            for start in range(0, len(batch), self.batch_size):
+                self._save_batch(batch[start : start + self.batch_size])
+
+            if stopping:
+                return
+
+    def _save_batch(self, batch):
+
+        # Geo lookups happen here rather than on the request path
+        for log in batch:
+            log.update(self.get_geoip2_data(log["ip_address"]))
+
+        try:
+            self.storage.save_access(batch)
+            self.n_logged += len(batch)
+        except Exception:  # lgtm [py/catch-base-exception]
+            self.n_failed += len(batch)
+            logger.error(f"Could not save {len(batch)} API access logs", exc_info=True)
+
     def get_geoip2_data(self, ip_address):
         out = {}
 
         if not self.geoip2_reader:
             return out
 
+        cached = self._geoip2_cache.get(ip_address)
+        if cached is not None:
+            return cached
+
         try:
             loc_data = self.geoip2_reader.city(ip_address)
             out["city"] = loc_data.city.name
@@ -85,4 +199,5 @@ class API_AccessLogger:
         except:  # lgtm [py/catch-base-exception]
             logger.error(f"Problem getting geoip2 data for {ip_address}")
 
+        self._geoip2_cache.put(ip_address, out)
         return out
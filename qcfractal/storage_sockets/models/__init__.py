@@ -13,7 +13,7 @@ from .results_models import (
     Trajectory,
     WavefunctionStoreORM,
 )
-from .sql_base import Base, MsgpackExt
+from .sql_base import Base, MsgpackExt, MsgpackExtRaw
 
 # ORM general models
 from .sql_models import (
@@ -25,6 +25,7 @@ from .sql_models import (
     QueueManagerORM,
     ServerStatsLogORM,
     ServiceQueueORM,
+    ServiceQueueTasks,
     TaskQueueORM,
     UserORM,
     VersionsORM,
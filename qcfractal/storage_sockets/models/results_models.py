@@ -18,7 +18,7 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.orderinglist import ordering_list
-from sqlalchemy.orm import column_property, relationship
+from sqlalchemy.orm import column_property, deferred, relationship
 
 from qcfractal.interface.models.records import DriverEnum, RecordStatusEnum
 from qcfractal.storage_sockets.models.sql_base import Base, MsgpackExt
@@ -47,8 +47,8 @@ class BaseResultORM(Base):
     version = Column(Integer)
     protocols = Column(JSONB)
 
-    # Extra fields
-    extras = Column(MsgpackExt)
+    # Extra fields, msgpack columns are only loaded (and decoded) when accessed or undeferred
+    extras = deferred(Column(MsgpackExt), group="msgpack")
     stdout = Column(Integer, ForeignKey("kv_store.id"))
     stdout_obj = relationship(
         KVStoreORM, lazy="noload", foreign_keys=stdout, cascade="all, delete-orphan", single_parent=True
@@ -139,7 +139,7 @@ class ResultORM(BaseResultORM):
     keywords_obj = relationship(KeywordsORM, lazy="select")
 
     # Primary Result output
-    return_result = Column(MsgpackExt)
+    return_result = deferred(Column(MsgpackExt), group="msgpack")
     properties = Column(JSON)  # TODO: may use JSONB in the future
 
     # Wavefunction data
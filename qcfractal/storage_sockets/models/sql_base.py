@@ -30,6 +30,10 @@ class MsgpackExt(TypeDecorator):
             return msgpackext_loads(value)
 
 
+class MsgpackExtRaw(bytes):
+    """The msgpack-ext encoded value of a MsgpackExt column, read without decoding it."""
+
+
 @as_declarative()
 class Base:
     """Base declarative class of all ORM models"""
@@ -38,14 +42,12 @@ class Base:
 
     def to_dict(self, exclude=None):
 
-        tobe_deleted_keys = []
-
+        dict_obj = self._get_dict_fields()
         if exclude:
-            tobe_deleted_keys.extend(exclude)
+            tobe_deleted_keys = set(exclude)
+            dict_obj = [x for x in dict_obj if x not in tobe_deleted_keys]
 
-        dict_obj = [x for x in self._all_col_names() if x not in self.db_related_fields and x not in tobe_deleted_keys]
-
-        # Add the attributes to the final results
+        # Add the attributes to the final results, deferred columns which are not requested are never loaded
         ret = {k: getattr(self, k) for k in dict_obj}
 
         if "extra" in ret:
@@ -63,9 +65,15 @@ class Base:
 
         return ret
 
+    # Column metadata is computed once per class and stored in the __dict__ of that class,
+    # subclasses must not reuse the metadata of their parent
+
     @classmethod
     def _get_fieldnames_with_DB_ids_(cls):
 
+        if "_Base__id_fields" in cls.__dict__:
+            return cls.__id_fields
+
         class_inspector = inspect(cls)
         id_fields = []
         for key, col in class_inspector.columns.items():
@@ -73,24 +81,24 @@ class Base:
             if col.primary_key or len(col.foreign_keys) > 0 or key != col.key:
                 id_fields.append(key)
 
+        cls.__id_fields = id_fields
         return id_fields
 
     @classmethod
     def _get_col_types(cls):
 
-        # Must use private attributes so that they are not shared by subclasses
-        if hasattr(cls, "__columns") and hasattr(cls, "__hybrids") and hasattr(cls, "__relationships"):
-            return cls.__columns, cls.__hybrids, cls.__relationships
+        if "_Base__col_types" in cls.__dict__:
+            return cls.__col_types
 
         mapper = inspect(cls)
 
-        cls.__columns = []
-        cls.__hybrids = []
-        cls.__relationships = {}
+        columns = []
+        hybrids = []
+        relationships = {}
         for k, v in mapper.relationships.items():
-            cls.__relationships[k] = {}
-            cls.__relationships[k]["join_class"] = v.argument
-            cls.__relationships[k]["remote_side_column"] = list(v.remote_side)[0]
+            relationships[k] = {}
+            relationships[k]["join_class"] = v.argument
+            relationships[k]["remote_side_column"] = list(v.remote_side)[0]
 
         for k, c in mapper.all_orm_descriptors.items():
 
@@ -101,16 +109,32 @@ class Base:
                 continue
 
             if c.extension_type == HYBRID_PROPERTY:
-                cls.__hybrids.append(k)
+                hybrids.append(k)
             elif k not in mapper.relationships:
-                cls.__columns.append(k)
+                columns.append(k)
 
-        return cls.__columns, cls.__hybrids, cls.__relationships
+        cls.__col_types = (columns, hybrids, relationships)
+        return cls.__col_types
 
     @classmethod
     def _all_col_names(cls):
+
+        if "_Base__all_col_names" in cls.__dict__:
+            return cls.__all_col_names
+
         all_cols, hybrid, _ = cls._get_col_types()
-        return all_cols + hybrid
+        cls.__all_col_names = all_cols + hybrid
+        return cls.__all_col_names
+
+    @classmethod
+    def _get_dict_fields(cls):
+        """The fields returned by to_dict"""
+
+        if "_Base__dict_fields" in cls.__dict__:
+            return cls.__dict_fields
+
+        cls.__dict_fields = [x for x in cls._all_col_names() if x not in cls.db_related_fields]
+        return cls.__dict_fields
 
     def _update_many_to_many(self, table, parent_id_name, child_id_name, parent_id_val, new_list, old_list=None):
         """Perfomr upsert on a many to many association table
@@ -254,6 +254,15 @@ class TaskQueueORM(Base):
         Index("ix_task_queue_manager", "manager"),
         Index("ix_task_queue_base_result_id", "base_result_id"),
         Index("ix_task_waiting_sort", text("priority desc,  created_on")),
+        # Partial indices over the (small) WAITING slice of the queue, matching the
+        # ORDER BY of SQLAlchemySocket.queue_get_next with and without a tag
+        Index(
+            "ix_task_queue_waiting_tag",
+            "tag",
+            text("priority desc, created_on"),
+            postgresql_where=text("status = 'waiting'"),
+        ),
+        Index("ix_task_queue_waiting", text("priority desc, created_on"), postgresql_where=text("status = 'waiting'")),
     )
 
 
@@ -288,6 +297,17 @@ class ServiceQueueORM(Base):
     )
 
 
+class ServiceQueueTasks(Base):
+    """Association table of the procedures each service waits on, indexed from procedure to service"""
+
+    __tablename__ = "service_queue_tasks"
+
+    service_id = Column(Integer, ForeignKey("service_queue.id", ondelete="cascade"), primary_key=True)
+    procedure_id = Column(Integer, ForeignKey("base_result.id", ondelete="cascade"), primary_key=True)
+
+    __table_args__ = (Index("ix_service_queue_tasks_procedure_id", "procedure_id"),)
+
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 
@@ -3,9 +3,10 @@ SQLAlchemy Database class to handle access to Pstgres through ORM
 """
 
 try:
-    from sqlalchemy import create_engine, or_, case, func
+    from sqlalchemy import JSON, create_engine, and_, or_, case, exists, func, literal, select, type_coerce, union_all
+    from sqlalchemy.dialects.postgresql import BYTEA
     from sqlalchemy.exc import IntegrityError
-    from sqlalchemy.orm import sessionmaker, with_polymorphic
+    from sqlalchemy.orm import sessionmaker, undefer_group, with_polymorphic
     from sqlalchemy.sql.expression import desc
     from sqlalchemy.sql.expression import case as expression_case
 except ImportError:
@@ -13,8 +14,12 @@ except ImportError:
         "SQLAlchemy_socket requires sqlalchemy, please install this python " "module or try a different db_socket."
     )
 
+import hashlib
+import hmac
+import io
 import json
 import logging
+import pickle
 import secrets
 from collections.abc import Iterable
 from contextlib import contextmanager
@@ -22,6 +27,8 @@ from datetime import datetime as dt
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import bcrypt
+import numpy as np
+from qcelemental.util import msgpackext_dumps
 
 # pydantic classes
 from qcfractal.interface.models import (
@@ -36,6 +43,8 @@ from qcfractal.interface.models import (
     TorsionDriveRecord,
     prepare_basis,
 )
+from qcfractal.interface.hash_helpers import molecular_formulas, molecule_hashes
+from qcfractal.interface.models.records import RecordStatusEnum
 from qcfractal.storage_sockets.db_queries import QUERY_CLASSES
 from qcfractal.storage_sockets.models import (
     AccessLogORM,
@@ -46,6 +55,8 @@ from qcfractal.storage_sockets.models import (
     KeywordsORM,
     KVStoreORM,
     MoleculeORM,
+    MsgpackExt,
+    MsgpackExtRaw,
     OptimizationProcedureORM,
     QueueManagerLogORM,
     QueueManagerORM,
@@ -53,6 +64,7 @@ from qcfractal.storage_sockets.models import (
     ResultORM,
     ServerStatsLogORM,
     ServiceQueueORM,
+    ServiceQueueTasks,
     TaskQueueORM,
     TorsionDriveProcedureORM,
     UserORM,
@@ -61,6 +73,7 @@ from qcfractal.storage_sockets.models import (
 )
 from qcfractal.storage_sockets.storage_utils import add_metadata_template, get_metadata_template
 
+from ..util import LRUCache
 from .models import Base
 
 if TYPE_CHECKING:
@@ -125,6 +138,24 @@ def get_count_fast(query):
     return count
 
 
+def _copy_text_value(value, col_type) -> str:
+    """Formats a column value as a field of the PostgreSQL COPY text format"""
+
+    if value is None:
+        return "\\N"
+
+    if isinstance(col_type, MsgpackExt):
+        value = "\\x" + msgpackext_dumps(value).hex()
+    elif isinstance(col_type, JSON):
+        value = json.dumps(value)
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    else:
+        value = str(value)
+
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+
+
 def get_procedure_class(record):
 
     if isinstance(record, OptimizationRecord):
@@ -166,6 +197,11 @@ class SQLAlchemySocket:
         sql_echo: bool = False,
         max_limit: int = 1000,
         skip_version_check: bool = False,
+        pool_size: int = 5,
+        auth_cache_size: int = 1024,
+        auth_cache_ttl: float = 60,
+        record_cache_size: int = 64 * 1024 ** 2,
+        record_cache_ttl: float = 600,
     ):
         """
         Constructs a new SQLAlchemy socket
@@ -184,6 +220,32 @@ class SQLAlchemySocket:
 
         self._lower_results_index = ["method", "basis", "program"]
 
+        # Successful verifications, keyed on a keyed digest of the credentials so neither the
+        # passwords nor a plain hash of them are kept in memory. Each socket only invalidates its own
+        # cache when a user changes, the ttl bounds how long other processes accept old credentials
+        if (auth_cache_size > 0) and (auth_cache_ttl > 0):
+            self._auth_cache = LRUCache(maxsize=auth_cache_size, ttl=auth_cache_ttl)
+        else:
+            self._auth_cache = None
+        self._auth_cache_secret = secrets.token_bytes(32)
+        self._auth_cache_generation: Dict[str, int] = {}
+
+        # Pickled COMPLETE results/procedures keyed by id, bounded by record_cache_size bytes. Each socket
+        # only invalidates its own cache on writes, the ttl bounds how stale other processes can get
+        if record_cache_size > 0:
+            self._record_cache = LRUCache(
+                maxsize=None,
+                ttl=record_cache_ttl,
+                maxbytes=record_cache_size,
+                getsizeof=lambda entry: sum(len(blob) for blob in entry.values()),
+            )
+        else:
+            self._record_cache = None
+        self._record_cache_generation = 0
+
+        # Read-only (natom, 3) geometries keyed by molecule id, molecules never change once added
+        self._geometry_cache = LRUCache(maxsize=4096)
+
         # disconnect from any active default connection
         # disconnect()
         if "psycopg2" not in uri:
@@ -200,7 +262,8 @@ class SQLAlchemySocket:
         self.engine = create_engine(
             uri,
             echo=sql_echo,  # echo for logging into python logging
-            pool_size=5,  # 5 is the default, 0 means unlimited
+            pool_size=pool_size,  # 5 is the default, 0 means unlimited
+            executemany_mode="batch",  # send executemany (bulk updates) in pages rather than row by row
         )
         self.logger.info(
             "Connected SQLAlchemy to DB dialect {} with driver {}".format(self.engine.dialect.name, self.engine.driver)
@@ -284,6 +347,9 @@ class SQLAlchemySocket:
         # create the tables again
         Base.metadata.create_all(self.engine)
 
+        self._clear_record_cache()
+        self._geometry_cache.clear()
+
         # self.client.drop_database(db_name)
 
     def _delete_DB_data(self, db_name):
@@ -313,6 +379,9 @@ class SQLAlchemySocket:
             session.query(KVStoreORM).delete(synchronize_session=False)
             session.query(MoleculeORM).delete(synchronize_session=False)
 
+        self._clear_record_cache()
+        self._geometry_cache.clear()
+
     def get_project_name(self) -> str:
         return self._project_name
 
@@ -324,7 +393,27 @@ class SQLAlchemySocket:
 
         return limit if limit is not None and limit < self._max_limit else self._max_limit
 
-    def get_query_projection(self, className, query, *, limit=None, skip=0, include=None, exclude=None):
+    def get_query_projection(
+        self,
+        className,
+        query,
+        *,
+        limit=None,
+        skip=0,
+        include=None,
+        exclude=None,
+        after_id=None,
+        count=True,
+        raw_msgpack=False,
+    ):
+        """
+        Runs ``query`` on ``className`` returning the (optionally projected) rows and the total count.
+
+        If ``after_id`` is given, rows are ordered by id and resume after it (keyset pagination),
+        which stays fast for deep pages unlike ``skip``. If ``count`` is False the count query is
+        skipped and None is returned in its place. If ``raw_msgpack`` is True, MsgpackExt columns
+        are returned undecoded as MsgpackExtRaw bytes.
+        """
 
         if include and exclude:
             raise AttributeError(
@@ -335,22 +424,27 @@ class SQLAlchemySocket:
 
         prop, hybrids, relationships = className._get_col_types()
 
-        # build projection from include or exclude
+        # build projection from include or exclude, raw columns always need a projection
         _projection = []
         if include:
             _projection = set(include)
-        elif exclude:
-            _projection = set(className._all_col_names()) - set(exclude) - set(className.db_related_fields)
+        elif exclude or raw_msgpack:
+            _projection = set(className._all_col_names()) - set(exclude or []) - set(className.db_related_fields)
         _projection = list(_projection)
 
         proj = []
         join_attrs = {}
         callbacks = []
+        raw_keys = []
 
         # prepare hybrid attributes for callback and joins
         for key in _projection:
             if key in prop:  # normal column
-                proj.append(getattr(className, key))
+                column = getattr(className, key)
+                if raw_msgpack and (key != "extra") and isinstance(column.type, MsgpackExt):
+                    column = type_coerce(column, BYTEA).label(key)
+                    raw_keys.append(key)
+                proj.append(column)
 
             # if hybrid property, save callback, and relation if any
             elif key in hybrids:
@@ -377,7 +471,9 @@ class SQLAlchemySocket:
                 # query with projection, without joins
                 data = session.query(*proj).filter(*query)
 
-                n_found = get_count_fast(data)  # before iterating on the data
+                n_found = get_count_fast(data) if count else None  # before iterating on the data
+                if after_id is not None:
+                    data = data.filter(className.id > int(after_id)).order_by(className.id)
                 data = data.limit(self.get_limit(limit)).offset(skip)
                 rdata = [dict(zip(_projection, row)) for row in data]
 
@@ -397,16 +493,15 @@ class SQLAlchemySocket:
                             .order_by(relation_details["remote_side_column"])
                             .all()
                         )
+                        # Group the joined rows by parent in a single pass
                         for res_id in res_ids:
                             join_data[res_id][key] = []
-                            for res in ret:
-                                if res_id == res[0]:
-                                    join_data[res_id][key].append(res[1])
+                        for parent_id, joined in ret:
+                            join_data[parent_id][key].append(joined)
 
-                        for data in rdata:
-                            parent_id = data.get("id", data.get("_id"))
-                            data[key] = join_data[parent_id][key]
-                            data.pop("_id", None)
+                    for data in rdata:
+                        parent_id = data.pop("_id", None) or data["id"]
+                        data.update(join_data[parent_id])
 
                 # call hybrid methods
                 for callback in callbacks:
@@ -415,6 +510,10 @@ class SQLAlchemySocket:
 
                 id_fields = className._get_fieldnames_with_DB_ids_()
                 for d in rdata:
+                    for key in raw_keys:
+                        if d[key] is not None:
+                            d[key] = MsgpackExtRaw(d[key])
+
                     # Expand extra json into fields
                     if "extra" in d:
                         d.update(d["extra"])
@@ -433,12 +532,157 @@ class SQLAlchemySocket:
 
                 # from sqlalchemy.dialects import postgresql
                 # print(data.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
-                n_found = get_count_fast(data)
-                data = data.limit(self.get_limit(limit)).offset(skip).all()
+                n_found = get_count_fast(data) if count else None
+                if after_id is not None:
+                    data = data.filter(className.id > int(after_id)).order_by(className.id)
+                data = data.options(undefer_group("msgpack")).limit(self.get_limit(limit)).offset(skip).all()
                 rdata = [d.to_dict() for d in data]
 
         return rdata, n_found
 
+    def _get_cached_projection(
+        self,
+        className,
+        query,
+        *,
+        limit=None,
+        skip=0,
+        include=None,
+        exclude=None,
+        after_id=None,
+        count=True,
+        raw_msgpack=False,
+    ):
+        """
+        Same as ``get_query_projection``, but served through the record cache.
+
+        The ids and statuses of the matching rows are queried first, only the rows missing from
+        the cache are then pulled with the requested projection. COMPLETE records are cached per
+        id and projection, all other records are always pulled from the database.
+        """
+
+        if (self._record_cache is None) or (include and exclude) or (exclude and "id" in exclude):
+            return self.get_query_projection(
+                className,
+                query,
+                limit=limit,
+                skip=skip,
+                include=include,
+                exclude=exclude,
+                after_id=after_id,
+                count=count,
+                raw_msgpack=raw_msgpack,
+            )
+
+        # Taken before reading, a write invalidating the cache in the meantime prevents caching stale rows
+        generation = self._record_cache_generation
+
+        matches, n_found = self.get_query_projection(
+            className, query, limit=limit, skip=skip, include=["id", "status"], after_id=after_id, count=count
+        )
+
+        proj_key = (
+            className.__name__,
+            tuple(sorted(include)) if include else None,
+            tuple(sorted(exclude)) if exclude else None,
+            raw_msgpack,
+        )
+
+        records = {}
+        missing = []
+        for match in matches:
+            blob = self._record_cache.get(match["id"], {}).get(proj_key)
+            if blob is None:
+                missing.append(int(match["id"]))
+            else:
+                records[match["id"]] = pickle.loads(blob)
+
+        if missing:
+            pop_id = bool(include) and ("id" not in include)
+            fetched, _ = self.get_query_projection(
+                className,
+                [className.id.in_(missing)],
+                limit=len(missing),
+                include=list(include) + ["id"] if pop_id else include,
+                exclude=exclude,
+                count=False,
+                raw_msgpack=raw_msgpack,
+            )
+
+            status = {match["id"]: match["status"] for match in matches}
+            for record in fetched:
+                record_id = record.pop("id") if pop_id else record["id"]
+                records[record_id] = record
+
+                if status[record_id] != RecordStatusEnum.complete:
+                    continue
+
+                entry = self._record_cache.get(record_id, {})
+                self._record_cache.put(
+                    record_id, {**entry, proj_key: pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)}
+                )
+                if generation != self._record_cache_generation:
+                    self._record_cache.pop(record_id)
+
+        rdata = [records[match["id"]] for match in matches if match["id"] in records]
+        return rdata, n_found
+
+    def _invalidate_record_cache(self, ids: List[str]) -> None:
+        """Removes records from the record cache, must be called after the changes are committed"""
+
+        if self._record_cache is None:
+            return
+
+        self._record_cache_generation += 1
+        for record_id in ids:
+            if record_id is not None:
+                self._record_cache.pop(str(record_id))
+
+    def _clear_record_cache(self) -> None:
+
+        if self._record_cache is None:
+            return
+
+        self._record_cache_generation += 1
+        self._record_cache.clear()
+
+    def _insert_many(self, session, className, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Inserts rows into the table of ``className`` with a single multi-row INSERT.
+
+        Primary keys are reserved up-front from the id sequence of the table, so the
+        returned ids are guaranteed to be in the same order as ``rows``.
+        Does NOT commit, the caller owns the transaction.
+
+        Parameters
+        ----------
+        session : Session
+            The session to insert with
+        className : Base
+            The ORM class to insert into
+        rows : List[Dict[str, Any]]
+            Column name/value pairs for each row, missing columns are inserted as NULL
+
+        Returns
+        -------
+        List[int]
+            The ids of the inserted rows, in input order
+        """
+
+        if not rows:
+            return []
+
+        seq_name = f"{className.__tablename__}_id_seq"
+        ids_query = select([func.nextval(seq_name)]).select_from(func.generate_series(1, len(rows)))
+        ids = [row[0] for row in session.execute(ids_query)]
+
+        # A multi-row VALUES clause requires the same columns on every row
+        columns = set().union(*rows)
+        values = [{**{k: row.get(k, None) for k in columns}, "id": new_id} for row, new_id in zip(rows, ids)]
+        session.execute(className.__table__.insert().values(values))
+
+        return ids
+
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def custom_query(self, class_name: str, query_key: str, **kwargs):
@@ -484,12 +728,17 @@ class SQLAlchemySocket:
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Logging ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    def save_access(self, log_data):
+    def save_access(self, log_data: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        """
+        Saves one or a batch of API access logs, a batch is inserted with a single statement.
+        """
+
+        if isinstance(log_data, dict):
+            log_data = [log_data]
 
+        rows = [{"access_date": dt.utcnow(), **log} for log in log_data]
         with self.session_scope() as session:
-            log = AccessLogORM(**log_data)
-            session.add(log)
-            session.commit()
+            self._insert_many(session, AccessLogORM, rows)
 
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Logs (KV store) ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -510,19 +759,12 @@ class SQLAlchemySocket:
         """
 
         meta = add_metadata_template()
-        blob_ids = []
+        new_blobs = [{"value": blob} for blob in blobs_list if blob is not None]
         with self.session_scope() as session:
-            for blob in blobs_list:
-                if blob is None:
-                    blob_ids.append(None)
-                    continue
-
-                doc = KVStoreORM(value=blob)
-                session.add(doc)
-                session.commit()
-                blob_ids.append(str(doc.id))
-                meta["n_inserted"] += 1
+            new_ids = iter(self._insert_many(session, KVStoreORM, new_blobs))
 
+        blob_ids = [None if blob is None else str(next(new_ids)) for blob in blobs_list]
+        meta["n_inserted"] = sum(x is not None for x in blob_ids)
         meta["success"] = True
 
         return {"data": blob_ids, "meta": meta}
@@ -619,6 +861,36 @@ class SQLAlchemySocket:
 
         return {"meta": meta, "data": ret}
 
+    @staticmethod
+    def _molecule_insert_dicts(molecules: List[Molecule], hash_processes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Validates molecules and builds the column values to insert, including fresh indices"""
+
+        molecules = [Molecule(**dmol.dict(), validate=True) if dmol.validated is False else dmol for dmol in molecules]
+
+        # Indices are built for all molecules at once
+        hashes = molecule_hashes(molecules, processes=hash_processes)
+        formulas = molecular_formulas(molecules)
+
+        ret = []
+        for dmol, molecule_hash, molecular_formula in zip(molecules, hashes, formulas):
+            mol_dict = dmol.dict(exclude={"id", "validated"})
+
+            # TODO: can set them as defaults in the sql_models, not here
+            mol_dict["fix_com"] = True
+            mol_dict["fix_orientation"] = True
+
+            # Build fresh indices
+            mol_dict["molecule_hash"] = molecule_hash
+            mol_dict["molecular_formula"] = molecular_formula
+
+            mol_dict["identifiers"] = {}
+            mol_dict["identifiers"]["molecule_hash"] = mol_dict["molecule_hash"]
+            mol_dict["identifiers"]["molecular_formula"] = mol_dict["molecular_formula"]
+
+            ret.append(mol_dict)
+
+        return ret
+
     def add_molecules(self, molecules: List[Molecule]):
         """
         Adds molecules to the database.
@@ -640,28 +912,8 @@ class SQLAlchemySocket:
         with self.session_scope() as session:
 
             # Build out the ORMs
-            orm_molecules = []
-            for dmol in molecules:
-
-                if dmol.validated is False:
-                    dmol = Molecule(**dmol.dict(), validate=True)
-
-                mol_dict = dmol.dict(exclude={"id", "validated"})
-
-                # TODO: can set them as defaults in the sql_models, not here
-                mol_dict["fix_com"] = True
-                mol_dict["fix_orientation"] = True
-
-                # Build fresh indices
-                mol_dict["molecule_hash"] = dmol.get_hash()
-                mol_dict["molecular_formula"] = dmol.get_molecular_formula()
-
-                mol_dict["identifiers"] = {}
-                mol_dict["identifiers"]["molecule_hash"] = mol_dict["molecule_hash"]
-                mol_dict["identifiers"]["molecular_formula"] = mol_dict["molecular_formula"]
-
-                # search by index keywords not by all keys, much faster
-                orm_molecules.append(MoleculeORM(**mol_dict))
+            # search by index keywords not by all keys, much faster
+            orm_molecules = [MoleculeORM(**mol_dict) for mol_dict in self._molecule_insert_dicts(molecules)]
 
             # Check if we have duplicates
             hash_list = [x.molecule_hash for x in orm_molecules]
@@ -721,7 +973,111 @@ class SQLAlchemySocket:
         ret = {"data": results, "meta": meta}
         return ret
 
-    def get_molecules(self, id=None, molecule_hash=None, molecular_formula=None, limit: int = None, skip: int = 0):
+    def bulk_add_molecules(
+        self, molecules: List[Molecule], chunk_size: int = 50000, hash_processes: Optional[int] = None
+    ):
+        """
+        Adds molecules to the database through PostgreSQL COPY, for imports too large for add_molecules.
+
+        Each chunk is copied into a temporary staging table and inserted with a single statement which
+        skips the molecules whose hash is already stored, or repeated earlier in the chunk. The molecule
+        table is locked against concurrent inserts while a chunk is inserted.
+
+        Parameters
+        ----------
+        molecules : List[Molecule]
+            The molecules to add.
+        chunk_size : int, optional
+            The number of molecules copied and committed in one transaction.
+        hash_processes : Optional[int], optional
+            If given, the molecule hashes of each chunk are computed in this many worker processes.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dict with keys: data, meta
+            Data is the ids of the molecules in the input order, as for add_molecules
+        """
+
+        meta = add_metadata_template()
+
+        columns = [col for col in MoleculeORM.__table__.columns if col.key != "id"]
+        col_names = ", ".join(col.name for col in columns)
+
+        results = []
+        for start in range(0, len(molecules), chunk_size):
+            chunk = molecules[start : start + chunk_size]
+
+            rows = io.StringIO()
+            for order, mol_dict in enumerate(self._molecule_insert_dicts(chunk, hash_processes=hash_processes)):
+                fields = [str(order)]
+                for col in columns:
+                    if col.key in mol_dict:
+                        value = mol_dict[col.key]
+                    elif col.default is not None:
+                        value = col.default.arg
+                    else:
+                        value = None
+                    fields.append(_copy_text_value(value, col.type))
+
+                rows.write("\t".join(fields))
+                rows.write("\n")
+            rows.seek(0)
+
+            with self.session_scope() as session:
+                cursor = session.connection().connection.cursor()
+
+                cursor.execute(
+                    "CREATE TEMP TABLE molecule_staging ON COMMIT DROP AS SELECT * FROM molecule WITH NO DATA"
+                )
+                cursor.execute("ALTER TABLE molecule_staging ADD COLUMN input_order integer")
+                cursor.copy_expert(f"COPY molecule_staging (input_order, {col_names}) FROM STDIN", rows)
+
+                # molecule_hash is not unique, the lock stands in for ON CONFLICT against concurrent inserts
+                cursor.execute("LOCK TABLE molecule IN SHARE ROW EXCLUSIVE MODE")
+                cursor.execute(
+                    f"""
+                    INSERT INTO molecule ({col_names})
+                    SELECT {col_names} FROM (
+                        SELECT DISTINCT ON (molecule_hash) * FROM molecule_staging s
+                        WHERE NOT EXISTS (SELECT 1 FROM molecule m WHERE m.molecule_hash = s.molecule_hash)
+                        ORDER BY molecule_hash, input_order
+                    ) new_molecules ORDER BY input_order
+                    RETURNING molecule_hash
+                    """
+                )
+                inserted = {row[0] for row in cursor.fetchall()}
+
+                cursor.execute(
+                    """
+                    SELECT s.input_order, s.molecule_hash, min(m.id) FROM molecule_staging s
+                    JOIN molecule m ON m.molecule_hash = s.molecule_hash
+                    GROUP BY s.input_order, s.molecule_hash ORDER BY s.input_order
+                    """
+                )
+                for _, molecule_hash, mol_id in cursor.fetchall():
+                    if molecule_hash not in inserted:
+                        meta["duplicates"].append(str(mol_id))
+                    results.append(str(mol_id))
+
+                session.commit()
+
+            meta["n_inserted"] += len(inserted)
+
+        meta["success"] = True
+
+        ret = {"data": results, "meta": meta}
+        return ret
+
+    def get_molecules(
+        self,
+        id=None,
+        molecule_hash=None,
+        molecular_formula=None,
+        limit: int = None,
+        skip: int = 0,
+        raw_msgpack: bool = False,
+    ):
         try:
             if isinstance(molecular_formula, str):
                 molecular_formula = qcelemental.molutil.order_molecular_formula(molecular_formula)
@@ -737,7 +1093,12 @@ class SQLAlchemySocket:
 
         # Don't include the hash or the molecular_formula in the returned result
         rdata, meta["n_found"] = self.get_query_projection(
-            MoleculeORM, query, limit=limit, skip=skip, exclude=["molecule_hash", "molecular_formula"]
+            MoleculeORM,
+            query,
+            limit=limit,
+            skip=skip,
+            exclude=["molecule_hash", "molecular_formula"],
+            raw_msgpack=raw_msgpack,
         )
 
         meta["success"] = True
@@ -748,10 +1109,51 @@ class SQLAlchemySocket:
         data = []
         for mol_dict in rdata:
             mol_dict = {k: v for k, v in mol_dict.items() if v is not None}
-            data.append(Molecule(**mol_dict, validate=False, validated=True))
+            if raw_msgpack:
+                # The fields a Molecule built below serializes to, with the arrays still encoded
+                data.append({**mol_dict, "validated": True})
+            else:
+                data.append(Molecule(**mol_dict, validate=False, validated=True))
 
         return {"meta": meta, "data": data}
 
+    def get_molecule_geometries(self, id: List[str]) -> Dict[str, Any]:
+        """
+        Pulls only the geometries of molecules, without building full Molecule objects.
+
+        Parameters
+        ----------
+        id : List[str]
+            The ids of the molecules.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The (natom, 3) geometry array of each found molecule keyed by the molecule id.
+        """
+
+        geometries = {}
+        missing = []
+        for mol_id in {int(x) for x in id}:
+            geometry = self._geometry_cache.get(mol_id)
+            if geometry is None:
+                missing.append(mol_id)
+            else:
+                geometries[str(mol_id)] = geometry
+
+        if missing:
+            with self.session_scope() as session:
+                rows = session.query(MoleculeORM.id, MoleculeORM.geometry).filter(MoleculeORM.id.in_(missing)).all()
+
+            for mol_id, geometry in rows:
+                geometry = np.array(geometry, dtype=float).reshape(-1, 3)
+                geometry.flags.writeable = False
+                self._geometry_cache.put(mol_id, geometry)
+                geometries[str(mol_id)] = geometry
+
+        # Callers get their own arrays, the cached ones are shared
+        return {mol_id: geometry.copy() for mol_id, geometry in geometries.items()}
+
     def del_molecules(self, id: List[str] = None, molecule_hash: List[str] = None):
         """
         Removes a molecule from the database from its hash.
@@ -772,6 +1174,9 @@ class SQLAlchemySocket:
         with self.session_scope() as session:
             ret = session.query(MoleculeORM).filter(*query).delete(synchronize_session=False)
 
+        # Deleted ids are not known when deleting by hash
+        self._geometry_cache.clear()
+
         return ret
 
     # ~~~~~~~~~~~~~~~~~~~~~~~ Keywords ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -1135,24 +1540,24 @@ class SQLAlchemySocket:
             Data is the ids of the inserted/updated/existing docs
         """
         meta = add_metadata_template()
+
+        if not record_list:
+            meta["success"] = True
+            return {"data": [], "meta": meta}
+
         # putting the placeholder for all the ids, since some can be duplicate, and some will only have ids after add operation.
         result_ids = ["placeholder"] * len(record_list)
 
         results_list = []
         existing_res = {}
         new_record_idx, duplicates_idx = [], []
-        conds = []
-        # creating condition for a multi-value select
+
+        # Single lookup for duplicates, narrowed to the molecules/programs/methods of the input.
+        # The exact match on all keys (including null basis/keywords) is done against existing_res below.
         conds = [
-            (
-                ResultORM.program == res.program,
-                ResultORM.driver == res.driver,
-                ResultORM.method == res.method,
-                ResultORM.basis == res.basis,
-                ResultORM.keywords == res.keywords,
-                ResultORM.molecule == res.molecule,
-            )
-            for res in results_list
+            ResultORM.molecule.in_(list({int(res.molecule) for res in record_list})),
+            ResultORM.program.in_(list({res.program for res in record_list})),
+            ResultORM.method.in_(list({res.method for res in record_list})),
         ]
 
         with self.session_scope() as session:
@@ -1166,7 +1571,7 @@ class SQLAlchemySocket:
                     ResultORM.molecule,
                     ResultORM.id,
                 )
-                .filter(or_(*conds))
+                .filter(*conds)
                 .all()
             )
             # adding all the found items to a dictionary
@@ -1198,8 +1603,9 @@ class SQLAlchemySocket:
                     duplicates_idx.append(i)
                     meta["duplicates"].append(doc)
 
+            # flush (not commit) so the new ids can be read without reloading every object
             session.add_all(results_list)
-            session.commit()
+            session.flush()
             meta["duplicates"] = [str(doc.id) for doc in meta["duplicates"]]
 
             for i, idx in enumerate(new_record_idx):
@@ -1264,6 +1670,7 @@ class SQLAlchemySocket:
             if not duplicates:
                 session.commit()
 
+        self._invalidate_record_cache(query_ids)
         return updated_count
 
     def get_results_count(self):
@@ -1291,6 +1698,9 @@ class SQLAlchemySocket:
         exclude: Optional[List[str]] = None,
         limit: int = None,
         skip: int = 0,
+        after_id: Optional[str] = None,
+        count: bool = True,
+        raw_msgpack: bool = False,
         return_json=True,
         with_ids=True,
     ):
@@ -1324,6 +1734,14 @@ class SQLAlchemySocket:
             (This is to avoid overloading the server)
         skip : int, default is 0
             skip the first 'skip' results. Used to paginate
+        after_id : str, default is None
+            Only return results with an id greater than 'after_id', ordered by id.
+            Used to paginate with a cursor, pass the last id of the previous page
+        count : bool, default is True
+            Count the total number of matching results, n_found is None if False
+        raw_msgpack : bool, default is False
+            Return msgpack-ext columns (e.g. return_result, extras) as undecoded MsgpackExtRaw bytes
+            which msgpack-ext responses can pass through as is
         return_json : bool, default is True
             Return the results as a list of json inseated of objects
         with_ids : bool, default is True
@@ -1357,8 +1775,16 @@ class SQLAlchemySocket:
             status=status,
         )
 
-        data, meta["n_found"] = self.get_query_projection(
-            ResultORM, query, include=include, exclude=exclude, limit=limit, skip=skip
+        data, meta["n_found"] = self._get_cached_projection(
+            ResultORM,
+            query,
+            include=include,
+            exclude=exclude,
+            limit=limit,
+            skip=skip,
+            after_id=after_id,
+            count=count,
+            raw_msgpack=raw_msgpack,
         )
         meta["success"] = True
 
@@ -1392,7 +1818,7 @@ class SQLAlchemySocket:
                 .filter(TaskQueueORM.id.in_(task_id_list))
             )
             meta["n_found"] = get_count_fast(data)
-            data = [d.to_dict() for d in data.all()]
+            data = [d.to_dict() for d in data.options(undefer_group("msgpack")).all()]
             meta["success"] = True
             # except Exception as err:
             #     meta['error_description'] = str(err)
@@ -1423,6 +1849,7 @@ class SQLAlchemySocket:
             session.commit()
             count = len(results)
 
+        self._invalidate_record_cache(ids)
         return count
 
     def add_wavefunction_store(self, blobs_list: List[Dict[str, Any]]):
@@ -1441,19 +1868,12 @@ class SQLAlchemySocket:
         """
 
         meta = add_metadata_template()
-        blob_ids = []
+        new_blobs = [blob for blob in blobs_list if blob is not None]
         with self.session_scope() as session:
-            for blob in blobs_list:
-                if blob is None:
-                    blob_ids.append(None)
-                    continue
-
-                doc = WavefunctionStoreORM(**blob)
-                session.add(doc)
-                session.commit()
-                blob_ids.append(str(doc.id))
-                meta["n_inserted"] += 1
+            new_ids = iter(self._insert_many(session, WavefunctionStoreORM, new_blobs))
 
+        blob_ids = [None if blob is None else str(next(new_ids)) for blob in blobs_list]
+        meta["n_inserted"] = sum(x is not None for x in blob_ids)
         meta["success"] = True
 
         return {"data": blob_ids, "meta": meta}
@@ -1465,6 +1885,7 @@ class SQLAlchemySocket:
         exclude: Optional[List[str]] = None,
         limit: int = None,
         skip: int = 0,
+        raw_msgpack: bool = False,
     ):
         """
         Pulls from the wavefunction key/value store table.
@@ -1479,6 +1900,8 @@ class SQLAlchemySocket:
             Maximum number of results to return.
         skip : int, optional
             skip the `skip` results
+        raw_msgpack : bool, default is False
+            Return the msgpack-ext columns (e.g. basis, scf_orbitals_a) as undecoded MsgpackExtRaw bytes
 
         Returns
         -------
@@ -1490,7 +1913,13 @@ class SQLAlchemySocket:
 
         query = format_query(WavefunctionStoreORM, id=id)
         rdata, meta["n_found"] = self.get_query_projection(
-            WavefunctionStoreORM, query, limit=limit, skip=skip, include=include, exclude=exclude
+            WavefunctionStoreORM,
+            query,
+            limit=limit,
+            skip=skip,
+            include=include,
+            exclude=exclude,
+            raw_msgpack=raw_msgpack,
         )
 
         meta["success"] = True
@@ -1529,22 +1958,40 @@ class SQLAlchemySocket:
 
         procedure_ids = []
         with self.session_scope() as session:
-            for procedure in record_list:
-                doc = session.query(procedure_class).filter_by(hash_index=procedure.hash_index)
+            # Single lookup of all hash indices, duplicates within the input are found in `existing`
+            hash_indices = list({procedure.hash_index for procedure in record_list})
+            found = (
+                session.query(procedure_class.hash_index, procedure_class.id)
+                .filter(procedure_class.hash_index.in_(hash_indices))
+                .order_by(procedure_class.id)
+            )
+            existing = {}
+            for hash_index, proc_id in found:
+                existing.setdefault(hash_index, proc_id)
 
-                if get_count_fast(doc) == 0:
+            new_procedures = []
+            for procedure in record_list:
+                if procedure.hash_index in existing:
+                    procedure_ids.append(existing[procedure.hash_index])
+                    meta["duplicates"].append(existing[procedure.hash_index])  # TODO
+                else:
                     data = procedure.dict(exclude={"id"})
                     proc_db = procedure_class(**data)
-                    session.add(proc_db)
-                    session.commit()
-                    proc_db.update_relations(**data)
-                    session.commit()
-                    procedure_ids.append(str(proc_db.id))
+                    new_procedures.append((proc_db, data))
+                    existing[procedure.hash_index] = proc_db
+                    procedure_ids.append(proc_db)
                     meta["n_inserted"] += 1
-                else:
-                    id = str(doc.first().id)
-                    meta["duplicates"].append(id)  # TODO
-                    procedure_ids.append(id)
+
+            # Insert all new procedures at once, ids are only known after the flush
+            session.add_all([proc_db for proc_db, _ in new_procedures])
+            session.flush()
+            procedure_ids = [str(x.id) if isinstance(x, procedure_class) else str(x) for x in procedure_ids]
+            meta["duplicates"] = [str(x.id) if isinstance(x, procedure_class) else str(x) for x in meta["duplicates"]]
+
+            for proc_db, data in new_procedures:
+                proc_db.update_relations(**data)
+            session.commit()
+
         meta["success"] = True
 
         ret = {"data": procedure_ids, "meta": meta}
@@ -1563,6 +2010,8 @@ class SQLAlchemySocket:
         exclude=None,
         limit: int = None,
         skip: int = 0,
+        after_id: Optional[str] = None,
+        count: bool = True,
         return_json=True,
         with_ids=True,
     ):
@@ -1588,6 +2037,11 @@ class SQLAlchemySocket:
             (This is to avoid overloading the server)
         skip : int, default is 0
             skip the first 'skip' resaults. Used to paginate
+        after_id : str, default is None
+            Only return procedures with an id greater than 'after_id', ordered by id.
+            Used to paginate with a cursor, pass the last id of the previous page
+        count : bool, default is True
+            Count the total number of matching procedures, n_found is None if False
         return_json : bool, deafult is True
             Return the results as a list of json inseated of objects
         with_ids : bool, default is True
@@ -1634,8 +2088,15 @@ class SQLAlchemySocket:
         try:
             # TODO: decide a way to find the right type
 
-            data, meta["n_found"] = self.get_query_projection(
-                className, query, limit=limit, skip=skip, include=include, exclude=exclude
+            data, meta["n_found"] = self._get_cached_projection(
+                className,
+                query,
+                limit=limit,
+                skip=skip,
+                include=include,
+                exclude=exclude,
+                after_id=after_id,
+                count=count,
             )
             meta["success"] = True
         except Exception as err:
@@ -1648,44 +2109,38 @@ class SQLAlchemySocket:
         TODO: needs to be of specific type
         """
 
-        updated_count = 0
-        with self.session_scope() as session:
-            for procedure in records_list:
-
-                className = get_procedure_class(procedure)
-                # join_table = get_procedure_join(procedure)
-                # Must have ID
-                if procedure.id is None:
-                    self.logger.error(
-                        "No procedure id found on update (hash_index={}), skipping.".format(procedure.hash_index)
-                    )
-                    continue
+        # Group by procedure type so each type is loaded with a single query
+        by_class = {}
+        for procedure in records_list:
+            # Must have ID
+            if procedure.id is None:
+                self.logger.error(
+                    "No procedure id found on update (hash_index={}), skipping.".format(procedure.hash_index)
+                )
+                continue
 
-                proc_db = session.query(className).filter_by(id=procedure.id).first()
+            by_class.setdefault(get_procedure_class(procedure), []).append(procedure)
 
-                data = procedure.dict(exclude={"id"})
-                proc_db.update_relations(**data)
+        updated_count = 0
+        with self.session_scope() as session:
+            for className, procedures in by_class.items():
+                ids = [int(procedure.id) for procedure in procedures]
+                proc_dbs = {x.id: x for x in session.query(className).filter(className.id.in_(ids)).all()}
 
-                for attr, val in data.items():
-                    setattr(proc_db, attr, val)
+                for procedure in procedures:
+                    proc_db = proc_dbs[int(procedure.id)]
 
-                # session.add(proc_db)
+                    data = procedure.dict(exclude={"id"})
+                    proc_db.update_relations(**data)
 
-                # Upsert relations (insert or update)
-                # needs primarykeyconstraint on the table keys
-                # for result_id in procedure.trajectory:
-                #     statement = postgres_insert(opt_result_association)\
-                #         .values(opt_id=procedure.id, result_id=result_id)\
-                #         .on_conflict_do_update(
-                #             index_elements=[opt_result_association.c.opt_id, opt_result_association.c.result_id],
-                #             set_=dict(result_id=result_id))
-                #     session.execute(statement)
+                    for attr, val in data.items():
+                        setattr(proc_db, attr, val)
 
-                session.commit()
-                updated_count += 1
+                    updated_count += 1
 
-        # session.commit()  # save changes, takes care of inheritance
+            session.commit()
 
+        self._invalidate_record_cache([procedure.id for procs in by_class.values() for procedure in procs])
         return updated_count
 
     def del_procedures(self, ids: List[str]):
@@ -1721,6 +2176,7 @@ class SQLAlchemySocket:
             # session.commit()
             count = len(procedures)
 
+        self._invalidate_record_cache(ids)
         return count
 
     def add_services(self, service_list: List["BaseService"]):
@@ -1781,6 +2237,7 @@ class SQLAlchemySocket:
         procedure_id: Union[List[str], str] = None,
         hash_index: Union[List[str], str] = None,
         status: str = None,
+        ready: bool = False,
         limit: int = None,
         skip: int = 0,
         return_json=True,
@@ -1791,6 +2248,9 @@ class SQLAlchemySocket:
         ----------
         id / hash_index : List of str or str
             service id / hash_index that ran the results
+        ready : bool, default is False
+            Only return services which have no required procedure left that is still
+            incomplete or running, i.e. services that can be iterated right away
         projection : list/set/tuple of keys, default is None
             The fields to return, default to return all
         limit : int, default is None
@@ -1812,18 +2272,28 @@ class SQLAlchemySocket:
         meta = get_metadata_template()
         query = format_query(ServiceQueueORM, id=id, hash_index=hash_index, procedure_id=procedure_id, status=status)
 
+        if ready:
+            # Services waiting on a procedure which has not yet finished
+            pending = (
+                exists()
+                .where(ServiceQueueTasks.service_id == ServiceQueueORM.id)
+                .where(ServiceQueueTasks.procedure_id == BaseResultORM.id)
+                .where(BaseResultORM.status.notin_([RecordStatusEnum.complete, RecordStatusEnum.error]))
+            )
+            query.append(~pending)
+
         with self.session_scope() as session:
+            data = session.query(ServiceQueueORM).filter(*query)
+            meta["n_found"] = get_count_fast(data)
+
             data = (
-                session.query(ServiceQueueORM)
-                .filter(*query)
-                .order_by(ServiceQueueORM.priority.desc(), ServiceQueueORM.created_on)
+                data.order_by(ServiceQueueORM.priority.desc(), ServiceQueueORM.created_on)
                 .limit(limit)
                 .offset(skip)
                 .all()
             )
             data = [x.to_dict() for x in data]
 
-        meta["n_found"] = len(data)
         meta["success"] = True
 
         # except Exception as err:
@@ -1847,31 +2317,55 @@ class SQLAlchemySocket:
             if operation is succesful
         """
 
-        updated_count = 0
+        services = {}
         for service in records_list:
             if service.id is None:
                 self.logger.error("No service id found on update (hash_index={}), skipping.".format(service.hash_index))
                 continue
 
-            with self.session_scope() as session:
+            services[int(service.id)] = service
 
-                doc_db = session.query(ServiceQueueORM).filter_by(id=service.id).first()
+        if len(services) == 0:
+            return 0
 
-                data = service.dict(include=set(ServiceQueueORM.__dict__.keys()))
-                data["extra"] = service.dict(exclude=set(ServiceQueueORM.__dict__.keys()))
+        # Load and write all services in a single transaction
+        orm_keys = set(ServiceQueueORM.__dict__.keys())
+        with self.session_scope() as session:
+            docs = session.query(ServiceQueueORM).filter(ServiceQueueORM.id.in_(list(services))).all()
+
+            for doc_db in docs:
+                service = services[doc_db.id]
+
+                data = service.dict(include=orm_keys)
+                data["extra"] = service.dict(exclude=orm_keys)
 
                 data["id"] = int(data["id"])
                 for attr, val in data.items():
                     setattr(doc_db, attr, val)
 
-                session.add(doc_db)
-                session.commit()
+            # Rebuild the index of the procedures each service is waiting on
+            service_ids = [doc_db.id for doc_db in docs]
+            session.query(ServiceQueueTasks).filter(ServiceQueueTasks.service_id.in_(service_ids)).delete(
+                synchronize_session=False
+            )
+            task_rows = {
+                (sid, int(pid)) for sid in service_ids for pid in services[sid].task_manager.required_tasks.values()
+            }
+            if task_rows:
+                session.bulk_insert_mappings(
+                    ServiceQueueTasks, [{"service_id": sid, "procedure_id": pid} for sid, pid in task_rows]
+                )
+
+            session.commit()
+            updated_count = len(docs)
 
+        procedures = []
+        for service in services.values():
             procedure = service.output
             procedure.__dict__["id"] = service.procedure_id
-            self.update_procedures([procedure])
+            procedures.append(procedure)
 
-            updated_count += 1
+        self.update_procedures(procedures)
 
         return updated_count
 
@@ -1887,22 +2381,29 @@ class SQLAlchemySocket:
 
             query = format_query(ServiceQueueORM, id=id, procedure_id=procedure_id)
 
-            # Update the service
-            service = session.query(ServiceQueueORM).filter(*query).first()
-            service.status = status
+            # Update the services
+            services = session.query(ServiceQueueORM).filter(*query).all()
+            for service in services:
+                service.status = status
+            procedure_ids = [service.procedure_id for service in services]
 
-            # Update the procedure
+            # Update the procedures
             if status == "waiting":
                 status = "incomplete"
-            session.query(BaseResultORM).filter(BaseResultORM.id == service.procedure_id).update({"status": status})
+            session.query(BaseResultORM).filter(BaseResultORM.id.in_(procedure_ids)).update(
+                {"status": status}, synchronize_session=False
+            )
 
             session.commit()
 
-        return 1
+        self._invalidate_record_cache(procedure_ids)
+
+        return len(services)
 
     def services_completed(self, records_list: List["BaseService"]) -> int:
 
-        done = 0
+        ids = []
+        procedures = []
         for service in records_list:
             if service.id is None:
                 self.logger.error(
@@ -1910,18 +2411,20 @@ class SQLAlchemySocket:
                 )
                 continue
 
-            # in one transaction
-            with self.session_scope() as session:
+            procedure = service.output
+            procedure.__dict__["id"] = service.procedure_id
+            procedures.append(procedure)
+            ids.append(int(service.id))
 
-                procedure = service.output
-                procedure.__dict__["id"] = service.procedure_id
-                self.update_procedures([procedure])
+        if len(ids) == 0:
+            return 0
 
-                session.query(ServiceQueueORM).filter_by(id=service.id).delete()  # synchronize_session=False)
+        self.update_procedures(procedures)
 
-            done += 1
+        with self.session_scope() as session:
+            session.query(ServiceQueueORM).filter(ServiceQueueORM.id.in_(ids)).delete(synchronize_session=False)
 
-        return done
+        return len(ids)
 
     ### Mongo queue handling functions
 
@@ -2010,48 +2513,73 @@ class SQLAlchemySocket:
         ret = {"data": results, "meta": meta}
         return ret
 
-    def queue_get_next(
-        self, manager, available_programs, available_procedures, limit=100, tag=None, as_json=True
-    ) -> List[TaskRecord]:
-        """Done in a transaction"""
+    def _queue_next_query(self, available_programs, available_procedures, limit=100, tag=None):
+        """Builds the SELECT returning the next waiting tasks as (id, tag_rank, priority, created_on) rows.
+
+        All tags are searched in a single ``UNION ALL`` query. Each branch walks the
+        partial ``WAITING`` index for its tag in (priority, created_on) order, and the
+        branches follow the position of the tag in ``tag`` so that earlier tags are
+        always served first. Candidate rows are locked with ``FOR UPDATE SKIP LOCKED``.
+
+        The outer query has a LIMIT but no ORDER BY: PostgreSQL then runs the branches
+        one after the other and stops as soon as ``limit`` rows are found, so later
+        branches lock no rows. An outer ORDER BY would run every branch to completion
+        and keep up to ``len(tag) * limit`` rows locked until commit, hiding free tasks
+        from concurrent claimers. The caller sorts the rows into claim order.
+        """
 
         # Figure out query, tagless has no requirements
 
         proc_filt = TaskQueueORM.procedure.in_([p.lower() for p in available_procedures])
         none_filt = TaskQueueORM.procedure == None  # lgtm [py/test-equals-none]
 
-        order_by = []
-        if tag is not None:
-            if isinstance(tag, str):
-                tag = [tag]
-            # task_order = expression_case([(TaskQueueORM.tag == t, num) for num, t in enumerate(tag)])
-            # order_by.append(task_order)
-
-        order_by.extend([TaskQueueORM.priority.desc(), TaskQueueORM.created_on])
-        queries = []
-        if tag is not None:
-            for t in tag:
-                query = format_query(TaskQueueORM, status=TaskStatusEnum.waiting, program=available_programs, tag=t)
-                query.append(or_(proc_filt, none_filt))
-                queries.append(query)
-        else:
-            query = format_query(TaskQueueORM, status=TaskStatusEnum.waiting, program=available_programs)
-            query.append((or_(proc_filt, none_filt)))
-            queries.append(query)
-        new_limit = limit
-        ids = []
-        found = []
+        if tag is None:
+            tag = [None]
+        elif isinstance(tag, str):
+            tag = [tag]
+
+        branches = []
+        for rank, t in enumerate(tag):
+            query = format_query(TaskQueueORM, status=TaskStatusEnum.waiting, program=available_programs, tag=t)
+            query.append(or_(proc_filt, none_filt))
+            branch = (
+                select(
+                    [TaskQueueORM.id, TaskQueueORM.priority, TaskQueueORM.created_on, literal(rank).label("tag_rank")]
+                )
+                .where(and_(*query))
+                .order_by(TaskQueueORM.priority.desc(), TaskQueueORM.created_on)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .alias(f"tag_{rank}")
+            )
+            branches.append(select([branch]))
+
+        next_tasks = union_all(*branches).alias("next_tasks")
+        columns = [next_tasks.c.id, next_tasks.c.tag_rank, next_tasks.c.priority, next_tasks.c.created_on]
+        return select(columns).limit(limit)
+
+    def queue_get_next(
+        self, manager, available_programs, available_procedures, limit=100, tag=None, as_json=True
+    ) -> List[TaskRecord]:
+        """Claim the next set of waiting tasks for a manager. Done in a single transaction.
+
+        Candidate rows are selected with ``SELECT ... FOR UPDATE SKIP LOCKED`` so that
+        concurrent managers never claim the same task: rows locked by another claimer
+        are skipped rather than waited on, and the lock is held until the status
+        update below is committed.
+        """
+
+        claim_query = self._queue_next_query(available_programs, available_procedures, limit=limit, tag=tag)
+
         with self.session_scope() as session:
-            for q in queries:
-                if new_limit == 0:
-                    break
-                query = session.query(TaskQueueORM).filter(*q).order_by(*order_by).limit(new_limit)
-                # from sqlalchemy.dialects import postgresql
-                # print(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
-                new_items = query.all()
-                found.extend(new_items)
-                new_limit = limit - len(new_items)
-                ids.extend([x.id for x in new_items])
+            rows = sorted(session.execute(claim_query), key=lambda row: (row[1], -row[2], row[3]))
+            ids = [row[0] for row in rows]
+
+            found = []
+            if ids:
+                found_map = {task.id: task for task in session.query(TaskQueueORM).filter(TaskQueueORM.id.in_(ids))}
+                found = [found_map[i] for i in ids if i in found_map]
+
             update_fields = {"status": TaskStatusEnum.running, "modified_on": dt.utcnow(), "manager": manager}
             # # Bulk update operation in SQL
             update_count = (
@@ -2579,6 +3107,9 @@ class SQLAlchemySocket:
                     success = False
                     session.rollback()
 
+        if overwrite:
+            self._invalidate_auth_cache(username)
+
         return success, password
 
     def verify_user(self, username: str, password: str, permission: str) -> Tuple[bool, str]:
@@ -2617,31 +3148,65 @@ class SQLAlchemySocket:
         if self._bypass_security or (self._allow_read and (permission == "read")):
             return (True, "Success")
 
-        with self.session_scope() as session:
-            data = session.query(UserORM).filter_by(username=username).first()
+        cache_key = self._auth_cache_key(username, password)
+        cached = None if cache_key is None else self._auth_cache.get(cache_key)
+        generation = self._auth_cache_generation.get(username, 0)
 
-            if data is None:
-                return (False, "User not found.")
+        if cached is not None:
+            permissions = cached[1]
+        else:
+            with self.session_scope() as session:
+                data = session.query(UserORM).filter_by(username=username).first()
 
-            # Completely general failure
-            try:
-                pwcheck = bcrypt.checkpw(password.encode("UTF-8"), data.password)
-            except Exception as e:
-                self.logger.warning(f"Password check failure, error: {str(e)}")
-                self.logger.warning(
-                    f"Error likely caused by encryption salt mismatch, potentially fixed by creating a new password for user {username}."
-                )
-                return (False, "Password decryption failure, please contact your database administrator.")
+                if data is None:
+                    return (False, "User not found.")
+
+                # Completely general failure
+                try:
+                    pwcheck = bcrypt.checkpw(password.encode("UTF-8"), data.password)
+                except Exception as e:
+                    self.logger.warning(f"Password check failure, error: {str(e)}")
+                    self.logger.warning(
+                        f"Error likely caused by encryption salt mismatch, potentially fixed by creating a new password for user {username}."
+                    )
+                    return (False, "Password decryption failure, please contact your database administrator.")
 
-            if pwcheck is False:
-                return (False, "Incorrect password.")
+                if pwcheck is False:
+                    return (False, "Incorrect password.")
 
-            # Admin has access to everything
-            if (permission.lower() not in data.permissions) and ("admin" not in data.permissions):
-                return (False, "User has insufficient permissions.")
+                permissions = list(data.permissions)
+
+            if cache_key is not None:
+                self._auth_cache.put(cache_key, (username, permissions))
+
+                # The user changed while it was being verified, the row read may be stale
+                if generation != self._auth_cache_generation.get(username, 0):
+                    self._auth_cache.pop(cache_key)
+
+        # Admin has access to everything
+        if (permission.lower() not in permissions) and ("admin" not in permissions):
+            return (False, "User has insufficient permissions.")
 
         return (True, "Success")
 
+    def _auth_cache_key(self, username: Optional[str], password: Optional[str]) -> Optional[bytes]:
+        """Returns the key of the verified-credentials cache, or None if the credentials cannot be cached."""
+
+        if (self._auth_cache is None) or not isinstance(username, str) or not isinstance(password, str):
+            return None
+
+        msg = username.encode("UTF-8") + b"\0" + password.encode("UTF-8")
+        return hmac.new(self._auth_cache_secret, msg, hashlib.sha256).digest()
+
+    def _invalidate_auth_cache(self, username: str) -> None:
+        """Drops all cached verifications of a user, must be called whenever a user changes."""
+
+        if self._auth_cache is None:
+            return
+
+        self._auth_cache_generation[username] = self._auth_cache_generation.get(username, 0) + 1
+        self._auth_cache.invalidate(lambda key, value: value[0] == username)
+
     def modify_user(
         self,
         username: str,
@@ -2695,6 +3260,8 @@ class SQLAlchemySocket:
             count = session.query(UserORM).filter_by(username=username).update(blob)
             success = count == 1
 
+        self._invalidate_auth_cache(username)
+
         if success:
             return True, None if password is None else f"New password is {password}"
         else:
@@ -2717,6 +3284,8 @@ class SQLAlchemySocket:
         with self.session_scope() as session:
             count = session.query(UserORM).filter_by(username=username).delete(synchronize_session=False)
 
+        self._invalidate_auth_cache(username)
+
         return count == 1
 
     def get_user_permissions(self, username: str) -> Optional[List[str]]:
@@ -1,23 +1,27 @@
 import io
 import pathlib
-from typing import Any, Dict, Union
+from typing import Any, Dict, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from qcelemental.util.serialization import serialize
 
 from ..interface.collections import HDF5View
+from ..interface.collections.dataset_view import HDF5FilePool
 
 
 class ViewHandler:
-    def __init__(self, path: Union[str, pathlib.Path]) -> None:
+    def __init__(self, path: Union[str, pathlib.Path], max_open_files: int = 32) -> None:
         """
         Parameters
         ----------
         path: Union[str, Path]
             Directory containing dataset views
+        max_open_files: int
+            Maximum number of view files kept open between requests
         """
-        self._view_cache: Dict[int, HDF5View] = {}
+        self._file_pool = HDF5FilePool(maxsize=max_open_files)
+        self._view_cache: Dict[int, Tuple[Tuple[int, int, int], HDF5View]] = {}
         self._path = pathlib.Path(path)
         if not self._path.is_dir():
             raise ValueError(f"Path in ViewHandler must be a directory, got: {self._path}")
@@ -57,11 +61,24 @@ class ViewHandler:
         return self.view_path(collection_id).is_file()
 
     def _get_view(self, collection_id: int):
-        if collection_id not in self._view_cache:
-            if not self.view_exists(collection_id):
-                raise IOError
-            self._view_cache[collection_id] = HDF5View(self.view_path(collection_id))
-        return self._view_cache[collection_id]
+        path = self.view_path(collection_id)
+        try:
+            stat = HDF5FilePool.file_stat(path)
+        except FileNotFoundError:
+            self._view_cache.pop(collection_id, None)
+            raise IOError
+
+        # Views cache their index, so a view which has been regenerated is loaded again
+        cached = self._view_cache.get(collection_id)
+        if (cached is None) or (cached[0] != stat):
+            cached = (stat, HDF5View(path, file_pool=self._file_pool))
+            self._view_cache[collection_id] = cached
+        return cached[1]
+
+    def close(self) -> None:
+        """Closes all open view files"""
+        self._view_cache.clear()
+        self._file_pool.close()
 
     def handle_request(self, collection_id: int, request: str, model: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -35,6 +35,107 @@ def test_client_molecule(test_server, encoding):
     assert len(get_mol)
 
 
+@pytest.mark.parametrize("encoding", valid_encodings)
+def test_client_iter_molecules(test_server, encoding):
+
+    client = ptl.FractalClient(test_server)
+    client._set_encoding(encoding)
+
+    mols = []
+    for x in range(3):
+        water = ptl.data.get_molecule("water_dimer_minima.psimol")
+        water.geometry[:] += np.random.random(water.geometry.shape)
+        mols.append(water)
+
+    ret = client.add_molecules(mols)
+
+    # Streamed records match the single response records
+    streamed = list(client.iter_molecules(id=ret))
+    queried = client.query_molecules(id=ret)
+    assert len(streamed) == 3
+    assert {m.id for m in streamed} == set(ret)
+    assert {m.get_hash() for m in streamed} == {m.get_hash() for m in queried}
+
+    assert len(list(client.iter_molecules(id=ret, limit=2))) == 2
+
+
+def _add_iter_molecules(client, n):
+    mols = [
+        ptl.Molecule(symbols=["He", "He"], geometry=np.random.rand(2, 3) + 10 * x, validated=True) for x in range(n)
+    ]
+    return client.add_molecules(mols)
+
+
+@pytest.mark.parametrize("encoding", valid_encodings)
+def test_client_iter_results(test_server, encoding):
+
+    client = ptl.FractalClient(test_server)
+    client._set_encoding(encoding)
+
+    results = [
+        ptl.models.ResultRecord(
+            version="1",
+            driver="gradient",
+            program="iter_results",
+            molecule=mol_id,
+            method="hf",
+            basis="sto-3g",
+            return_result=np.random.rand(2, 3),
+            status="COMPLETE",
+        )
+        for mol_id in _add_iter_molecules(client, 3)
+    ]
+    ret = test_server.storage.add_results(results)["data"]
+
+    # Streamed records match the single response records
+    streamed = list(client.iter_results(id=ret))
+    queried = client.query_results(id=ret)
+    assert len(streamed) == 3
+    assert {r.id for r in streamed} == set(ret)
+    queried = {r.id: r for r in queried}
+    for record in streamed:
+        assert np.allclose(record.return_result, queried[record.id].return_result)
+
+    assert len(list(client.iter_results(id=ret, limit=2))) == 2
+
+    streamed = list(client.iter_results(id=ret, include=["id", "molecule"]))
+    assert {r["id"] for r in streamed} == set(ret)
+    assert all(set(r) == {"id", "molecule"} for r in streamed)
+
+
+@pytest.mark.parametrize("encoding", valid_encodings)
+def test_client_iter_procedures(test_server, encoding):
+
+    client = ptl.FractalClient(test_server)
+    client._set_encoding(encoding)
+
+    qc_spec = {"driver": "gradient", "method": "HF", "basis": "sto-3g", "keywords": None, "program": "psi4"}
+    procedures = [
+        ptl.models.OptimizationRecord(
+            initial_molecule=mol_id,
+            program="geometric",
+            qc_spec=qc_spec,
+            hash_index=f"iter_procedures_{encoding}_{mol_id}",
+            status="COMPLETE",
+        )
+        for mol_id in _add_iter_molecules(client, 3)
+    ]
+    ret = test_server.storage.add_procedures(procedures)["data"]
+
+    # Streamed records match the single response records
+    streamed = list(client.iter_procedures(id=ret))
+    queried = client.query_procedures(id=ret)
+    assert len(streamed) == 3
+    assert {p.id for p in streamed} == set(ret)
+    assert {p.id: p.initial_molecule for p in streamed} == {p.id: p.initial_molecule for p in queried}
+    assert all(isinstance(p, ptl.models.OptimizationRecord) for p in streamed)
+
+    assert len(list(client.iter_procedures(id=ret, limit=2))) == 2
+
+    streamed = list(client.iter_procedures(id=ret, include=["id", "hash_index"]))
+    assert {p["hash_index"] for p in streamed} == {p.hash_index for p in procedures}
+
+
 @pytest.mark.parametrize("encoding", valid_encodings)
 def test_client_keywords(test_server, encoding):
 
@@ -2,6 +2,7 @@
 Tests the server collection compute capabilities.
 """
 import itertools
+import os
 import pathlib
 from contextlib import contextmanager
 from typing import List
@@ -213,6 +214,76 @@ def test_gradient_dataset_get_values(gradient_dataset_fixture):
         ds.get_values(name="HF/sto-3g", basis="sto-3g")
 
 
+def test_gradient_dataset_write_incremental(gradient_dataset_fixture, tmp_path):
+    client, ds = gradient_dataset_fixture
+
+    full = ptl.collections.HDF5View(tmp_path / "full.hdf5")
+    full.write(ds)
+
+    view = ptl.collections.HDF5View(tmp_path / "incremental.hdf5")
+    view.write(ds, incremental=True, max_workers=2)
+
+    # Nothing is missing from the view, so no records or molecules are fetched again
+    with check_requests_monitor(client, "result", request_made=False):
+        with check_requests_monitor(client, "molecule", request_made=False):
+            view.write(ds, incremental=True, max_workers=2)
+
+    queries = [{"name": name, "driver": "gradient", "native": True} for name in ["HF/sto-3g", "HF/3-21g"]]
+    expected, _ = full.get_values(queries)
+    values, _ = view.get_values(queries)
+    for name in ["HF/sto-3g", "HF/3-21g"]:
+        for a, b in zip(expected[name], values[name]):
+            assert np.allclose(a, b)
+
+    assert set(view.get_molecules([0, 1]).index) == {0, 1}
+
+    # The molecule ids are stored on their own for the next incremental write
+    h5py = pytest.importorskip("h5py")
+    with h5py.File(tmp_path / "incremental.hdf5", "r") as f:
+        mol_ids = view._decode_strings(f["molecule/id"][()])
+    assert mol_ids == [molecule.id for molecule in view.get_molecules([0, 1])]
+
+
+def test_gradient_dataset_write_incremental_disjoint(gradient_dataset_fixture, tmp_path):
+    h5py = pytest.importorskip("h5py")
+    client, ds = gradient_dataset_fixture
+
+    full = ptl.collections.HDF5View(tmp_path / "full.hdf5")
+    full.write(ds)
+
+    view = ptl.collections.HDF5View(tmp_path / "incremental.hdf5")
+    view.write(ds)
+
+    # None of the entries of the existing view are entries of the dataset, all values are fetched again
+    with h5py.File(tmp_path / "incremental.hdf5", "a") as f:
+        f["entry/entry"][...] = np.array([f"Old{i}" for i in range(len(f["entry/entry"]))], dtype=object)
+    with check_requests_monitor(client, "result", request_made=True):
+        view.write(ds, incremental=True, max_workers=2)
+
+    queries = [{"name": name, "driver": "gradient", "native": True} for name in ["HF/sto-3g", "HF/3-21g"]]
+    expected, _ = full.get_values(queries)
+    values, _ = view.get_values(queries)
+    for name in ["HF/sto-3g", "HF/3-21g"]:
+        for a, b in zip(expected[name], values[name]):
+            assert np.allclose(a, b)
+
+
+def test_gradient_dataset_molecule_arrays(gradient_dataset_fixture, tmp_path):
+    client, ds = gradient_dataset_fixture
+
+    view = ptl.collections.HDF5View(tmp_path / "molecules.hdf5")
+    view.write(ds)
+
+    indexes = [1, 0, 1]
+    molecules = view.get_molecules(indexes)
+    geometries, symbols = view.get_molecule_arrays(indexes)
+    assert len(geometries) == len(symbols) == 3
+    for molecule, geometry, symbol in zip(molecules, geometries, symbols):
+        assert geometry.shape == (len(molecule.symbols), 3)
+        assert np.allclose(molecule.geometry, geometry)
+        assert list(molecule.symbols) == list(symbol)
+
+
 def test_gradient_dataset_list_values(gradient_dataset_fixture):
     client, ds = gradient_dataset_fixture
 
@@ -1110,6 +1181,153 @@ def test_s22_view_identical(s22_fixture):
     assert_view_identical(ds)
 
 
+def test_view_read_rows(tmp_path):
+    h5py = pytest.importorskip("h5py")
+
+    with h5py.File(tmp_path / "rows.hdf5", "w") as f:
+        values = f.create_dataset("values", data=np.arange(100.0))
+        vlen = f.create_dataset("vlen", shape=(100,), dtype=h5py.vlen_dtype(np.dtype("float64")))
+        vlen[:50] = [np.arange(3 * (i % 3), dtype=float) + i for i in range(50)]
+
+        # Dense (hyperslab) and sparse (point) selections, out of order and repeated
+        for indexes in [[5, 3, 4, 3], [90, 2, 40, 2], []]:
+            assert np.array_equal(ptl.collections.HDF5View._read_rows(values, indexes), values[()][indexes])
+
+        indexes = [10, 4, 60, 1, 4]
+        rows = ptl.collections.HDF5View._read_rows(vlen, indexes)
+        gradients = ptl.collections.HDF5View._reshape_rows(rows, "gradient")
+        for i, gradient in zip(indexes, gradients):
+            assert np.array_equal(gradient, np.reshape(vlen[i], (-1, 3)))
+
+    rows = np.array([np.arange(4.0), np.arange(9.0)], dtype=object)
+    hessians = ptl.collections.HDF5View._reshape_rows(rows, "hessian")
+    assert [h.shape for h in hessians] == [(2, 2), (3, 3)]
+
+
+def test_view_array_layouts(tmp_path):
+    h5py = pytest.importorskip("h5py")
+
+    rng = np.random.default_rng(0)
+    n = 6
+    columns = {
+        # Mixed sizes, written ragged
+        "gradient": [rng.random((2 + i % 2, 3)) for i in range(n)],
+        "hessian": [rng.random((3 * (1 + i % 2),) * 2) for i in range(n)],
+        # Same size with missing rows, written dense
+        "gradient_missing": [np.nan if i in (1, 4) else rng.random((2, 3)) for i in range(n)],
+        "hessian_missing": [np.nan if i == 0 else rng.random((6, 6)) for i in range(n)],
+    }
+
+    view = ptl.collections.HDF5View(tmp_path / "layouts.hdf5")
+    with h5py.File(tmp_path / "layouts.hdf5", "w") as f:
+        f.create_dataset("entry/entry", data=np.array([f"e{i}" for i in range(n)], dtype=h5py.string_dtype()))
+        value_group = f.create_group("value")
+        vlen_group = f.create_group("vlen")
+        for name, elements in columns.items():
+            driver = name.split("_")[0]
+            dataset = view._write_array_column(value_group, name, driver, elements)
+            dataset.attrs["units"] = view._serialize_field("hartree")
+
+            # The variable length layout of older views
+            vlen = vlen_group.create_dataset(name, shape=(n,), dtype=h5py.vlen_dtype(np.dtype("float64")))
+            vlen[...] = view._object_array(
+                np.empty(0) if view._is_missing(element) else element.ravel() for element in elements
+            )
+            vlen.attrs["units"] = view._serialize_field("hartree")
+
+        layouts = {name: view._deserialize_field(f["value"][name].attrs["layout"]) for name in columns}
+        assert layouts == {
+            "gradient": "ragged",
+            "hessian": "ragged",
+            "gradient_missing": "dense",
+            "hessian_missing": "dense",
+        }
+
+    queries = [{"name": name, "driver": name.split("_")[0], "native": True} for name in columns]
+    values, units = view.get_values(queries)
+    assert units == {name: "hartree" for name in columns}
+
+    empty_values, _ = view.get_values(queries, subset=[])
+    assert list(empty_values.columns) == list(columns) and len(empty_values) == 0
+
+    with h5py.File(tmp_path / "layouts.hdf5", "r") as f:
+        for name in columns:
+            driver = name.split("_")[0]
+            vlen_rows = view._read_column(f, "vlen/" + name, list(range(n)), driver)
+            assert len(values[name]) == len(vlen_rows)
+            for row, vlen_row, element in zip(values[name], vlen_rows, columns[name]):
+                assert row.shape == vlen_row.shape
+                assert np.array_equal(row, vlen_row)
+
+                if view._is_missing(element):
+                    assert row.shape == ((0, 3) if driver == "gradient" else (0, 0))
+                else:
+                    assert np.array_equal(row, element)
+
+            # No rows requested
+            assert len(view._read_column(f, "value/" + name, [], driver)) == 0
+            assert len(view._read_column(f, "vlen/" + name, [], driver)) == 0
+
+
+def test_view_file_pool(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    from qcfractal.interface.collections.dataset_view import HDF5FilePool
+
+    paths = [tmp_path / f"{i}.hdf5" for i in range(3)]
+    for i, path in enumerate(paths):
+        with h5py.File(path, "w") as f:
+            f.create_dataset("values", data=np.full(5, i))
+
+    pool = HDF5FilePool(maxsize=2)
+    with pool.open(paths[0]) as f0:
+        with pool.open(paths[0]) as f:
+            assert f is f0
+        with pool.open(paths[1]), pool.open(paths[2]):
+            pass
+
+        # Evicted while in use, closed once released
+        assert len(pool) == 2
+        assert f0.id.valid
+        assert f0["values"][0] == 0
+    assert not f0.id.valid
+
+    # A rewritten file is opened again
+    with pool.open(paths[1]) as f1:
+        pass
+    with h5py.File(tmp_path / "new.hdf5", "w") as f:
+        f.create_dataset("values", data=np.full(5, 10))
+    pathlib.Path(tmp_path / "new.hdf5").replace(paths[1])
+    with pool.open(paths[1]) as f:
+        assert f["values"][0] == 10
+    assert not f1.id.valid
+
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_view_write_file_mode(tmp_path):
+    pytest.importorskip("h5py")
+
+    path = tmp_path / "view.hdf5"
+    view = ptl.collections.HDF5View(path)
+
+    umask = os.umask(0o022)
+    try:
+        with view._write_file() as f:
+            f.create_dataset("values", data=np.arange(5))
+        assert path.stat().st_mode & 0o777 == 0o644
+
+        # A rewritten view keeps the permissions of the old one
+        path.chmod(0o640)
+        with view._write_file() as f:
+            f.create_dataset("values", data=np.arange(5))
+        assert path.stat().st_mode & 0o777 == 0o640
+    finally:
+        os.umask(umask)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["view.hdf5"]
+
+
 @pytest.mark.slow
 def test_view_download_remote(s22_fixture):
     _, ds = s22_fixture
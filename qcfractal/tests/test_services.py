@@ -3,11 +3,15 @@ Tests the on-node procedures compute capabilities.
 """
 
 import copy
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import pytest
 
 import qcfractal.interface as ptl
 from qcfractal.interface.models import GridOptimizationInput, TorsionDriveInput
+from qcfractal.services import initialize_service_worker
 from qcfractal.testing import fractal_compute_server, recursive_dict_merge, using_geometric, using_rdkit
 
 
@@ -154,6 +158,62 @@ def test_service_torsiondrive_single(torsiondrive_fixture):
     assert len(opt.trajectory) == 2
 
 
+def test_service_torsiondrive_service_processes(fractal_compute_server, torsiondrive_fixture):
+    """Tests services iterated inside of service worker processes"""
+
+    spin_up_test, client = torsiondrive_fixture
+
+    storage_kwargs = {"project_name": fractal_compute_server.storage_database, "skip_version_check": True}
+    executor = ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialize_service_worker,
+        initargs=(fractal_compute_server.storage_uri, storage_kwargs),
+    )
+
+    fractal_compute_server.service_executor = executor
+    try:
+        ret = spin_up_test(keywords={"grid_spacing": [120]})
+    finally:
+        fractal_compute_server.service_executor = None
+        executor.shutdown()
+
+    result = client.query_procedures(id=ret.ids)[0]
+    assert result.status == "COMPLETE"
+    assert set(result.get_final_energies()) == {(-120,), (0,), (120,)}
+
+
+def test_service_broken_service_processes(fractal_compute_server, torsiondrive_fixture):
+    """Tests that services in a dead service worker pool are errored and the pool is replaced"""
+
+    spin_up_test, client = torsiondrive_fixture
+
+    class BrokenExecutor:
+        def submit(self, *args, **kwargs):
+            fut = Future()
+            fut.set_exception(BrokenProcessPool("A service worker died"))
+            return fut
+
+        def shutdown(self, wait=True):
+            pass
+
+    broken = BrokenExecutor()
+    fractal_compute_server.service_executor = broken
+    fractal_compute_server._service_executor_factory = None
+    try:
+        ret = spin_up_test(keywords={"grid_spacing": [60]}, run_service=False)
+        fractal_compute_server.update_services()
+        assert fractal_compute_server.service_executor is not broken
+    finally:
+        fractal_compute_server.service_executor = None
+
+    status = client.query_services(procedure_id=ret.ids)
+    assert len(status) == 1
+
+    assert status[0]["status"] == "ERROR"
+    assert "A service worker died" in status[0]["error"]["error_message"]
+
+
 @pytest.mark.slow
 def test_service_torsiondrive_multi_single(torsiondrive_fixture):
     spin_up_test, client = torsiondrive_fixture
@@ -5,15 +5,17 @@ All tests should be atomic, that is create and cleanup their data
 """
 
 from datetime import datetime
-from time import time
+from time import sleep, time
 
 import numpy as np
 import pytest
 import sqlalchemy
+from qcelemental.util import msgpackext_loads
 
 import qcfractal.interface as ptl
 from qcfractal.interface.models.task_models import TaskStatusEnum
 from qcfractal.services.services import TorsionDriveService
+from qcfractal.storage_sockets.models import AccessLogORM, MsgpackExtRaw, ResultORM, WavefunctionStoreORM
 from qcfractal.testing import sqlalchemy_socket_fixture as storage_socket
 
 bad_id1 = "99999000"
@@ -110,6 +112,76 @@ def test_molecules_get(storage_socket):
     assert ret == 1
 
 
+def test_molecules_get_geometries(storage_socket):
+
+    water = ptl.data.get_molecule("water_dimer_minima.psimol")
+    water2 = ptl.data.get_molecule("water_dimer_stretch.psimol")
+
+    ret = storage_socket.add_molecules([water, water2])
+    assert ret["meta"]["n_inserted"] == 2
+
+    geometries = storage_socket.get_molecule_geometries(ret["data"] + ["999999999"])
+    assert set(geometries) == set(ret["data"])
+    assert np.allclose(geometries[ret["data"][0]].reshape(-1, 3), water.geometry)
+    assert np.allclose(geometries[ret["data"][1]].reshape(-1, 3), water2.geometry)
+
+    assert storage_socket.get_molecule_geometries([]) == {}
+
+    # Served from the cache, callers get their own copies
+    geometries[ret["data"][0]][:] = 0
+    cached = storage_socket.get_molecule_geometries(ret["data"])
+    assert np.allclose(cached[ret["data"][0]], water.geometry)
+    assert cached[ret["data"][0]].shape == (len(water.symbols), 3)
+
+    # Cleanup adds
+    mol_ids = ret["data"]
+    ret = storage_socket.del_molecules(id=mol_ids)
+    assert ret == 2
+    assert storage_socket.get_molecule_geometries(mol_ids) == {}
+
+
+def test_molecules_raw_msgpack(storage_socket):
+
+    water = ptl.data.get_molecule("water_dimer_minima.psimol")
+    water_id = storage_socket.add_molecules([water])["data"][0]
+
+    mol = storage_socket.get_molecules(id=water_id)["data"][0].dict()
+    raw = storage_socket.get_molecules(id=water_id, raw_msgpack=True)["data"][0]
+
+    # Same fields as the serialized Molecule, arrays still encoded
+    assert set(raw) == set(mol)
+    assert isinstance(raw["geometry"], MsgpackExtRaw)
+    assert np.array_equal(msgpackext_loads(raw["geometry"]), mol["geometry"])
+    assert list(msgpackext_loads(raw["symbols"])) == list(mol["symbols"])
+    assert raw["id"] == mol["id"]
+
+    # Cleanup adds
+    ret = storage_socket.del_molecules(id=water_id)
+    assert ret == 1
+
+
+def test_wavefunction_store_raw_msgpack(storage_socket):
+
+    blob = {"basis": {"name": "sto-3g"}, "restricted": True, "scf_orbitals_a": np.arange(4.0).reshape(2, 2)}
+    wfn_id = storage_socket.add_wavefunction_store([blob])["data"][0]
+
+    wfn = storage_socket.get_wavefunction_store(id=wfn_id)["data"][0]
+    raw = storage_socket.get_wavefunction_store(id=wfn_id, raw_msgpack=True)["data"][0]
+
+    assert set(raw) == set(wfn)
+    assert isinstance(raw["scf_orbitals_a"], MsgpackExtRaw)
+    assert np.array_equal(msgpackext_loads(raw["scf_orbitals_a"]), wfn["scf_orbitals_a"])
+    assert msgpackext_loads(raw["basis"]) == wfn["basis"]
+    assert raw["scf_density_a"] is None
+
+    raw = storage_socket.get_wavefunction_store(id=wfn_id, include=["basis"], raw_msgpack=True)["data"][0]
+    assert list(raw) == ["basis"]
+    assert isinstance(raw["basis"], MsgpackExtRaw)
+
+    with storage_socket.session_scope() as session:
+        session.query(WavefunctionStoreORM).filter_by(id=int(wfn_id)).delete()
+
+
 def test_molecules_duplicate_insert(storage_socket):
     water = ptl.data.get_molecule("water_dimer_minima.psimol")
     water2 = ptl.data.get_molecule("water_dimer_stretch.psimol")
@@ -132,6 +204,38 @@ def test_molecules_duplicate_insert(storage_socket):
     assert ret == 2
 
 
+def test_molecules_bulk_add(storage_socket):
+    water = ptl.data.get_molecule("water_dimer_minima.psimol")
+    water2 = ptl.data.get_molecule("water_dimer_stretch.psimol")
+    he = ptl.Molecule(symbols=["He", "He"], geometry=[0, 0, 0, 0, 0, 4], name="he\tdimer", extras={"key": "a\nb"})
+
+    water_id = storage_socket.add_molecules([water])["data"][0]
+
+    # Small chunks so that a duplicate spans chunks and one repeats within a chunk
+    ret = storage_socket.bulk_add_molecules([water2, water, water2, he, he, water], chunk_size=4)
+    assert ret["meta"]["n_inserted"] == 2
+    water2_id, he_id = ret["data"][0], ret["data"][3]
+    assert ret["meta"]["duplicates"] == [water_id, he_id, water_id]
+    assert ret["data"] == [water2_id, water_id, water2_id, he_id, he_id, water_id]
+
+    # Same ids as the ORM insert path, and the stored molecules round trip
+    assert storage_socket.add_molecules([he, water2])["data"] == [he_id, water2_id]
+
+    mols = storage_socket.get_molecules(id=[water2_id, he_id])["data"]
+    mols = {m.id: m for m in mols}
+    assert mols[water2_id].compare(water2)
+    assert mols[he_id].compare(he)
+    assert mols[he_id].name == "he\tdimer"
+    assert mols[he_id].extras == {"key": "a\nb"}
+    assert mols[he_id].identifiers.molecule_hash == he.get_hash()
+
+    assert storage_socket.bulk_add_molecules([])["data"] == []
+
+    # Cleanup adds
+    ret = storage_socket.del_molecules(id=[water_id, water2_id, he_id])
+    assert ret == 3
+
+
 def test_molecules_mixed_add_get(storage_socket):
     water = ptl.data.get_molecule("water_dimer_minima.psimol")
     water2 = ptl.data.get_molecule("water_dimer_stretch.psimol")
@@ -209,6 +313,23 @@ def test_keywords_mixed_add_get(storage_socket):
     assert 1 == storage_socket.del_keywords(id=opts[1].id)
 
 
+def test_kvstore_add_many_order(storage_socket):
+
+    blobs = ["stdout 1", None, {"error_type": "a", "error_message": "b"}, "stdout 2", None]
+    ret = storage_socket.add_kvstore(blobs)
+    assert ret["meta"]["n_inserted"] == 3
+    assert ret["data"][1] is None
+    assert ret["data"][4] is None
+
+    ids = [x for x in ret["data"] if x is not None]
+    assert len(set(ids)) == 3
+
+    found = storage_socket.get_kvstore(ids)["data"]
+    for blob, blob_id in zip(blobs, ret["data"]):
+        if blob is not None:
+            assert found[blob_id] == blob
+
+
 def test_collections_add(storage_socket):
 
     collection = "TorsionDriveRecord"
@@ -861,6 +982,55 @@ def test_modify_user(storage_socket):
     assert storage_socket.remove_user("george") is True
 
 
+def test_user_auth_cache_invalidation(storage_socket):
+
+    r, pw = storage_socket.add_user("george", "shortpw", permissions=["read", "write"])
+    assert r is True
+
+    # Second verification is served from the cache
+    assert storage_socket.verify_user("george", "shortpw", "write")[0] is True
+    assert storage_socket.verify_user("george", "shortpw", "write")[0] is True
+    assert storage_socket.verify_user("george", "wrongpw", "write")[0] is False
+
+    # Modifications must be seen immediately
+    r, msg = storage_socket.modify_user("george", permissions=["read"])
+    assert r is True
+    assert storage_socket.verify_user("george", "shortpw", "write")[0] is False
+
+    r, msg = storage_socket.modify_user("george", password="newpw", permissions=["write"])
+    assert r is True
+    assert storage_socket.verify_user("george", "shortpw", "write")[0] is False
+    assert storage_socket.verify_user("george", "newpw", "write")[0] is True
+
+    assert storage_socket.remove_user("george") is True
+    assert storage_socket.verify_user("george", "newpw", "write")[0] is False
+
+
+def test_user_auth_cache_invalidation_race(storage_socket, monkeypatch):
+    import bcrypt
+
+    r, pw = storage_socket.add_user("george", "shortpw", permissions=["read", "write"])
+    assert r is True
+
+    # The user changes after its row was read, the stale verification must not be cached
+    checkpw = bcrypt.checkpw
+
+    def racing_checkpw(*args):
+        storage_socket._invalidate_auth_cache("george")
+        return checkpw(*args)
+
+    cache_key = storage_socket._auth_cache_key("george", "shortpw")
+    monkeypatch.setattr(bcrypt, "checkpw", racing_checkpw)
+    assert storage_socket.verify_user("george", "shortpw", "write")[0] is True
+    assert cache_key not in storage_socket._auth_cache
+
+    monkeypatch.setattr(bcrypt, "checkpw", checkpw)
+    assert storage_socket.verify_user("george", "shortpw", "write")[0] is True
+    assert cache_key in storage_socket._auth_cache
+
+    assert storage_socket.remove_user("george") is True
+
+
 def test_user_permissions_default(storage_socket):
 
     r, pw = storage_socket.add_user("george", "shortpw")
@@ -1076,6 +1246,17 @@ def test_services_sql(storage_results):
     ret = storage_results.get_services(procedure_id=ret["data"][0]["procedure_id"], status=TaskStatusEnum.waiting)
     assert ret["data"][0]["task_priority"] == py_obj.task_priority
 
+    # Services waiting on an incomplete procedure are not ready
+    assert len(storage_results.get_services(id=py_obj.id, ready=True)["data"]) == 1
+    py_obj.task_manager.required_tasks = {"proc": py_obj.procedure_id}
+    storage_results.update_services([py_obj])
+    ret = storage_results.get_services(id=py_obj.id, ready=True)
+    assert ret["meta"]["n_found"] == 0
+
+    py_obj.task_manager.required_tasks = {}
+    storage_results.update_services([py_obj])
+    assert len(storage_results.get_services(id=py_obj.id, ready=True)["data"]) == 1
+
 
 def test_project_name(storage_socket):
     assert "test" in storage_socket.get_project_name()
@@ -1152,6 +1333,101 @@ def test_results_pagination(storage_socket):
     storage_socket.del_molecules(mol)
 
 
+def test_results_record_cache(storage_results):
+
+    query = {"method": "M1", "program": "P1", "driver": "energy"}
+    ret = storage_results.get_results(**query)
+    assert ret["meta"]["n_found"] == 2
+
+    # Served from the cache, projections are cached separately
+    assert storage_results.get_results(**query)["data"] == ret["data"]
+    proj = storage_results.get_results(**query, include=["return_result"])["data"]
+    assert sorted(x["return_result"] for x in proj) == [5, 10]
+    assert all(set(x) == {"return_result"} for x in proj)
+
+    # Updates invalidate the cached records
+    record = ret["data"][0]
+    old_result = record["return_result"]
+    storage_results.update_results([ptl.models.ResultRecord(**{**record, "return_result": 20})])
+
+    found = storage_results.get_results(id=record["id"], include=["id", "return_result"])["data"]
+    assert found == [{"id": record["id"], "return_result": 20}]
+
+    storage_results.update_results([ptl.models.ResultRecord(**record)])
+    assert storage_results.get_results(id=record["id"])["data"][0]["return_result"] == old_result
+
+
+def test_results_raw_msgpack(storage_results):
+
+    query = {"method": "M1", "program": "P1", "driver": "energy"}
+    ret = storage_results.get_results(**query)["data"]
+    raw = storage_results.get_results(**query, raw_msgpack=True)["data"]
+
+    assert [x["id"] for x in raw] == [x["id"] for x in ret]
+    for record, raw_record in zip(ret, raw):
+        assert isinstance(raw_record["return_result"], MsgpackExtRaw)
+        assert msgpackext_loads(raw_record["return_result"]) == record["return_result"]
+        assert raw_record["molecule"] == record["molecule"]
+
+
+def test_results_to_dict_deferred(storage_results):
+
+    # Column metadata is stored per class
+    assert ResultORM._get_dict_fields() is ResultORM._get_dict_fields()
+    assert "return_result" in ResultORM._get_dict_fields()
+
+    with storage_results.session_scope() as session:
+        record = session.query(ResultORM).filter(ResultORM.method == "m1").first()
+
+        # Deferred columns that are excluded are never loaded
+        ret = record.to_dict(exclude=["return_result", "extras"])
+        assert "return_result" not in ret
+        assert "return_result" not in record.__dict__
+
+        ret = record.to_dict()
+        assert ret["return_result"] is not None
+
+
+def test_results_cursor_pagination(storage_socket):
+    """
+        Test results keyset pagination with after_id
+    """
+
+    water = ptl.data.get_molecule("water_dimer_minima.psimol")
+    mol = storage_socket.add_molecules([water])["data"][0]
+
+    results = [
+        ptl.models.ResultRecord(molecule=mol, method="M1", basis=str(i), program="P1", driver="energy")
+        for i in range(25)
+    ]
+    inserted = storage_socket.add_results(results)
+    assert inserted["meta"]["n_inserted"] == 25
+
+    # Walk all pages without counting, each page resumes after the last id seen
+    pages = []
+    after_id = 0
+    while True:
+        ret = storage_socket.get_results(method="M1", status=None, limit=10, after_id=after_id, count=False)
+        assert ret["meta"]["n_found"] is None
+        if len(ret["data"]) == 0:
+            break
+
+        pages.append([r["id"] for r in ret["data"]])
+        after_id = pages[-1][-1]
+
+    assert [len(p) for p in pages] == [10, 10, 5]
+    ids = [rid for page in pages for rid in page]
+    assert ids == sorted(inserted["data"], key=int)
+
+    # Counting still reports the full query
+    ret = storage_socket.get_results(method="M1", status=None, limit=10, after_id=ids[9], include=["id"])
+    assert ret["meta"]["n_found"] == 25
+    assert [r["id"] for r in ret["data"]] == ids[10:20]
+
+    storage_socket.del_results(inserted["data"])
+    storage_socket.del_molecules(mol)
+
+
 def test_procedure_pagination(storage_socket):
     """
         Test procedure pagination
@@ -1306,6 +1582,46 @@ def test_server_log(storage_results):
     assert ret["data"][0]["timestamp"] > now
 
 
+def test_access_log_batched(storage_socket):
+
+    from tornado.httputil import HTTPHeaders, HTTPServerRequest
+
+    from qcfractal.storage_sockets.api_logger import API_AccessLogger
+
+    def request():
+        headers = HTTPHeaders({"User-Agent": "pytest", "X-Real-IP": "127.0.0.1"})
+        return HTTPServerRequest(method="GET", uri="/molecule", headers=headers)
+
+    before = storage_socket.get_total_count(AccessLogORM)
+
+    # Nothing is written until stop, logs beyond the buffer are dropped
+    api_logger = API_AccessLogger(
+        "missing_geo_file.mmdb", storage=storage_socket, max_buffer=5, batch_size=100, flush_interval=3600
+    )
+    assert [api_logger.log_access(request(), extra_params="{}") for _ in range(7)] == [True] * 5 + [False] * 2
+    assert storage_socket.get_total_count(AccessLogORM) == before
+
+    api_logger.stop()
+    assert (api_logger.n_logged, api_logger.n_dropped, api_logger.n_failed) == (5, 2, 0)
+    assert storage_socket.get_total_count(AccessLogORM) == before + 5
+
+    # Logs arriving after stop are dropped rather than buffered forever
+    assert api_logger.log_access(request()) is False
+    assert (api_logger.n_logged, api_logger.n_dropped) == (5, 3)
+
+    # A full batch is written without waiting for the flush interval
+    api_logger = API_AccessLogger("missing_geo_file.mmdb", storage=storage_socket, batch_size=2, flush_interval=60)
+    api_logger.log_access(request())
+    api_logger.log_access(request())
+
+    start = time()
+    while api_logger.n_logged < 2 and time() - start < 10:
+        sleep(0.05)
+
+    assert storage_socket.get_total_count(AccessLogORM) == before + 7
+    api_logger.stop()
+
+
 def test_collections_include_exclude(storage_socket):
 
     collection = "Dataset"
@@ -2,7 +2,13 @@
 Utility functions for QCFractal.
 """
 
+import collections
 import socket
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+_missing = object()
 
 
 def find_port() -> int:
@@ -23,3 +29,107 @@ def is_port_open(ip: str, port: int) -> bool:
         return False
     finally:
         s.close()
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe, least-recently-used cache with an optional time-to-live.
+
+    Entries beyond ``maxsize`` evict the least recently used entry, entries older than
+    ``ttl`` seconds are treated as missing. If ``maxbytes`` is given, entries are also evicted
+    while the total ``getsizeof(value)`` of all entries exceeds it.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+        maxbytes: Optional[int] = None,
+        getsizeof: Callable[[Any], int] = len,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.getsizeof = getsizeof
+
+        self._data = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of all entries, only tracked if ``maxbytes`` is given"""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _missing) is not _missing
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                expires, value, _ = self._data[key]
+            except KeyError:
+                return default
+
+            if (expires is not None) and (expires < time.monotonic()):
+                self._remove(key)
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        nbytes = 0 if self.maxbytes is None else self.getsizeof(value)
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            self._data[key] = (expires, value, nbytes)
+            self._nbytes += nbytes
+
+            while self._data and (
+                ((self.maxsize is not None) and (len(self._data) > self.maxsize))
+                or ((self.maxbytes is not None) and (self._nbytes > self.maxbytes))
+            ):
+                self._remove(next(iter(self._data)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+
+            return self._remove(key)
+
+    def _remove(self, key: Hashable) -> Any:
+        """Removes an entry, the lock must be held"""
+
+        _, value, nbytes = self._data.pop(key)
+        self._nbytes -= nbytes
+        return value
+
+    def invalidate(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Removes all entries for which ``predicate(key, value)`` is True.
+
+        Returns
+        -------
+        int
+            The number of entries removed
+        """
+
+        with self._lock:
+            remove = [k for k, (_, v, _) in self._data.items() if predicate(k, v)]
+            for k in remove:
+                self._remove(k)
+
+        return len(remove)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
@@ -1,13 +1,18 @@
 """
 Web handlers for the FractalServer.
 """
+import functools
 import json
 
+import msgpack
+import tornado.ioloop
 import tornado.web
 from pydantic import ValidationError
 from qcelemental.util import deserialize, serialize
+from qcelemental.util.serialization import msgpackext_encode
 
 from .interface.models.rest_models import rest_model
+from .storage_sockets.models import MsgpackExtRaw
 from .storage_sockets.storage_utils import add_metadata_template
 
 _valid_encodings = {
@@ -49,11 +54,12 @@ class APIHandler(tornado.web.RequestHandler):
         self.logger = objects["logger"]
         self.api_logger = objects["api_logger"]
         self.view_handler = objects["view_handler"]
+        self.storage_executor = objects.get("storage_executor", None)
         self.username = None
 
-    def prepare(self):
+    async def prepare(self):
         if self._required_auth:
-            self.authenticate(self._required_auth)
+            await self.authenticate(self._required_auth)
 
         try:
             if (self.encoding == "json") and isinstance(self.request.body, bytes):
@@ -84,12 +90,23 @@ class APIHandler(tornado.web.RequestHandler):
 
             extra_params = json.dumps(extra_params)
 
-            log = self.api_logger.get_api_access_log(request=self.request, extra_params=extra_params)
-            self.storage.save_access(log)
+            # Queued, saved in batches by the API logger writer thread
+            self.api_logger.log_access(request=self.request, extra_params=extra_params)
 
         # self.logger.info('Done saving API access to the database')
 
-    def authenticate(self, permission):
+    async def run_in_storage_executor(self, func, *args, **kwargs):
+        """Runs a blocking (database) call in the storage executor so the IOLoop is free to
+        serve other requests, or inline if the server has no storage executor.
+        """
+
+        if self.storage_executor is None:
+            return func(*args, **kwargs)
+
+        call = functools.partial(func, *args, **kwargs)
+        return await tornado.ioloop.IOLoop.current().run_in_executor(self.storage_executor, call)
+
+    async def authenticate(self, permission):
         """Authenticates request with a given permission setting.
 
         Parameters
@@ -109,7 +126,7 @@ class APIHandler(tornado.web.RequestHandler):
 
         self.username = username
 
-        verified, msg = self.objects["storage_socket"].verify_user(username, password, permission)
+        verified, msg = await self.run_in_storage_executor(self.storage.verify_user, username, password, permission)
         if verified is False:
             raise tornado.web.HTTPError(status_code=401, reason=msg)
 
@@ -126,6 +143,64 @@ class APIHandler(tornado.web.RequestHandler):
 
         return super().write(data)
 
+    def write_frame(self, frame):
+        """Writes a single frame of a streamed response. msgpack objects delimit themselves
+        while JSON frames are newline delimited (NDJSON).
+        """
+
+        data = serialize(frame, self.encoding)
+        if self.encoding != "msgpack-ext":
+            data += "\n"
+
+        return super().write(data)
+
+    def write_raw_msgpack(self, ret, response_model):
+        """Writes a msgpack-ext query response without validating and re-encoding the records.
+
+        The data is either a list of records or a single record. Record values read as MsgpackExtRaw
+        are already msgpack-ext encoded and are spliced into the response as is, all other values
+        are packed as usual.
+        """
+
+        header = response_model(meta=ret["meta"], data=[] if isinstance(ret["data"], list) else {})
+        packer = msgpack.Packer(default=msgpackext_encode, use_bin_type=True)
+
+        records = ret["data"]
+        out = [packer.pack_map_header(2), packer.pack("meta"), packer.pack(header.meta), packer.pack("data")]
+
+        def pack_record(record):
+            out.append(packer.pack_map_header(len(record)))
+            for key, value in record.items():
+                out.append(packer.pack(key))
+                out.append(value if isinstance(value, MsgpackExtRaw) else packer.pack(value))
+
+        if isinstance(records, list):
+            out.append(packer.pack_array_header(len(records)))
+            for record in records:
+                pack_record(record)
+        else:
+            pack_record(records)
+
+        return self.write(b"".join(out))
+
+    async def write_stream(self, ret, response_model, chunk_size=100):
+        """Streams a query response as a metadata frame followed by one frame per record.
+
+        Records are validated and flushed in chunks of ``chunk_size`` using chunked transfer
+        encoding so that the full response is never serialized at once.
+        """
+
+        header = response_model(meta=ret["meta"], data=[])
+        self.write_frame({"meta": header.meta})
+
+        records = ret["data"]
+        for start in range(0, len(records), chunk_size):
+            chunk = response_model(meta=ret["meta"], data=records[start : start + chunk_size])
+            for record in chunk.data:
+                self.write_frame({"data": record})
+
+            await self.flush()
+
 
 class InformationHandler(APIHandler):
     """
@@ -134,7 +209,7 @@ class InformationHandler(APIHandler):
 
     _required_auth = "read"
 
-    def get(self):
+    async def get(self):
         """
 
         """
@@ -152,7 +227,7 @@ class KVStoreHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id"}
 
-    def get(self):
+    async def get(self):
         """
 
         Experimental documentation, need to find a decent format.
@@ -174,7 +249,7 @@ class KVStoreHandler(APIHandler):
         body_model, response_model = rest_model("kvstore", "get")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.get_kvstore(body.data.id)
+        ret = await self.run_in_storage_executor(self.storage.get_kvstore, body.data.id)
         ret = response_model(**ret)
 
         self.logger.info("GET: KVStore - {} pulls.".format(len(ret.data)))
@@ -189,14 +264,24 @@ class WavefunctionStoreHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id"}
 
-    def get(self):
+    async def get(self):
 
         body_model, response_model = rest_model("wavefunctionstore", "get")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.get_wavefunction_store(body.data.id, include=body.meta.include)
+        # msgpack-ext clients get the stored msgpack columns passed through without decoding
+        raw_msgpack = self.encoding == "msgpack-ext"
+        ret = await self.run_in_storage_executor(
+            self.storage.get_wavefunction_store, body.data.id, include=body.meta.include, raw_msgpack=raw_msgpack
+        )
         if len(ret["data"]):
             ret["data"] = ret["data"][0]
+
+        if raw_msgpack:
+            self.write_raw_msgpack(ret, response_model)
+            self.logger.info("GET: WavefunctionStore - 1 pull.")
+            return
+
         ret = response_model(**ret)
 
         self.logger.info("GET: WavefunctionStore - 1 pull.")
@@ -211,7 +296,7 @@ class MoleculeHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id"}
 
-    def get(self):
+    async def get(self):
         """
 
         Experimental documentation, need to find a decent format.
@@ -235,13 +320,31 @@ class MoleculeHandler(APIHandler):
         body_model, response_model = rest_model("molecule", "get")
         body = self.parse_bodymodel(body_model)
 
-        molecules = self.storage.get_molecules(**{**body.data.dict(), **body.meta.dict()})
+        meta = body.meta.dict()
+        stream = meta.pop("stream")
+
+        # msgpack-ext clients get the stored msgpack columns passed through without decoding
+        raw_msgpack = (self.encoding == "msgpack-ext") and not stream
+        molecules = await self.run_in_storage_executor(
+            self.storage.get_molecules, **{**body.data.dict(), **meta}, raw_msgpack=raw_msgpack
+        )
+
+        if stream:
+            await self.write_stream(molecules, response_model)
+            self.logger.info("GET: Molecule - {} streamed.".format(len(molecules["data"])))
+            return
+
+        if raw_msgpack:
+            self.write_raw_msgpack(molecules, response_model)
+            self.logger.info("GET: Molecule - {} pulls.".format(len(molecules["data"])))
+            return
+
         ret = response_model(**molecules)
 
         self.logger.info("GET: Molecule - {} pulls.".format(len(ret.data)))
         self.write(ret)
 
-    def post(self):
+    async def post(self):
         """
             Experimental documentation, need to find a decent format.
 
@@ -260,12 +363,12 @@ class MoleculeHandler(APIHandler):
             "data" - A dictionary of {key : id} results
         """
 
-        self.authenticate("write")
+        await self.authenticate("write")
 
         body_model, response_model = rest_model("molecule", "post")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.add_molecules(body.data)
+        ret = await self.run_in_storage_executor(self.storage.add_molecules, body.data)
         response = response_model(**ret)
 
         self.logger.info("POST: Molecule - {} inserted.".format(response.meta.n_inserted))
@@ -280,24 +383,26 @@ class KeywordHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id"}
 
-    def get(self):
+    async def get(self):
 
         body_model, response_model = rest_model("keyword", "get")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.get_keywords(**{**body.data.dict(), **body.meta.dict()}, with_ids=False)
+        ret = await self.run_in_storage_executor(
+            self.storage.get_keywords, **{**body.data.dict(), **body.meta.dict()}, with_ids=False
+        )
         response = response_model(**ret)
 
         self.logger.info("GET: Keywords - {} pulls.".format(len(response.data)))
         self.write(response)
 
-    def post(self):
-        self.authenticate("write")
+    async def post(self):
+        await self.authenticate("write")
 
         body_model, response_model = rest_model("keyword", "post")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.add_keywords(body.data)
+        ret = await self.run_in_storage_executor(self.storage.add_keywords, body.data)
         response = response_model(**ret)
 
         self.logger.info("POST: Keywords - {} inserted.".format(response.meta.n_inserted))
@@ -311,15 +416,15 @@ class CollectionHandler(APIHandler):
 
     _required_auth = "read"
 
-    def get(self, collection_id=None, view_function=None):
+    async def get(self, collection_id=None, view_function=None):
 
         # List collections
         if (collection_id is None) and (view_function is None):
             body_model, response_model = rest_model("collection", "get")
             body = self.parse_bodymodel(body_model)
 
-            cols = self.storage.get_collections(
-                **body.data.dict(), include=body.meta.include, exclude=body.meta.exclude
+            cols = await self.run_in_storage_executor(
+                self.storage.get_collections, **body.data.dict(), include=body.meta.include, exclude=body.meta.exclude
             )
             response = response_model(**cols)
 
@@ -332,8 +437,12 @@ class CollectionHandler(APIHandler):
             body_model, response_model = rest_model("collection", "get")
 
             body = self.parse_bodymodel(body_model)
-            cols = self.storage.get_collections(
-                **body.data.dict(), col_id=int(collection_id), include=body.meta.include, exclude=body.meta.exclude
+            cols = await self.run_in_storage_executor(
+                self.storage.get_collections,
+                **body.data.dict(),
+                col_id=int(collection_id),
+                include=body.meta.include,
+                exclude=body.meta.exclude,
             )
             response = response_model(**cols)
 
@@ -356,7 +465,9 @@ class CollectionHandler(APIHandler):
                 self.logger.info("GET: Collections - view request made, but server does not have a view_handler.")
                 return
 
-            result = self.view_handler.handle_request(collection_id, view_function, body.data.dict())
+            result = await self.run_in_storage_executor(
+                self.view_handler.handle_request, collection_id, view_function, body.data.dict()
+            )
             response = response_model(**result)
 
             self.logger.info(f"GET: Collections - {collection_id} view {view_function} pulls.")
@@ -375,8 +486,8 @@ class CollectionHandler(APIHandler):
             )
             return
 
-    def post(self, collection_id=None, view_function=None):
-        self.authenticate("write")
+    async def post(self, collection_id=None, view_function=None):
+        await self.authenticate("write")
 
         body_model, response_model = rest_model("collection", "post")
         body = self.parse_bodymodel(body_model)
@@ -390,17 +501,19 @@ class CollectionHandler(APIHandler):
             self.logger.info("POST: Collections - Access attempted on subresource.")
             return
 
-        ret = self.storage.add_collection(body.data.dict(), overwrite=body.meta.overwrite)
+        ret = await self.run_in_storage_executor(
+            self.storage.add_collection, body.data.dict(), overwrite=body.meta.overwrite
+        )
         response = response_model(**ret)
 
         self.logger.info("POST: Collections - {} inserted.".format(response.meta.n_inserted))
         self.write(response)
 
-    def delete(self, collection_id, _):
-        self.authenticate("write")
+    async def delete(self, collection_id, _):
+        await self.authenticate("write")
 
         body_model, response_model = rest_model(f"collection/{collection_id}", "delete")
-        ret = self.storage.del_collection(col_id=collection_id)
+        ret = await self.run_in_storage_executor(self.storage.del_collection, col_id=collection_id)
         if ret == 0:
             self.logger.info(f"DELETE: Collections - Attempted to delete non-existent collection {collection_id}.")
             raise tornado.web.HTTPError(status_code=404, reason=f"Collection {collection_id} does not exist.")
@@ -417,12 +530,30 @@ class ResultHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id", "molecule"}
 
-    def get(self):
+    async def get(self):
 
         body_model, response_model = rest_model("result", "get")
         body = self.parse_bodymodel(body_model)
 
-        ret = self.storage.get_results(**{**body.data.dict(), **body.meta.dict()})
+        meta = body.meta.dict()
+        stream = meta.pop("stream")
+
+        # msgpack-ext clients get the stored msgpack columns passed through without decoding
+        raw_msgpack = (self.encoding == "msgpack-ext") and not stream
+        ret = await self.run_in_storage_executor(
+            self.storage.get_results, **{**body.data.dict(), **meta}, raw_msgpack=raw_msgpack
+        )
+
+        if stream:
+            await self.write_stream(ret, response_model)
+            self.logger.info("GET: Results - {} streamed.".format(len(ret["data"])))
+            return
+
+        if raw_msgpack:
+            self.write_raw_msgpack(ret, response_model)
+            self.logger.info("GET: Results - {} pulls.".format(len(ret["data"])))
+            return
+
         result = response_model(**ret)
 
         self.logger.info("GET: Results - {} pulls.".format(len(result.data)))
@@ -437,19 +568,28 @@ class ProcedureHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id"}
 
-    def get(self, query_type="get"):
+    async def get(self, query_type="get"):
 
         body_model, response_model = rest_model("procedure", query_type)
         body = self.parse_bodymodel(body_model)
 
+        meta = body.meta.dict()
+        stream = meta.pop("stream", False)
         try:
             if query_type == "get":
-                ret = self.storage.get_procedures(**{**body.data.dict(), **body.meta.dict()})
+                ret = await self.run_in_storage_executor(self.storage.get_procedures, **{**body.data.dict(), **meta})
             else:  # all other queries, like 'best_opt_results'
-                ret = self.storage.custom_query("procedure", query_type, **{**body.data.dict(), **body.meta.dict()})
+                ret = await self.run_in_storage_executor(
+                    self.storage.custom_query, "procedure", query_type, **{**body.data.dict(), **meta}
+                )
         except KeyError as e:
             raise tornado.web.HTTPError(status_code=401, reason=str(e))
 
+        if stream:
+            await self.write_stream(ret, response_model)
+            self.logger.info("GET: Procedures - {} streamed.".format(len(ret["data"])))
+            return
+
         response = response_model(**ret)
 
         self.logger.info("GET: Procedures - {} pulls.".format(len(response.data)))
@@ -464,16 +604,20 @@ class OptimizationHandler(APIHandler):
     _required_auth = "read"
     _logging_param_counts = {"id"}
 
-    def get(self, query_type="get"):
+    async def get(self, query_type="get"):
 
         body_model, response_model = rest_model(f"optimization/{query_type}", "get")
         body = self.parse_bodymodel(body_model)
 
         try:
             if query_type == "get":
-                ret = self.storage.get_procedures(**{**body.data.dict(), **body.meta.dict()})
+                ret = await self.run_in_storage_executor(
+                    self.storage.get_procedures, **{**body.data.dict(), **body.meta.dict()}
+                )
             else:  # all other queries, like 'best_opt_results'
-                ret = self.storage.custom_query("optimization", query_type, **{**body.data.dict(), **body.meta.dict()})
+                ret = await self.run_in_storage_executor(
+                    self.storage.custom_query, "optimization", query_type, **{**body.data.dict(), **body.meta.dict()}
+                )
         except KeyError as e:
             raise tornado.web.HTTPError(status_code=401, reason=str(e))
 